@@ -0,0 +1,140 @@
+"""Rollups and time-series aggregations over CostTable data."""
+
+import datetime
+import itertools
+from array import array
+from typing import List, Optional, Tuple
+
+from aws_cost_explorer.amounts import add_amount_arrays
+from aws_cost_explorer.results import CostTable
+
+
+def _bucket_start(date: str, frequency: str) -> str:
+    """Return the day, or first day of the week (Monday) or month, containing date."""
+    day = datetime.datetime.strptime(date[:10], '%Y-%m-%d').date()
+    if frequency == 'WEEKLY':
+        day -= datetime.timedelta(days=day.weekday())
+    elif frequency == 'MONTHLY':
+        day = day.replace(day=1)
+    elif frequency != 'DAILY':
+        raise ValueError(f"Unknown resample frequency: {frequency}. Valid frequencies: DAILY, WEEKLY, MONTHLY")
+    return day.strftime('%Y-%m-%d')
+
+
+def _add_blocks(blocks: List[array]) -> array:
+    """Element-wise sum of equally sized arrays of amounts in 10^-8 units."""
+    total = blocks[0]
+    for block in blocks[1:]:
+        total = add_amount_arrays(total, block)
+    return total
+
+
+def resample(table: CostTable, frequency: str) -> CostTable:
+    """
+    Roll periods up into days, weeks (starting Monday) or calendar months.
+
+    Each new period runs from the start of its first source period to the
+    end of its last one, and is estimated if any source period was.
+
+    Args:
+        table: Table of DAILY or HOURLY periods
+        frequency: DAILY (for HOURLY tables), WEEKLY or MONTHLY
+
+    Returns:
+        A new table with the same keys and metrics
+
+    Raises:
+        ValueError: If frequency is not recognized
+    """
+    width = len(table.keys) * len(table.metrics)
+    buckets = itertools.groupby(range(len(table.periods)), key=lambda index: _bucket_start(table.periods[index][0], frequency))
+
+    periods = []
+    estimated = []
+    blocks = []
+    for _, indexes in buckets:
+        indexes = list(indexes)
+        periods.append((table.periods[indexes[0]][0], table.periods[indexes[-1]][1]))
+        estimated.append(any(table.estimated[index] for index in indexes))
+        blocks.append(_add_blocks([table.values[index * width:(index + 1) * width] for index in indexes]))
+
+    values = array(table.values.typecode)
+    if any(block.typecode == 'd' for block in blocks):
+        values = array('d')
+    for block in blocks:
+        values.extend(array(values.typecode, block))
+
+    return CostTable(periods, list(table.keys), list(table.metrics), dict(table.units), values, estimated)
+
+
+def group_totals(table: CostTable, metric: str) -> List[Tuple[Tuple[str, ...], float]]:
+    """
+    Sum a metric over all periods for each group key.
+
+    Args:
+        table: Table to aggregate
+        metric: Metric to sum
+
+    Returns:
+        (key, total) pairs, largest total first
+    """
+    totals = table.key_totals(metric)
+    return sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+
+
+def top_n(table: CostTable, metric: str, n: int) -> List[Tuple[Tuple[str, ...], float]]:
+    """Return the n group keys with the largest totals for a metric."""
+    return group_totals(table, metric)[:n]
+
+
+def cumulative(series: array) -> array:
+    """Return the running total of a series."""
+    return array('d', itertools.accumulate(series))
+
+
+def moving_average(series: array, window: int) -> array:
+    """
+    Return the trailing moving average of a series.
+
+    The first window - 1 values average over the values available so far.
+
+    Args:
+        series: Values in period order
+        window: Number of periods averaged
+
+    Raises:
+        ValueError: If window is less than 1
+    """
+    if window < 1:
+        raise ValueError("Moving average window must be at least 1")
+
+    sums = array('d', itertools.accumulate(itertools.chain([0.0], series)))
+    return array('d', (
+        (sums[index + 1] - sums[max(0, index + 1 - window)]) / min(index + 1, window)
+        for index in range(len(series))
+    ))
+
+
+def period_over_period(series: array, lag: int = 1) -> List[Tuple[Optional[float], Optional[float]]]:
+    """
+    Compare each value with the value `lag` periods earlier.
+
+    Args:
+        series: Values in period order
+        lag: Distance between compared periods (e.g. 1 for month over month
+            on MONTHLY data, 7 for week over week on DAILY data)
+
+    Returns:
+        (absolute change, percentage change) per period. Both are None when
+        there is no earlier period; the percentage is None when the earlier
+        value is zero.
+    """
+    changes = []
+    for index, value in enumerate(series):
+        if index < lag:
+            changes.append((None, None))
+            continue
+        previous = series[index - lag]
+        change = value - previous
+        changes.append((change, change / previous * 100 if previous else None))
+    return changes
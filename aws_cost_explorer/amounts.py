@@ -0,0 +1,171 @@
+"""Fixed-point parsing and formatting of Cost Explorer metric amounts."""
+
+import decimal
+import operator
+import sys
+import threading
+from array import array
+from typing import Iterable, List
+
+
+# CostTable and the rollups built on it, write_table() and the pretty and
+# tabular formatters work in these units. JSON output copies Amount strings
+# unchanged, and the warehouse keeps its REAL columns.
+
+# Amounts are stored as integer multiples of 10^-8 (micro-cents for USD)
+DIGITS = 8
+SCALE = 10 ** DIGITS
+
+# Scaled amounts below this size are parsed exactly through float():
+# a double holds them with less than half a unit of error
+EXACT_LIMIT = 2 ** 51
+
+_FLOAT_SCALE = float(SCALE)
+
+
+def _parse_exact(text: str) -> int:
+    """Parse an amount of any size through decimal arithmetic."""
+    try:
+        return int(decimal.Decimal(text).scaleb(DIGITS).to_integral_value(decimal.ROUND_HALF_EVEN))
+    except (decimal.InvalidOperation, OverflowError, ValueError) as error:
+        raise ValueError(f"Invalid amount: {text!r}") from error
+
+
+def parse_amount(text: str) -> int:
+    """
+    Parse an Amount string into an integer number of 10^-8 units.
+
+    Amounts with up to DIGITS decimal places are represented exactly;
+    further digits are rounded to the nearest unit.
+
+    Raises:
+        ValueError: If text is not a finite number
+    """
+    try:
+        scaled = round(float(text) * _FLOAT_SCALE)
+    except (OverflowError, ValueError):
+        return _parse_exact(text)
+    if -EXACT_LIMIT < scaled < EXACT_LIMIT:
+        return scaled
+    return _parse_exact(text)
+
+
+def parse_amounts(texts: Iterable[str]) -> array:
+    """
+    Parse many Amount strings at once into an array of 10^-8 units.
+
+    Each amount is parsed as parse_amount() would parse it. A batch holding
+    an amount of EXACT_LIMIT units or more is parsed value by value.
+
+    Returns:
+        An ``array('q')``, or an ``array('d')`` holding the same whole
+        numbers if an amount is beyond the int64 range (about 92 billion)
+
+    Raises:
+        ValueError: If an amount is not a finite number
+    """
+    texts = texts if isinstance(texts, list) else list(texts)
+    try:
+        scaled = array('q', map(float.__round__, map(_FLOAT_SCALE.__mul__, map(float, texts))))
+        if not scaled or (max(scaled) < EXACT_LIMIT and min(scaled) > -EXACT_LIMIT):
+            return scaled
+    except (OverflowError, ValueError):
+        pass
+    return amount_array(map(parse_amount, texts))
+
+
+def amount_array(amounts: Iterable[int]) -> array:
+    """Store amounts in an ``array('q')``, or an ``array('d')`` if one is beyond the int64 range."""
+    amounts = amounts if isinstance(amounts, list) else list(amounts)
+    try:
+        return array('q', amounts)
+    except OverflowError:
+        return array('d', amounts)
+
+
+def add_amount_arrays(first: array, second: array) -> array:
+    """Element-wise sum of two equally sized arrays from parse_amounts()."""
+    return amount_array(map(operator.add, first, second))
+
+
+def to_floats(amounts: Iterable[int]) -> array:
+    """Convert amounts in 10^-8 units to an ``array('d')`` of floats."""
+    return array('d', map(_FLOAT_SCALE.__rtruediv__, amounts))
+
+
+def amount_text(amount: int) -> str:
+    """
+    Format an amount in 10^-8 units as an exact decimal string.
+
+    Trailing zeros are dropped but one decimal place is always kept, so
+    whole amounts look like '36.0', as Cost Explorer amounts often do.
+    Amounts read from an ``array('d')`` are only as precise as a float.
+    """
+    if isinstance(amount, float):
+        return repr(amount / SCALE)
+    whole, fraction = divmod(abs(amount), SCALE)
+    fraction_text = f"{fraction:0{DIGITS}d}".rstrip('0') or '0'
+    return f"{'-' if amount < 0 else ''}{whole}.{fraction_text}"
+
+
+def format_amount(amount: int, places: int = 2) -> str:
+    """
+    Format an amount in 10^-8 units with a fixed number of decimal places.
+
+    Rounding is exact, half to even, so '2.675' becomes '2.68' rather
+    than the '2.67' that formatting its float gives. Amounts read from an
+    ``array('d')`` are rounded as floats.
+    """
+    if isinstance(amount, float) or -EXACT_LIMIT < amount < EXACT_LIMIT:
+        # Below EXACT_LIMIT a double holds the amount, and any halfway point
+        # between two results, exactly, so rounding the quotient is exact
+        return f"{round(amount / 10 ** (DIGITS - places)) / 10 ** places:.{places}f}"
+    quantum = 10 ** (DIGITS - places)
+    units, remainder = divmod(abs(amount), quantum)
+    if remainder * 2 > quantum or (remainder * 2 == quantum and units % 2):
+        units += 1
+    text = f"{units:0{places + 1}d}"
+    sign = '-' if amount < 0 and units else ''
+    if not places:
+        return f"{sign}{text}"
+    return f"{sign}{text[:-places]}.{text[-places:]}"
+
+
+def format_amounts(amounts: array, places: int = 2) -> List[str]:
+    """Format an array from parse_amounts() as format_amount() formats each amount, in one batch."""
+    if amounts.typecode == 'q' and amounts and (max(amounts) >= EXACT_LIMIT or min(amounts) <= -EXACT_LIMIT):
+        return [format_amount(amount, places) for amount in amounts]
+    quantum = float(10 ** (DIGITS - places))
+    return list(map(
+        f"{{:.{places}f}}".format,
+        map(float(10 ** places).__rtruediv__, map(round, map(quantum.__rtruediv__, amounts)))
+    ))
+
+
+class UnitTable:
+    """
+    Interned unit names ('USD', 'N/A', ...).
+
+    Every response repeats the same few units once per amount; the table
+    keeps a single copy of each.
+    """
+
+    def __init__(self):
+        """Initialize an empty table."""
+        self._names = {}
+        self._lock = threading.Lock()
+
+    def intern(self, unit: str) -> str:
+        """Return the table's copy of a unit name, adding it if it is new."""
+        name = self._names.get(unit)
+        if name is None:
+            with self._lock:
+                name = self._names.setdefault(unit, sys.intern(unit))
+        return name
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+# Table shared by every CostTable
+UNITS = UnitTable()
@@ -0,0 +1,278 @@
+"""Incremental cost anomaly detection over daily series."""
+
+import collections
+import datetime
+import json
+import math
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from aws_cost_explorer.results import CostTable
+
+
+DEFAULT_METRIC = 'BlendedCost'
+DEFAULT_WINDOW = 28
+DEFAULT_THRESHOLD = 3.0
+DEFAULT_ALPHA = 0.1
+DEFAULT_MIN_HISTORY = 7
+DEFAULT_MIN_CHANGE = 1.0
+
+# Per-weekday samples needed before the weekday baseline is used
+MIN_WEEKDAY_SAMPLES = 3
+
+
+def default_state_path() -> str:
+    """Return the default anomaly state file, honouring XDG_DATA_HOME."""
+    base = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    return os.path.join(base, 'aws-cost-explorer', 'anomalies.json')
+
+
+class SeriesState:
+    """
+    Running statistics of one daily series.
+
+    Each statistic is updated in O(1) per day: a rolling window mean and
+    variance from running sums, an exponentially weighted mean and variance,
+    and a Welford mean and variance per day of the week.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW, alpha: float = DEFAULT_ALPHA):
+        """
+        Initialize an empty series.
+
+        Args:
+            window: Number of days in the rolling window
+            alpha: Smoothing factor of the exponentially weighted statistics
+        """
+        self.alpha = alpha
+        self.recent = collections.deque(maxlen=window)
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.count = 0
+        self.ewma = 0.0
+        self.ewvar = 0.0
+        # [count, mean, sum of squared differences] per weekday, Monday first
+        self.weekdays = [[0, 0.0, 0.0] for _ in range(7)]
+        self.last_date = ''
+
+    def baselines(self, weekday: int) -> Dict[str, Tuple[float, float]]:
+        """
+        Return the expected value and standard deviation of each method.
+
+        Methods without enough history are left out.
+
+        Args:
+            weekday: Day of the week of the value being scored (Monday is 0)
+        """
+        baselines = {}
+        size = len(self.recent)
+        if size >= 2:
+            mean = self.total / size
+            variance = max(self.total_squares - size * mean * mean, 0.0) / (size - 1)
+            baselines['rolling'] = (mean, math.sqrt(variance))
+        if self.count >= 2:
+            baselines['ewma'] = (self.ewma, math.sqrt(self.ewvar))
+
+        count, mean, squares = self.weekdays[weekday]
+        if count >= MIN_WEEKDAY_SAMPLES:
+            baselines['weekday'] = (mean, math.sqrt(squares / (count - 1)))
+        return baselines
+
+    def update(self, value: float, weekday: int) -> None:
+        """Add one day's value to every statistic."""
+        if len(self.recent) == self.recent.maxlen:
+            oldest = self.recent[0]
+            self.total -= oldest
+            self.total_squares -= oldest * oldest
+        self.recent.append(value)
+        self.total += value
+        self.total_squares += value * value
+
+        if self.count:
+            difference = value - self.ewma
+            self.ewma += self.alpha * difference
+            self.ewvar = (1 - self.alpha) * (self.ewvar + self.alpha * difference * difference)
+        else:
+            self.ewma = value
+        self.count += 1
+
+        stats = self.weekdays[weekday]
+        stats[0] += 1
+        difference = value - stats[1]
+        stats[1] += difference / stats[0]
+        stats[2] += difference * (value - stats[1])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the state for JSON storage."""
+        return {
+            'recent': list(self.recent),
+            'count': self.count,
+            'ewma': self.ewma,
+            'ewvar': self.ewvar,
+            'weekdays': self.weekdays,
+            'last_date': self.last_date,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], window: int = DEFAULT_WINDOW, alpha: float = DEFAULT_ALPHA) -> 'SeriesState':
+        """Restore a state saved with to_dict()."""
+        state = cls(window, alpha)
+        state.recent.extend(data['recent'])
+        # Recompute the sums so they match the (possibly resized) window
+        state.total = sum(state.recent)
+        state.total_squares = sum(value * value for value in state.recent)
+        state.count = data['count']
+        state.ewma = data['ewma']
+        state.ewvar = data['ewvar']
+        state.weekdays = [list(stats) for stats in data['weekdays']]
+        state.last_date = data['last_date']
+        return state
+
+
+def _series_id(namespace: str, metric: str, key: Tuple[str, ...]) -> str:
+    return json.dumps([namespace, metric] + list(key))
+
+
+class AnomalyDetector:
+    """
+    Flags days whose cost deviates from the history of their series.
+
+    Every group key and metric is its own series. A day is scored against
+    the statistics of the days before it, then added to them, so feeding
+    the detector one new day only costs O(1) per series. Days on or before
+    the last day seen for a series are skipped, which makes it safe to run
+    over overlapping date ranges. Use load() and save() to keep the state
+    between runs.
+    """
+
+    def __init__(
+        self,
+        window: int = DEFAULT_WINDOW,
+        threshold: float = DEFAULT_THRESHOLD,
+        alpha: float = DEFAULT_ALPHA,
+        min_history: int = DEFAULT_MIN_HISTORY,
+        min_change: float = DEFAULT_MIN_CHANGE
+    ):
+        """
+        Initialize the detector.
+
+        Args:
+            window: Number of days in the rolling z-score window
+            threshold: Absolute z-score at which a day is flagged
+            alpha: Smoothing factor of the EWMA baseline
+            min_history: Days of history a series needs before it is scored
+            min_change: Smallest absolute difference from the expected value
+                that is reported, to ignore noise on tiny amounts
+        """
+        self.window = window
+        self.threshold = threshold
+        self.alpha = alpha
+        self.min_history = min_history
+        self.min_change = min_change
+        self.series = {}
+
+    def _score(self, state: SeriesState, value: float, weekday: int) -> List[Tuple[str, float, float]]:
+        """Return (method, expected, z-score) for each method flagging value."""
+        if state.count < self.min_history:
+            return []
+
+        flagged = []
+        for method, (expected, deviation) in state.baselines(weekday).items():
+            # Floor the deviation so perfectly flat history does not divide by zero
+            deviation = max(deviation, abs(expected) * 0.01)
+            if not deviation or abs(value - expected) < self.min_change:
+                continue
+            z_score = (value - expected) / deviation
+            if abs(z_score) >= self.threshold:
+                flagged.append((method, expected, z_score))
+        return flagged
+
+    def detect(self, table: CostTable, metric: str = DEFAULT_METRIC, namespace: str = '') -> List[Dict[str, Any]]:
+        """
+        Score the new days of a DAILY table and add the final ones to the state.
+
+        Estimated days are scored but not added, and the state does not
+        move past them, so a later run scores them again with their final
+        amounts. Days after an Estimated day are held back the same way.
+
+        Args:
+            table: DAILY cost data, e.g. from CostTable.from_response()
+            metric: Metric to analyse
+            namespace: Keeps the series of unrelated queries (e.g. other
+                profiles or filters) apart within one state
+
+        Returns:
+            One dict per anomalous day and group key, in date order, with
+            Date, Keys, Metric, Amount, Unit, Expected and ZScore of the
+            strongest method, the Methods that flagged it, and Estimated
+        """
+        if metric not in table.metrics:
+            return []
+
+        anomalies = []
+        unit = table.units.get(metric, '')
+        for key in table.keys:
+            series_id = _series_id(namespace, metric, key)
+            state = self.series.get(series_id)
+            if state is None:
+                state = self.series[series_id] = SeriesState(self.window, self.alpha)
+
+            values = table.series(key, metric)
+            final = True
+            for index, (start, _) in enumerate(table.periods):
+                if start <= state.last_date:
+                    continue
+                value = values[index]
+                weekday = datetime.datetime.strptime(start[:10], '%Y-%m-%d').weekday()
+
+                flagged = self._score(state, value, weekday)
+                if flagged:
+                    _, expected, z_score = max(flagged, key=lambda item: abs(item[2]))
+                    anomalies.append({
+                        'Date': start,
+                        'Keys': list(key),
+                        'Metric': metric,
+                        'Amount': value,
+                        'Unit': unit,
+                        'Expected': expected,
+                        'ZScore': z_score,
+                        'Methods': [method for method, _, _ in flagged],
+                        'Estimated': table.estimated[index],
+                    })
+
+                final = final and not table.estimated[index]
+                if final:
+                    state.update(value, weekday)
+                    state.last_date = start
+
+        anomalies.sort(key=lambda anomaly: (anomaly['Date'], anomaly['Keys']))
+        return anomalies
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, **settings: Any) -> 'AnomalyDetector':
+        """
+        Create a detector, restoring its state from a file if it exists.
+
+        Args:
+            path: State file (defaults to default_state_path())
+            **settings: Keyword arguments for the constructor
+        """
+        detector = cls(**settings)
+        path = path or default_state_path()
+        if os.path.exists(path):
+            with open(path) as state_file:
+                data = json.load(state_file)
+            detector.series = {
+                series_id: SeriesState.from_dict(state, detector.window, detector.alpha)
+                for series_id, state in data.get('series', {}).items()
+            }
+        return detector
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Write the state to a file, replacing it atomically."""
+        path = path or default_state_path()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, 'w') as state_file:
+            json.dump({'series': {series_id: state.to_dict() for series_id, state in self.series.items()}}, state_file)
+        os.replace(temporary_path, path)
@@ -0,0 +1,98 @@
+"""Asyncio wrapper around CostExplorerClient."""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Optional
+
+from aws_cost_explorer.cache import make_cache_key
+from aws_cost_explorer.cost_client import CostExplorerClient
+
+
+DEFAULT_MAX_WORKERS = 8
+
+_END = object()
+
+
+class AsyncCostExplorerClient:
+    """
+    Non-blocking Cost Explorer client for asyncio applications.
+
+    Blocking boto3 calls run in a dedicated thread pool. Identical queries
+    issued while one is already in flight share its result instead of
+    making another upstream call, so the returned responses must be
+    treated as read-only.
+    """
+
+    def __init__(
+        self,
+        client: Optional[CostExplorerClient] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        **client_kwargs: Any
+    ):
+        """
+        Initialize the async client.
+
+        Args:
+            client: Synchronous client to wrap. If omitted, one is created
+                from client_kwargs (profile, session, cache, throttler).
+            max_workers: Maximum number of concurrent blocking calls
+            **client_kwargs: Arguments for CostExplorerClient
+        """
+        self.client = client or CostExplorerClient(**client_kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._in_flight = {}
+
+    async def _run(self, func: Any, *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking callable in the thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def get_cost_and_usage(self, **query: Any) -> Dict[str, Any]:
+        """
+        Query AWS Cost Explorer for cost data without blocking the loop.
+
+        Args:
+            **query: Arguments accepted by CostExplorerClient.get_cost_and_usage()
+
+        Returns:
+            Cost data from AWS Cost Explorer, all pages merged
+        """
+        request = self.client._build_request(**query)
+        key = make_cache_key(self.client.profile or 'default', request)
+
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._run(self.client.get_cost_and_usage, **query))
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # Shield so one cancelled caller does not cancel the shared request
+        return await asyncio.shield(future)
+
+    async def iter_cost_and_usage(self, **query: Any) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield ResultsByTime entries, fetching pages as they are consumed.
+
+        Args:
+            **query: Arguments accepted by CostExplorerClient.iter_cost_and_usage()
+
+        Yields:
+            ResultsByTime entries in chronological order
+        """
+        periods = self.client.iter_cost_and_usage(**query)
+        while True:
+            period = await self._run(next, periods, _END)
+            if period is _END:
+                break
+            yield period
+
+    async def close(self) -> None:
+        """Shut down the thread pool once running calls have finished."""
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+
+    async def __aenter__(self) -> 'AsyncCostExplorerClient':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
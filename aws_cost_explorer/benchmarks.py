@@ -0,0 +1,265 @@
+"""Benchmarks for fetching, parsing and formatting cost data."""
+
+import datetime
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from array import array
+from typing import Any, Callable, Dict, List, Optional
+
+from aws_cost_explorer.amounts import parse_amounts
+from aws_cost_explorer.cost_client import CostExplorerClient
+from aws_cost_explorer.fake_backend import FakeCostExplorer, FakeSession
+from aws_cost_explorer.formatters import get_formatter
+from aws_cost_explorer.results import CostTable
+from aws_cost_explorer.throttling import RateLimiter, RetryPolicy, ThrottleStats, Throttler
+
+
+DEFAULT_METRICS = ['BlendedCost', 'UnblendedCost', 'UsageQuantity']
+
+# Dependencies that should only be imported on the code paths needing them
+HEAVY_MODULES = ('boto3', 'botocore', 'dateutil', 'pyarrow', 'numpy')
+
+# Directory holding query_aws_costs.py
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(stage: str, func: Callable[[], Any], rows: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Run func twice: once for wall time, then again under tracemalloc.
+
+    Timing and memory tracing are kept apart because tracemalloc slows
+    allocation-heavy code down considerably.
+
+    Args:
+        stage: Name of the stage being measured
+        func: Callable to run; must be repeatable
+        rows: Number of rows the stage processes, for rows_per_second
+
+    Returns:
+        Dict with stage, seconds, peak_bytes, rows, rows_per_second and
+        the value returned by func under 'result'
+    """
+    started = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'stage': stage,
+        'seconds': seconds,
+        'peak_bytes': peak_bytes,
+        'rows': rows,
+        'rows_per_second': rows / seconds if rows and seconds else None,
+        'result': result,
+    }
+
+
+def parse_amounts_per_value(response: Dict[str, Any]) -> array:
+    """Parse every group Amount with float(), one value at a time."""
+    values = array('d')
+    for period in response['ResultsByTime']:
+        for group in period.get('Groups', []):
+            for data in group['Metrics'].values():
+                values.append(float(data['Amount']))
+    return values
+
+
+def parse_amounts_fixed(response: Dict[str, Any]) -> array:
+    """Collect every group Amount string, then parse them in one parse_amounts() batch."""
+    return parse_amounts([
+        data['Amount']
+        for period in response['ResultsByTime']
+        for group in period.get('Groups', [])
+        for data in group['Metrics'].values()
+    ])
+
+
+def run_benchmarks(
+    days: int = 365,
+    groups: int = 100,
+    page_size: int = 1000,
+    latency: float = 0.0,
+    throttle_every: int = 0,
+    formats: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Benchmark the fetch, parse and format stages against a fake backend.
+
+    Besides building a CostTable ('parse'), amount parsing is measured on
+    its own: float() value by value ('amounts:float') against one
+    fixed-point parse_amounts() batch ('amounts:fixed'), each including the
+    walk over the response. 'table:csv' writes the parsed table as CSV with
+    write_table(), for comparison with 'format:csv' writing the response.
+
+    Args:
+        days: Length of the DAILY range queried
+        groups: Groups per day (one GroupBy SERVICE dimension)
+        page_size: Group rows per response page
+        latency: Simulated seconds per API call
+        throttle_every: Simulate throttling on every Nth API call
+        formats: Output formats to benchmark (defaults to pretty, json, csv)
+
+    Returns:
+        One result dict per stage, as produced by measure(), without the
+        stage's return value
+    """
+    backend = FakeCostExplorer(
+        groups=groups, page_size=page_size, latency=latency, throttle_every=throttle_every
+    )
+    throttler = Throttler(
+        limiter=RateLimiter(rate=1000, burst=1000),
+        policy=RetryPolicy(base_delay=0.01, max_delay=0.1)
+    )
+    client = CostExplorerClient(session=FakeSession(backend), throttler=throttler)
+    query = {
+        'start_date': '2022-01-01',
+        'end_date': (datetime.date(2022, 1, 1) + datetime.timedelta(days=days)).strftime('%Y-%m-%d'),
+        'metrics': DEFAULT_METRICS,
+        'group_by': ['SERVICE'],
+    }
+    rows = days * groups * len(DEFAULT_METRICS)
+
+    def fetch_all():
+        # Reset the counters so they describe a single run
+        del backend.calls[:]
+        throttler.stats = ThrottleStats()
+        return client.get_cost_and_usage(**query)
+
+    fetch = measure('fetch', fetch_all, rows)
+    fetch['api_calls'] = len(backend.calls)
+    fetch['retries'] = throttler.stats.retries
+    response = fetch['result']
+
+    results = [
+        fetch,
+        measure('parse', lambda: CostTable.from_response(response), rows),
+        measure('amounts:float', lambda: parse_amounts_per_value(response), rows),
+        measure('amounts:fixed', lambda: parse_amounts_fixed(response), rows),
+    ]
+    for format_type in formats or ['pretty', 'json', 'csv']:
+        formatter = get_formatter(format_type)
+        new_stream = io.BytesIO if formatter.binary else io.StringIO
+        results.append(measure(f'format:{format_type}', lambda: formatter.output(response, new_stream()), rows))
+
+    # Writing a parsed table, without formatting its amounts as text and parsing them again
+    table = results[1]['result']
+    metadata = {'GroupDefinitions': response.get('GroupDefinitions', [])}
+    results.append(measure('table:csv', lambda: get_formatter('csv').write_table(table, io.StringIO(), metadata), rows))
+
+    for result in results:
+        del result['result']
+    return results
+
+
+def loaded_heavy_modules(code: str) -> List[str]:
+    """
+    Run code in a fresh interpreter and list the heavy modules it imported.
+
+    Args:
+        code: Python source to run from the project root
+
+    Returns:
+        Names from HEAVY_MODULES present in sys.modules afterwards
+    """
+    probe = f"{code}\nimport json, sys\nprint(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))"
+    output = subprocess.run(
+        [sys.executable, '-c', probe], cwd=PROJECT_ROOT, check=True, stdout=subprocess.PIPE
+    ).stdout
+    return json.loads(output.decode('utf-8').splitlines()[-1])
+
+
+def run_startup_benchmarks(runs: int = 5) -> List[Dict[str, Any]]:
+    """
+    Benchmark CLI startup in fresh interpreters.
+
+    Stages are 'startup:import' (importing query_aws_costs) and
+    'startup:help' (running query_aws_costs.py --help). Each reports the
+    fastest of ``runs`` wall times, including interpreter startup, and the
+    heavy modules that were imported along the way.
+
+    Args:
+        runs: Number of times each command is run
+
+    Returns:
+        One result dict per stage, in the format of run_benchmarks()
+    """
+    commands = {
+        'startup:import': ([sys.executable, '-c', 'import query_aws_costs'], 'import query_aws_costs'),
+        'startup:help': (
+            [sys.executable, os.path.join(PROJECT_ROOT, 'query_aws_costs.py'), '--help'],
+            "import sys, runpy\nsys.argv = ['query_aws_costs.py', '--help']\n"
+            "try:\n    runpy.run_path('query_aws_costs.py', run_name='__main__')\nexcept SystemExit:\n    pass"
+        ),
+    }
+
+    results = []
+    for stage, (command, probe) in commands.items():
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            subprocess.run(command, cwd=PROJECT_ROOT, check=True, stdout=subprocess.DEVNULL)
+            timings.append(time.perf_counter() - started)
+        results.append({
+            'stage': stage,
+            'seconds': min(timings),
+            'peak_bytes': 0,
+            'rows': None,
+            'rows_per_second': None,
+            'heavy_modules': loaded_heavy_modules(probe),
+        })
+    return results
+
+
+def format_report(results: List[Dict[str, Any]]) -> str:
+    """Render benchmark results as a text table."""
+    lines = [f"{'stage':<16}{'seconds':>10}{'peak MiB':>10}{'rows/s':>14}{'api calls':>11}"]
+    for result in results:
+        rate = f"{result['rows_per_second']:,.0f}" if result.get('rows_per_second') else '-'
+        lines.append(
+            f"{result['stage']:<16}{result['seconds']:>10.3f}{result['peak_bytes'] / 2 ** 20:>10.1f}"
+            f"{rate:>14}{result.get('api_calls', '-'):>11}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def compare_to_baseline(
+    results: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    tolerance: float = 0.25
+) -> List[str]:
+    """
+    Find stages that got slower than a saved baseline.
+
+    Args:
+        results: Current benchmark results
+        baseline: Results saved from an earlier run
+        tolerance: Allowed relative slowdown (0.25 = 25%)
+
+    Returns:
+        A description of each regressed stage
+    """
+    previous = {result['stage']: result for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(result['stage'])
+        if before and result['seconds'] > before['seconds'] * (1 + tolerance):
+            regressions.append(
+                f"{result['stage']}: {result['seconds']:.3f}s vs baseline {before['seconds']:.3f}s"
+            )
+    return regressions
+
+
+def dumps(results: List[Dict[str, Any]]) -> str:
+    """Serialize benchmark results as JSON."""
+    return json.dumps(results, indent=2)
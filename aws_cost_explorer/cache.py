@@ -0,0 +1,165 @@
+"""On-disk cache for AWS Cost Explorer responses."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+DEFAULT_TTL = 3600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def default_cache_path() -> str:
+    """Return the default cache file location, honouring XDG_CACHE_HOME."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'aws-cost-explorer', 'responses.sqlite')
+
+
+def make_cache_key(namespace: str, request: Dict[str, Any]) -> str:
+    """
+    Build a stable cache key for a Cost Explorer request.
+
+    Args:
+        namespace: Account or profile the request is made against
+        request: Request keyword arguments (TimePeriod, Granularity, Metrics,
+            GroupBy, Filter, ...)
+
+    Returns:
+        A hex digest identifying the query
+    """
+    payload = json.dumps([namespace, request], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def is_estimated(response: Dict[str, Any]) -> bool:
+    """Return True if any period in the response is still estimated."""
+    return any(period.get('Estimated', False) for period in response.get('ResultsByTime', []))
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of Cost Explorer responses.
+
+    Entries for finalized data never expire. Entries containing estimated
+    periods expire after ``ttl`` seconds. When the stored payloads exceed
+    ``max_bytes`` the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file (defaults to default_cache_path()).
+                Use ':memory:' for a process-local cache.
+            ttl: Lifetime in seconds of entries containing estimated data
+            max_bytes: Upper bound on the total size of stored payloads
+            clock: Function returning the current time in seconds
+        """
+        self.path = path or default_cache_path()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._lock = threading.Lock()
+
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            ' key TEXT PRIMARY KEY,'
+            ' payload TEXT NOT NULL,'
+            ' estimated INTEGER NOT NULL,'
+            ' stored_at REAL NOT NULL,'
+            ' accessed_at REAL NOT NULL,'
+            ' size INTEGER NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)')
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Key produced by make_cache_key()
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        now = self.clock()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT payload, estimated, stored_at FROM entries WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            payload, estimated, stored_at = row
+            if estimated and now - stored_at >= self.ttl:
+                self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+                self._conn.commit()
+                return None
+
+            self._conn.execute('UPDATE entries SET accessed_at = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+
+        return json.loads(payload)
+
+    def put(self, key: str, value: Any, estimated: bool) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Key produced by make_cache_key()
+            value: JSON-serializable value to store
+            estimated: Whether the value contains estimated (mutable) data
+        """
+        payload = json.dumps(value, separators=(',', ':'), default=str)
+        now = self.clock()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)',
+                (key, payload, int(estimated), now, now, len(payload))
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under max_bytes."""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute('SELECT key, size FROM entries ORDER BY accessed_at').fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+            total -= size
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._conn.execute('DELETE FROM entries')
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
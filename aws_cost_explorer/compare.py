@@ -0,0 +1,184 @@
+"""Compare costs between two date ranges, per metric and per group."""
+
+import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from aws_cost_explorer.cost_client import CostExplorerClient, parse_group_by
+from aws_cost_explorer.date_utils import DATE_FORMAT, get_date_range
+from aws_cost_explorer.planner import DEFAULT_MAX_WORKERS, DEFAULT_METRICS, ReportSpec, run_reports
+from aws_cost_explorer.results import CostTable
+
+
+COMPARISON_MODES = ('month', 'week-yoy', 'previous')
+DEFAULT_SORT_METRIC = 'UnblendedCost'
+
+# 52 weeks back lands on the same weekday a year earlier
+YEAR_OVER_YEAR = datetime.timedelta(weeks=52)
+
+
+def comparison_ranges(
+    mode: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    days: Optional[int] = None,
+    today: Optional[datetime.date] = None
+) -> Tuple[Tuple[str, str], Tuple[str, str]]:
+    """
+    Return the current and previous date ranges of a comparison.
+
+    Modes:
+
+    - 'month': this month to date against the whole previous month, as
+      with --month and --previous-month.
+    - 'week-yoy': this week, Monday to date, against the same weekdays 52
+      weeks earlier.
+    - 'previous': the range given by start_date, end_date or days (as for
+      get_date_range()) against the range of the same length just before it.
+
+    Args:
+        mode: One of COMPARISON_MODES
+        start_date: Start date in YYYY-MM-DD format, for 'previous'
+        end_date: End date in YYYY-MM-DD format (inclusive), for 'previous'
+        days: Number of days to look back from today, for 'previous'
+        today: Date the ranges are calculated from (defaults to today)
+
+    Returns:
+        ((start, end), (start, end)) of the current and previous range,
+        with exclusive end dates
+
+    Raises:
+        ValueError: If mode is unknown, or the 'previous' range has no start
+    """
+    today = today or datetime.date.today()
+    if mode == 'month':
+        return get_date_range(month=True, today=today), get_date_range(previous_month=True, today=today)
+
+    if mode == 'week-yoy':
+        monday = today - datetime.timedelta(days=today.weekday())
+        current, previous = (
+            get_date_range(start_date=start.strftime(DATE_FORMAT), end_date=end.strftime(DATE_FORMAT))
+            for start, end in ((monday, today), (monday - YEAR_OVER_YEAR, today - YEAR_OVER_YEAR))
+        )
+        return current, previous
+
+    if mode == 'previous':
+        start, end = get_date_range(start_date=start_date, end_date=end_date, days=days, today=today)
+        if not start:
+            raise ValueError("Comparing with the previous range requires a start date")
+        end = end or (today + datetime.timedelta(days=1)).strftime(DATE_FORMAT)
+        first = datetime.datetime.strptime(start, DATE_FORMAT)
+        length = datetime.datetime.strptime(end, DATE_FORMAT) - first
+        return (start, end), ((first - length).strftime(DATE_FORMAT), start)
+
+    raise ValueError(f"Unknown comparison: {mode}. Valid comparisons: {', '.join(COMPARISON_MODES)}")
+
+
+def _totals(table: CostTable, metric: str) -> Dict[Tuple[str, ...], float]:
+    """Return a metric's amount per group key, or nothing if the table lacks the metric."""
+    return table.key_totals(metric) if metric in table.metrics else {}
+
+
+def _change(current: float, previous: float, unit: str) -> Dict[str, Any]:
+    """Describe the change of one metric between the two ranges."""
+    change = current - previous
+    return {
+        'Current': {'Amount': current, 'Unit': unit},
+        'Previous': {'Amount': previous, 'Unit': unit},
+        'Change': {'Amount': change, 'Unit': unit},
+        'PercentChange': change / previous * 100 if previous else None,
+    }
+
+
+def compare_costs(
+    client: CostExplorerClient,
+    current: Tuple[str, str],
+    previous: Tuple[str, str],
+    metrics: Optional[List[str]] = None,
+    group_by: Optional[List[Union[str, Dict[str, str]]]] = None,
+    filter_expression: Optional[Dict[str, Any]] = None,
+    sort_metric: str = DEFAULT_SORT_METRIC,
+    max_workers: int = DEFAULT_MAX_WORKERS
+) -> Dict[str, Any]:
+    """
+    Compare the costs of two date ranges, in total and per group.
+
+    Both ranges are fetched as MONTHLY reports through run_reports(), so
+    ranges that touch at a month start (such as last month and this month
+    to date) share a single query, and others are fetched concurrently.
+    Each range's periods are then summed per group and metric.
+
+    Args:
+        client: Client used to query Cost Explorer
+        current: (start, end) of the range being reviewed, end exclusive
+        previous: (start, end) of the range it is compared with
+        metrics: Metrics to compare (defaults to DEFAULT_METRICS)
+        group_by: Up to two groupings, as for get_cost_and_usage()
+        filter_expression: Cost Explorer Filter applied to both ranges
+        sort_metric: Metric whose absolute change orders the groups
+            (defaults to the first metric if it is not compared)
+        max_workers: Maximum number of queries run at once
+
+    Returns:
+        Dict with a 'Comparison' entry holding the Current and Previous
+        ranges (Start, End and whether any of it is Estimated), Metrics,
+        GroupDefinitions, Groups with the Current, Previous, Change and
+        PercentChange (None when the previous amount is 0) of each metric
+        per key, largest change first, and the same for the Total
+    """
+    metrics = list(metrics or DEFAULT_METRICS)
+    definitions = [parse_group_by(spec) for spec in group_by or []]
+    if sort_metric not in metrics:
+        sort_metric = metrics[0]
+
+    ranges = {'Current': current, 'Previous': previous}
+    reports = [
+        ReportSpec(
+            name, start, end, granularity='MONTHLY', metrics=metrics,
+            group_by=definitions, filter_expression=filter_expression
+        )
+        for name, (start, end) in ranges.items()
+    ]
+    responses = run_reports(client, reports, max_workers=max_workers)
+    tables = {name: CostTable.from_response(response) for name, response in responses.items()}
+
+    units = {}
+    for table in tables.values():
+        for metric, unit in table.units.items():
+            units.setdefault(metric, unit)
+    current_totals = {metric: _totals(tables['Current'], metric) for metric in metrics}
+    previous_totals = {metric: _totals(tables['Previous'], metric) for metric in metrics}
+
+    groups = []
+    if definitions:
+        keys = dict.fromkeys(tables['Current'].keys + tables['Previous'].keys)
+        for key in keys:
+            groups.append({
+                'Keys': list(key),
+                'Metrics': {
+                    metric: _change(
+                        current_totals[metric].get(key, 0.0),
+                        previous_totals[metric].get(key, 0.0),
+                        units.get(metric, '')
+                    )
+                    for metric in metrics
+                }
+            })
+        groups.sort(key=lambda group: -abs(group['Metrics'][sort_metric]['Change']['Amount']))
+
+    return {
+        'Comparison': {
+            'Current': {'Start': current[0], 'End': current[1], 'Estimated': any(tables['Current'].estimated)},
+            'Previous': {'Start': previous[0], 'End': previous[1], 'Estimated': any(tables['Previous'].estimated)},
+            'Metrics': metrics,
+            'GroupDefinitions': definitions,
+            'Groups': groups,
+            'Total': {
+                metric: _change(
+                    sum(current_totals[metric].values()),
+                    sum(previous_totals[metric].values()),
+                    units.get(metric, '')
+                )
+                for metric in metrics
+            },
+        }
+    }
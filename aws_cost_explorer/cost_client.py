@@ -1,66 +1,559 @@
 """AWS Cost Explorer client module for retrieving cost data."""
 
-import boto3
+import collections
 import datetime
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Any, Union
+
+from aws_cost_explorer import instrumentation
+from aws_cost_explorer.cache import ResponseCache, make_cache_key
+from aws_cost_explorer.date_utils import split_date_range
+from aws_cost_explorer.throttling import Throttler, get_default_throttler
+
+if TYPE_CHECKING:
+    import boto3
+
+
+DEFAULT_CHUNK_WORKERS = 4
+DEFAULT_CHUNK_THRESHOLD_DAYS = 62
+
+# GetCostForecast metric names for GetCostAndUsage metrics
+FORECAST_METRICS = {
+    'AmortizedCost': 'AMORTIZED_COST',
+    'BlendedCost': 'BLENDED_COST',
+    'NetAmortizedCost': 'NET_AMORTIZED_COST',
+    'NetUnblendedCost': 'NET_UNBLENDED_COST',
+    'UnblendedCost': 'UNBLENDED_COST',
+    'UsageQuantity': 'USAGE_QUANTITY',
+}
 
 
 class CostExplorerClient:
-    """Client for interacting with AWS Cost Explorer."""
+    """
+    Client for interacting with AWS Cost Explorer.
 
-    def __init__(self, profile: Optional[str] = None, session: Optional[boto3.Session] = None):
+    boto3 is only imported, and the session and 'ce' client only created,
+    when the first API call is made, so answers served entirely from the
+    cache never pay for them.
+    """
+
+    def __init__(
+        self,
+        profile: Optional[str] = None,
+        session: Optional['boto3.Session'] = None,
+        cache: Optional[ResponseCache] = None,
+        throttler: Optional[Throttler] = None,
+        chunk_workers: int = DEFAULT_CHUNK_WORKERS,
+        chunk_threshold_days: int = DEFAULT_CHUNK_THRESHOLD_DAYS
+    ):
         """
         Initialize the Cost Explorer client.
-        
+
         Args:
             profile: AWS profile name to use
             session: Existing boto3 session (if provided, profile is ignored)
+            cache: Cache of previously fetched periods. When set, only the
+                parts of a requested range that are not cached are fetched.
+            throttler: Rate limiter and retry policy for API calls (defaults
+                to the process-wide throttler shared by all clients)
+            chunk_workers: Maximum number of chunks of a long range fetched
+                at once
+            chunk_threshold_days: DAILY ranges longer than this are split into
+                month-aligned chunks that are fetched concurrently
         """
         self.profile = profile
-        
-        if session:
-            self.session = session
+        self.cache = cache
+        self.throttler = throttler or get_default_throttler()
+        self.chunk_workers = chunk_workers
+        self.chunk_threshold_days = chunk_threshold_days
+        self._session = session
+        self._ce_client = None
+
+    @property
+    def session(self) -> 'boto3.Session':
+        """The boto3 session, created on first use."""
+        if self._session is None:
+            with instrumentation.timer('boto3.session'):
+                import boto3
+
+                self._session = boto3.Session(profile_name=self.profile) if self.profile else boto3.Session()
+        return self._session
+
+    @property
+    def ce_client(self) -> Any:
+        """The Cost Explorer client, created on first use."""
+        if self._ce_client is None:
+            session = self.session
+            with instrumentation.timer('boto3.client'):
+                self._ce_client = session.client('ce')
+        return self._ce_client
+
+    def _build_request(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        granularity: str = 'DAILY',
+        metrics: Optional[List[str]] = None,
+        group_by: Optional[List[Union[str, Dict[str, str]]]] = None,
+        filter_expression: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Build the keyword arguments for a GetCostAndUsage request."""
+        # Default to 30 days ago and today if dates not provided
+        if not start_date:
+            start_date = (datetime.datetime.now() - datetime.timedelta(days=30)).strftime('%Y-%m-%d')
+        if not end_date:
+            end_date = datetime.datetime.now().strftime('%Y-%m-%d')
+
+        if not metrics:
+            metrics = ['BlendedCost', 'UnblendedCost', 'UsageQuantity']
+
+        request = {
+            'TimePeriod': {
+                'Start': start_date,
+                'End': end_date
+            },
+            'Granularity': granularity,
+            'Metrics': metrics
+        }
+        if group_by:
+            request['GroupBy'] = [parse_group_by(spec) for spec in group_by]
+        if filter_expression:
+            request['Filter'] = filter_expression
+        return request
+
+    def _call(self, operation: str, **params: Any) -> Dict[str, Any]:
+        """Call a Cost Explorer operation through the rate limiter."""
+        method = getattr(self.ce_client, operation)
+        instrumentation.count('api.calls')
+        with instrumentation.timer(f'api.{operation}'):
+            return self.throttler.call(method, **params)
+
+    def _iter_pages(self, request: Dict[str, Any], operation: str = 'get_cost_and_usage') -> Iterator[Dict[str, Any]]:
+        """
+        Yield raw responses of a paginated operation, following NextPageToken.
+
+        Args:
+            request: Request keyword arguments, e.g. from _build_request()
+            operation: Cost Explorer client method to call
+        """
+        token = None
+        while True:
+            params = dict(request, NextPageToken=token) if token else request
+            page = self._call(operation, **params)
+            instrumentation.count('api.pages')
+            instrumentation.count('api.periods', len(page.get('ResultsByTime', [])))
+            yield page
+
+            token = page.get('NextPageToken')
+            if not token:
+                break
+
+    def _split_request(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Split a long request into month-aligned requests.
+
+        Only DAILY requests spanning more than chunk_threshold_days are split,
+        and DAILY periods never cross a month boundary, so the chunks' results
+        concatenate to exactly the unsplit result.
+        """
+        start = request['TimePeriod']['Start']
+        end = request['TimePeriod']['End']
+        if request['Granularity'] != 'DAILY' or self.chunk_workers < 2:
+            return [request]
+
+        days = (datetime.datetime.strptime(end, '%Y-%m-%d') - datetime.datetime.strptime(start, '%Y-%m-%d')).days
+        if days <= self.chunk_threshold_days:
+            return [request]
+
+        return [
+            dict(request, TimePeriod={'Start': chunk_start, 'End': chunk_end})
+            for chunk_start, chunk_end in split_date_range(start, end, 'MONTHLY')
+        ]
+
+    def _iter_chunked_pages(self, request: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield raw responses for a request, fetching long ranges in parallel.
+
+        Chunks are fetched concurrently by up to chunk_workers threads, all
+        sharing the client's throttler, and their pages are yielded in
+        chronological order.
+        """
+        chunks = self._split_request(request)
+        if len(chunks) == 1:
+            yield from self._iter_pages(request)
+            return
+
+        for pages in _map_ordered(lambda chunk: list(self._iter_pages(chunk)), chunks, self.chunk_workers):
+            yield from pages
+
+    def iter_cost_and_usage(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        granularity: str = 'DAILY',
+        metrics: Optional[List[str]] = None,
+        group_by: Optional[List[Union[str, Dict[str, str]]]] = None,
+        filter_expression: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield ResultsByTime entries across all result pages.
+
+        Pages are only requested as the iterator is consumed (long DAILY
+        ranges are fetched a few month-sized chunks ahead). When a time
+        period's groups are split across pages, the pieces are combined so
+        each period is yielded exactly once.
+
+        Args:
+            start_date: Start date in YYYY-MM-DD format. Defaults to 30 days ago.
+            end_date: End date in YYYY-MM-DD format. Defaults to today.
+            granularity: Time granularity (DAILY, MONTHLY, etc.)
+            metrics: Cost metrics to retrieve.
+            group_by: Up to two groupings, as GroupBy dicts or strings such as
+                'SERVICE', 'TAG:team' or 'COST_CATEGORY:project'
+            filter_expression: Cost Explorer Filter expression
+
+        Yields:
+            ResultsByTime entries in chronological order
+        """
+        request = self._build_request(
+            start_date, end_date, granularity, metrics, group_by, filter_expression
+        )
+        if self.cache is not None:
+            yield from self._iter_cached_periods(request)
         else:
-            self.session = boto3.Session(profile_name=profile) if profile else boto3.Session()
-            
-        self.ce_client = self.session.client('ce')
-    
+            yield from self._iter_periods(request)
+
+    def _iter_periods(self, request: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield merged ResultsByTime entries for a request from the API."""
+        return _merge_periods(
+            period
+            for page in self._iter_chunked_pages(request)
+            for period in page.get('ResultsByTime', [])
+        )
+
+    def _iter_gap_periods(
+        self,
+        request: Dict[str, Any],
+        attributes: Dict[str, Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield unmerged ResultsByTime entries from the API, collecting DimensionValueAttributes by Value."""
+        for page in self._iter_chunked_pages(request):
+            for attribute in page.get('DimensionValueAttributes', []):
+                attributes.setdefault(attribute.get('Value'), attribute)
+            yield from page.get('ResultsByTime', [])
+
+    def _period_key(self, request: Dict[str, Any], start: str, end: str) -> str:
+        """Cache key for a single period of a request."""
+        return make_cache_key(self.profile or 'default', dict(request, TimePeriod={'Start': start, 'End': end}))
+
+    def _iter_cached_periods(
+        self,
+        request: Dict[str, Any],
+        attributes: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield periods for a request, fetching only the uncached ones.
+
+        The range is split into the periods Cost Explorer will report for the
+        granularity. Runs of consecutive uncached periods are coalesced into a
+        single API request and every fetched period is stored in the cache,
+        together with the DimensionValueAttributes of its group keys.
+
+        Args:
+            request: GetCostAndUsage request
+            attributes: Filled with the DimensionValueAttributes of the
+                yielded periods, by Value, if given
+        """
+        if attributes is None:
+            attributes = {}
+        segments = split_date_range(
+            request['TimePeriod']['Start'], request['TimePeriod']['End'], request['Granularity']
+        )
+        cached = [self.cache.get(self._period_key(request, start, end)) for start, end in segments]
+
+        index = 0
+        while index < len(segments):
+            if cached[index] is not None:
+                instrumentation.count('cache.hits')
+                period = cached[index]
+                for attribute in period.pop('DimensionValueAttributes', []):
+                    attributes.setdefault(attribute.get('Value'), attribute)
+                yield period
+                index += 1
+                continue
+
+            gap_end = index
+            while gap_end < len(segments) and cached[gap_end] is None:
+                gap_end += 1
+
+            gap_request = dict(
+                request,
+                TimePeriod={'Start': segments[index][0], 'End': segments[gap_end - 1][1]}
+            )
+            instrumentation.count('cache.misses', gap_end - index)
+            gap_attributes = {}
+            for period in _merge_periods(self._iter_gap_periods(gap_request, gap_attributes)):
+                key = self._period_key(request, period['TimePeriod']['Start'], period['TimePeriod']['End'])
+                values = {value for group in period.get('Groups', []) for value in group.get('Keys', [])}
+                period_attributes = [attribute for value, attribute in gap_attributes.items() if value in values]
+                entry = dict(period, DimensionValueAttributes=period_attributes) if period_attributes else period
+                self.cache.put(key, entry, estimated=period.get('Estimated', False))
+                for attribute in period_attributes:
+                    attributes.setdefault(attribute.get('Value'), attribute)
+                yield period
+
+            index = gap_end
+
     def get_cost_and_usage(
         self,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         granularity: str = 'DAILY',
         metrics: Optional[List[str]] = None,
+        group_by: Optional[List[Union[str, Dict[str, str]]]] = None,
+        filter_expression: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         Query AWS Cost Explorer for cost data.
-        
+
+        All result pages are fetched and merged into a single response. With a
+        cache configured, only the uncached parts of the range are requested.
+
         Args:
             start_date: Start date in YYYY-MM-DD format. Defaults to 30 days ago.
             end_date: End date in YYYY-MM-DD format. Defaults to today.
             granularity: Time granularity (DAILY, MONTHLY, etc.)
             metrics: Cost metrics to retrieve.
-            
+            group_by: Up to two groupings, as GroupBy dicts or strings such as
+                'SERVICE', 'TAG:team' or 'COST_CATEGORY:project'
+            filter_expression: Cost Explorer Filter expression
+
         Returns:
             Cost data from AWS Cost Explorer
         """
-        # Default to 30 days ago and today if dates not provided
+        request = self._build_request(
+            start_date, end_date, granularity, metrics, group_by, filter_expression
+        )
+        if self.cache is None:
+            return merge_pages(self._iter_chunked_pages(request))
+
+        attributes = {}
+        response = {'ResultsByTime': list(self._iter_cached_periods(request, attributes))}
+        if 'GroupBy' in request:
+            response['GroupDefinitions'] = request['GroupBy']
+        if attributes:
+            response['DimensionValueAttributes'] = list(attributes.values())
+        return response
+
+    def _lookback_period(self, start_date: Optional[str], end_date: Optional[str]) -> Dict[str, str]:
+        """TimePeriod for dimension and tag lookups, defaulting to the last 30 days."""
+        today = datetime.date.today()
+        return {
+            'Start': start_date or (today - datetime.timedelta(days=30)).strftime('%Y-%m-%d'),
+            'End': end_date or (today + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
+        }
+
+    def get_dimension_values(
+        self,
+        dimension: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        search_string: Optional[str] = None,
+        context: str = 'COST_AND_USAGE'
+    ) -> List[str]:
+        """
+        Query AWS Cost Explorer for every value of a dimension, across all pages.
+
+        Args:
+            dimension: Dimension name, e.g. 'SERVICE' or 'LINKED_ACCOUNT'
+            start_date: Start date in YYYY-MM-DD format. Defaults to 30 days ago.
+            end_date: End date in YYYY-MM-DD format (exclusive). Defaults to
+                tomorrow.
+            search_string: Only return values containing this string
+            context: COST_AND_USAGE, RESERVATIONS or SAVINGS_PLANS
+
+        Returns:
+            Dimension values with usage in the period
+        """
+        request = {
+            'TimePeriod': self._lookback_period(start_date, end_date),
+            'Dimension': dimension.upper(),
+            'Context': context
+        }
+        if search_string:
+            request['SearchString'] = search_string
+        return [
+            entry['Value']
+            for page in self._iter_pages(request, 'get_dimension_values')
+            for entry in page.get('DimensionValues', [])
+        ]
+
+    def get_tags(
+        self,
+        tag_key: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        search_string: Optional[str] = None
+    ) -> List[str]:
+        """
+        Query AWS Cost Explorer for cost allocation tag keys, or the values of one key.
+
+        Args:
+            tag_key: Tag key whose values to return; all tag keys if None
+            start_date: Start date in YYYY-MM-DD format. Defaults to 30 days ago.
+            end_date: End date in YYYY-MM-DD format (exclusive). Defaults to
+                tomorrow.
+            search_string: Only return keys or values containing this string
+
+        Returns:
+            Tag keys or values with usage in the period, across all pages
+        """
+        request = {'TimePeriod': self._lookback_period(start_date, end_date)}
+        if tag_key:
+            request['TagKey'] = tag_key
+        if search_string:
+            request['SearchString'] = search_string
+        return [tag for page in self._iter_pages(request, 'get_tags') for tag in page.get('Tags', [])]
+
+    def get_cost_forecast(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        metric: str = 'UnblendedCost',
+        granularity: str = 'MONTHLY',
+        filter_expression: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Query AWS Cost Explorer for a cost forecast.
+
+        With a cache configured, forecasts are reused for the rest of the day
+        they were made on.
+
+        Args:
+            start_date: Start date in YYYY-MM-DD format. Defaults to today.
+            end_date: End date in YYYY-MM-DD format (exclusive). Defaults to
+                the first day of next month.
+            metric: Metric to forecast, either a GetCostAndUsage name such as
+                'UnblendedCost' or a GetCostForecast name such as 'UNBLENDED_COST'
+            granularity: Time granularity (DAILY or MONTHLY)
+            filter_expression: Cost Explorer Filter expression
+
+        Returns:
+            GetCostForecast response with Total and ForecastResultsByTime
+        """
+        today = datetime.date.today()
         if not start_date:
-            start_date = (datetime.datetime.now() - datetime.timedelta(days=30)).strftime('%Y-%m-%d')
+            start_date = today.strftime('%Y-%m-%d')
         if not end_date:
-            end_date = datetime.datetime.now().strftime('%Y-%m-%d')
-        
-        if not metrics:
-            metrics = ['BlendedCost', 'UnblendedCost', 'UsageQuantity']
-        
-        # Request cost data
-        response = self.ce_client.get_cost_and_usage(
-            TimePeriod={
+            end_date = (today.replace(day=28) + datetime.timedelta(days=4)).replace(day=1).strftime('%Y-%m-%d')
+
+        request = {
+            'TimePeriod': {
                 'Start': start_date,
                 'End': end_date
             },
-            Granularity=granularity,
-            Metrics=metrics
+            'Metric': FORECAST_METRICS.get(metric, metric),
+            'Granularity': granularity
+        }
+        if filter_expression:
+            request['Filter'] = filter_expression
+
+        if self.cache is None:
+            return self._call('get_cost_forecast', **request)
+
+        # Forecasts change daily, so the date they were made on is part of the key
+        key = make_cache_key(
+            self.profile or 'default',
+            dict(request, Operation='GetCostForecast', ForecastDate=today.strftime('%Y-%m-%d'))
         )
-        
-        return response
\ No newline at end of file
+        response = self.cache.get(key)
+        if response is None:
+            response = self._call('get_cost_forecast', **request)
+            response.pop('ResponseMetadata', None)
+            self.cache.put(key, response, estimated=False)
+        return response
+
+
+def parse_group_by(spec: Union[str, Dict[str, str]]) -> Dict[str, str]:
+    """
+    Convert a grouping shorthand into a GroupBy definition.
+
+    Args:
+        spec: A GroupBy dict, a dimension name such as 'SERVICE', or a
+            'TAG:<key>' / 'COST_CATEGORY:<name>' string
+
+    Returns:
+        GroupBy definition with Type and Key
+
+    Raises:
+        ValueError: If spec is an empty string
+    """
+    if isinstance(spec, dict):
+        return spec
+    if not spec:
+        raise ValueError("Group by value must not be empty")
+
+    prefix, _, key = spec.partition(':')
+    if key and prefix.upper() in ('TAG', 'COST_CATEGORY'):
+        return {'Type': prefix.upper(), 'Key': key}
+    return {'Type': 'DIMENSION', 'Key': spec.upper()}
+
+
+def _map_ordered(func: Callable[[Any], Any], items: Iterable[Any], workers: int) -> Iterator[Any]:
+    """Like map(), but runs up to `workers` calls ahead in a thread pool."""
+    # Imported here to keep concurrent.futures (and logging) off the CLI's startup path
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _merge_periods(periods: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Combine consecutive entries for the same time period into one."""
+    pending = None
+    for period in periods:
+        if pending is not None and pending['TimePeriod'] == period['TimePeriod']:
+            pending['Groups'] = pending.get('Groups', []) + period.get('Groups', [])
+            continue
+        if pending is not None:
+            yield pending
+        pending = dict(period)
+
+    if pending is not None:
+        yield pending
+
+
+def merge_pages(pages: Iterator[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge paginated GetCostAndUsage responses into a single response.
+
+    Args:
+        pages: Raw responses in the order they were returned
+
+    Returns:
+        A response containing every ResultsByTime entry and no NextPageToken
+    """
+    merged = None
+    results = []
+    attributes = []
+    attribute_values = set()
+    for page in pages:
+        if merged is None:
+            merged = {key: value for key, value in page.items() if key != 'NextPageToken'}
+        results.extend(page.get('ResultsByTime', []))
+        for attribute in page.get('DimensionValueAttributes', []):
+            # Chunks of a split request may repeat the same attributes
+            if attribute.get('Value') not in attribute_values:
+                attribute_values.add(attribute.get('Value'))
+                attributes.append(attribute)
+
+    merged = merged or {}
+    merged['ResultsByTime'] = list(_merge_periods(iter(results)))
+    if attributes:
+        merged['DimensionValueAttributes'] = attributes
+    return merged
@@ -0,0 +1,392 @@
+"""Answer cost queries from local Cost and Usage Report (CUR) exports."""
+
+import bisect
+import collections
+import csv
+import gzip
+import io
+import mmap
+import os
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from aws_cost_explorer import instrumentation
+from aws_cost_explorer.cost_client import parse_group_by
+from aws_cost_explorer.date_utils import split_date_range
+
+
+DEFAULT_METRICS = ['BlendedCost', 'UnblendedCost', 'UsageQuantity']
+DEFAULT_CHUNK_BYTES = 16 * 1024 * 1024
+CUR_SUFFIXES = ('.csv', '.csv.gz', '.parquet')
+
+# CUR columns holding each Cost Explorer metric and dimension. Parquet
+# exports use the same names in snake case (see _parquet_column()).
+METRIC_COLUMNS = {
+    'BlendedCost': 'lineItem/BlendedCost',
+    'NetUnblendedCost': 'lineItem/NetUnblendedCost',
+    'UnblendedCost': 'lineItem/UnblendedCost',
+    'UsageQuantity': 'lineItem/UsageAmount',
+}
+DIMENSION_COLUMNS = {
+    'INSTANCE_TYPE': 'product/instanceType',
+    'LINKED_ACCOUNT': 'lineItem/UsageAccountId',
+    'OPERATION': 'lineItem/Operation',
+    'RECORD_TYPE': 'lineItem/LineItemType',
+    'REGION': 'product/region',
+    'SERVICE': 'product/ProductName',
+    'USAGE_TYPE': 'lineItem/UsageType',
+}
+DATE_COLUMN = 'lineItem/UsageStartDate'
+CURRENCY_COLUMN = 'lineItem/CurrencyCode'
+# Line items are final once the bill has an invoice
+INVOICE_COLUMN = 'bill/InvoiceId'
+TAG_COLUMN_PREFIX = 'resourceTags/user:'
+COST_CATEGORY_COLUMN_PREFIX = 'costCategory/'
+
+# Query passed to worker processes: (metrics, group definitions, start, end, hourly)
+Query = Tuple[List[str], List[Dict[str, str]], str, str, bool]
+# Result of aggregating one chunk: ({(day or hour, keys): amounts}, estimated days or hours, currency, rows)
+ChunkResult = Tuple[Dict[Tuple[str, Tuple[str, ...]], List[float]], Set[str], Optional[str], int]
+
+
+def _parquet_column(name: str) -> str:
+    """Convert a CSV column name such as 'lineItem/UsageStartDate' to its Parquet name."""
+    name = re.sub(r'[/:]', '_', name)
+    return re.sub(r'(?<=[a-z0-9])(?=[A-Z])', '_', name).lower()
+
+
+def _find_column(header: List[str], name: str) -> Optional[int]:
+    """Return the position of a CSV or Parquet column, or None if it is absent."""
+    for candidate in (name, _parquet_column(name)):
+        if candidate in header:
+            return header.index(candidate)
+    return None
+
+
+def _group_column(definition: Dict[str, str]) -> Tuple[str, str]:
+    """
+    Return the CUR column for a GroupBy definition and the prefix of its keys.
+
+    Tag and cost category keys are prefixed with 'key$', as Cost Explorer does.
+
+    Raises:
+        ValueError: If the dimension is not available in CUR data
+    """
+    if definition['Type'] == 'TAG':
+        return TAG_COLUMN_PREFIX + definition['Key'], definition['Key'] + '$'
+    if definition['Type'] == 'COST_CATEGORY':
+        return COST_CATEGORY_COLUMN_PREFIX + definition['Key'], definition['Key'] + '$'
+    if definition['Key'] not in DIMENSION_COLUMNS:
+        raise ValueError(
+            f"Cannot group CUR data by {definition['Key']}. "
+            f"Valid dimensions: {', '.join(DIMENSION_COLUMNS)}"
+        )
+    return DIMENSION_COLUMNS[definition['Key']], ''
+
+
+class _RowSpec:
+    """Positions of the columns a query needs within one file's header."""
+
+    def __init__(self, header: List[str], query: Query):
+        metrics, group_by, self.start_date, self.end_date, self.hourly = query
+        self.date = _find_column(header, DATE_COLUMN)
+        if self.date is None:
+            raise ValueError(f"CUR data has no {DATE_COLUMN} column")
+        self.metrics = [_find_column(header, METRIC_COLUMNS[metric]) for metric in metrics]
+        self.keys = []
+        for definition in group_by:
+            column, prefix = _group_column(definition)
+            self.keys.append((_find_column(header, column), prefix))
+        self.currency = _find_column(header, CURRENCY_COLUMN)
+        self.invoice = _find_column(header, INVOICE_COLUMN)
+
+    def columns(self) -> List[int]:
+        """Positions of every column used, in header order."""
+        positions = [self.date, self.currency, self.invoice] + self.metrics + [index for index, _ in self.keys]
+        return sorted(set(index for index in positions if index is not None))
+
+
+def _cell(row: Any, index: Optional[int]) -> Any:
+    if index is None or index >= len(row) or row[index] is None:
+        return ''
+    return row[index]
+
+
+def _aggregate(rows: Iterable[Any], spec: _RowSpec) -> ChunkResult:
+    """Sum the query's metrics per usage day (or hour) and group key."""
+    sums = {}
+    estimated = set()
+    currency = None
+    width = len(spec.metrics)
+    count = 0
+    for row in rows:
+        if len(row) <= spec.date:
+            continue
+        count += 1
+        period = str(row[spec.date])
+        # Hours are formatted like TIMESTAMP_FORMAT whether the column holds
+        # ISO 8601 strings (CSV) or timestamps (Parquet)
+        period = f'{period[:10]}T{period[11:13]}:00:00Z' if spec.hourly else period[:10]
+        if not spec.start_date <= period < spec.end_date:
+            continue
+
+        keys = tuple(prefix + str(_cell(row, index)) for index, prefix in spec.keys)
+        amounts = sums.get((period, keys))
+        if amounts is None:
+            amounts = sums[(period, keys)] = [0.0] * width
+        for position, index in enumerate(spec.metrics):
+            value = _cell(row, index)
+            if value:
+                amounts[position] += float(value)
+
+        if spec.invoice is not None and not _cell(row, spec.invoice):
+            estimated.add(period)
+        if currency is None and spec.currency is not None:
+            currency = _cell(row, spec.currency) or None
+    return sums, estimated, currency, count
+
+
+def _aggregate_text(header: List[str], text: str, query: Query) -> ChunkResult:
+    """Aggregate a block of whole CSV lines."""
+    return _aggregate(csv.reader(io.StringIO(text, newline='')), _RowSpec(header, query))
+
+
+def _aggregate_block(header: List[str], data: bytes, query: Query) -> ChunkResult:
+    """Aggregate decompressed CSV bytes handed over by the reading process."""
+    return _aggregate_text(header, data.decode('utf-8'), query)
+
+
+def _aggregate_range(path: str, start: int, end: int, header: List[str], query: Query) -> ChunkResult:
+    """Aggregate a byte range of an uncompressed CSV file, mapped into memory."""
+    with open(path, 'rb') as csv_file, mmap.mmap(csv_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        data = mapped[start:end]
+    return _aggregate_block(header, data, query)
+
+
+def _aggregate_parquet(path: str, query: Query) -> ChunkResult:
+    """Aggregate a Parquet file, reading only the columns the query needs."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise ImportError("Reading Parquet CUR files requires pyarrow: pip install pyarrow") from error
+
+    parquet_file = pq.ParquetFile(path)
+    header = parquet_file.schema_arrow.names
+    columns = [header[index] for index in _RowSpec(header, query).columns()]
+    rows = (
+        row
+        for batch in parquet_file.iter_batches(columns=columns)
+        for row in zip(*(column.to_pylist() for column in batch.columns))
+    )
+    return _aggregate(rows, _RowSpec(columns, query))
+
+
+def _parse_header(line: bytes) -> List[str]:
+    return next(csv.reader([line.decode('utf-8-sig')]))
+
+
+def _split_ranges(mapped: Any, start: int, chunk_bytes: int) -> List[Tuple[int, int]]:
+    """Split a mapped file into byte ranges that end on line boundaries."""
+    ranges = []
+    size = len(mapped)
+    while start < size:
+        end = start + chunk_bytes
+        if end < size:
+            newline = mapped.find(b'\n', end - 1)
+            end = size if newline == -1 else newline + 1
+        end = min(end, size)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def _iter_blocks(stream: Any, chunk_bytes: int) -> Iterator[bytes]:
+    """Read a binary stream in blocks of roughly chunk_bytes that end on line boundaries."""
+    remainder = b''
+    while True:
+        data = stream.read(chunk_bytes)
+        if not data:
+            break
+        data = remainder + data
+        cut = data.rfind(b'\n') + 1
+        if cut == 0:
+            remainder = data
+            continue
+        remainder = data[cut:]
+        yield data[:cut]
+    if remainder:
+        yield remainder
+
+
+class CurReader:
+    """
+    Answers cost queries from local CUR exports instead of the API.
+
+    Files may be CSV, gzip-compressed CSV or (with pyarrow) Parquet, given
+    directly or found recursively under directories. Files are split into
+    chunks of about ``chunk_bytes`` that are parsed and summed in a process
+    pool: uncompressed CSV files are memory-mapped and only the byte range of
+    each chunk is sent to a worker, while gzip files are decompressed as a
+    stream and handed over block by block, so memory use does not grow with
+    the file size. Records must not contain line breaks inside quoted
+    fields, as in the CSV files AWS writes.
+    """
+
+    def __init__(
+        self,
+        paths: Union[str, Iterable[str]],
+        max_workers: Optional[int] = None,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES
+    ):
+        """
+        Initialize the reader.
+
+        Args:
+            paths: CUR files, or directories containing them
+            max_workers: Number of worker processes (defaults to the number
+                of CPUs); 1 parses in the calling process
+            chunk_bytes: Approximate size of the chunk parsed by each task
+        """
+        self.paths = [paths] if isinstance(paths, str) else list(paths)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_bytes = chunk_bytes
+
+    def files(self) -> List[str]:
+        """
+        Return the CUR files to read, in sorted order.
+
+        Raises:
+            ValueError: If no CUR files are found
+        """
+        found = []
+        for path in self.paths:
+            if not os.path.isdir(path):
+                found.append(path)
+                continue
+            for directory, _, names in os.walk(path):
+                found.extend(os.path.join(directory, name) for name in names if name.endswith(CUR_SUFFIXES))
+        if not found:
+            raise ValueError(f"No CUR files ({', '.join(CUR_SUFFIXES)}) found in: {', '.join(self.paths)}")
+        return sorted(found)
+
+    def _tasks(self, query: Query) -> Iterator[Tuple[Callable[..., ChunkResult], tuple]]:
+        """Yield (function, arguments) for every chunk, reading compressed files lazily."""
+        for path in self.files():
+            if path.endswith('.parquet'):
+                yield _aggregate_parquet, (path, query)
+            elif path.endswith('.gz'):
+                with gzip.open(path, 'rb') as stream:
+                    header = _parse_header(stream.readline())
+                    for block in _iter_blocks(stream, self.chunk_bytes):
+                        instrumentation.count('cur.bytes', len(block))
+                        yield _aggregate_block, (header, block, query)
+            elif os.path.getsize(path):
+                with open(path, 'rb') as csv_file, mmap.mmap(csv_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    header_end = mapped.find(b'\n') + 1 or len(mapped)
+                    header = _parse_header(mapped[:header_end])
+                    ranges = _split_ranges(mapped, header_end, self.chunk_bytes)
+                for start, end in ranges:
+                    instrumentation.count('cur.bytes', end - start)
+                    yield _aggregate_range, (path, start, end, header, query)
+
+    def _run(self, tasks: Iterator[Tuple[Callable[..., ChunkResult], tuple]]) -> Iterator[ChunkResult]:
+        """Run tasks in the process pool, keeping at most two per worker in flight."""
+        if self.max_workers == 1:
+            for func, args in tasks:
+                yield func(*args)
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = collections.deque()
+            for func, args in tasks:
+                pending.append(executor.submit(func, *args))
+                if len(pending) >= self.max_workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    @instrumentation.timed('cur.get_cost_and_usage')
+    def get_cost_and_usage(
+        self,
+        start_date: str,
+        end_date: str,
+        granularity: str = 'DAILY',
+        metrics: Optional[List[str]] = None,
+        group_by: Optional[List[Union[str, Dict[str, str]]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Answer a cost query from the CUR files.
+
+        Args:
+            start_date: Start date in YYYY-MM-DD format (inclusive)
+            end_date: End date in YYYY-MM-DD format (exclusive)
+            granularity: DAILY, MONTHLY or HOURLY (which takes timestamps as
+                returned by get_date_range(hourly=True))
+            metrics: Metrics to return (defaults to DEFAULT_METRICS); see
+                METRIC_COLUMNS for those available
+            group_by: Up to two groupings: dimensions from DIMENSION_COLUMNS,
+                'TAG:<key>' or 'COST_CATEGORY:<name>'
+
+        Returns:
+            Response in the shape of GetCostAndUsage
+
+        Raises:
+            ValueError: If a metric or dimension is not available in CUR data
+        """
+        metrics = list(metrics or DEFAULT_METRICS)
+        unknown = [metric for metric in metrics if metric not in METRIC_COLUMNS]
+        if unknown:
+            raise ValueError(
+                f"Metrics not available in CUR data: {', '.join(unknown)}. "
+                f"Valid metrics: {', '.join(METRIC_COLUMNS)}"
+            )
+        group_by = [parse_group_by(spec) for spec in group_by or []]
+        for definition in group_by:
+            _group_column(definition)
+
+        segments = split_date_range(start_date, end_date, granularity)
+        segment_starts = [start for start, _ in segments]
+        totals = [[0.0] * len(metrics) for _ in segments]
+        groups = [{} for _ in segments]
+        estimated = [False for _ in segments]
+        currency = None
+
+        query = (metrics, group_by, start_date, end_date, granularity == 'HOURLY')
+        for sums, estimated_periods, chunk_currency, rows in self._run(self._tasks(query)):
+            instrumentation.count('cur.chunks')
+            instrumentation.count('cur.rows', rows)
+            currency = currency or chunk_currency
+            for (period, keys), amounts in sums.items():
+                index = bisect.bisect_right(segment_starts, period) - 1
+                bucket = groups[index].setdefault(keys, [0.0] * len(metrics)) if group_by else totals[index]
+                for position, amount in enumerate(amounts):
+                    bucket[position] += amount
+            for period in estimated_periods:
+                estimated[bisect.bisect_right(segment_starts, period) - 1] = True
+
+        units = ['N/A' if metric == 'UsageQuantity' else currency or 'USD' for metric in metrics]
+
+        def metric_data(amounts):
+            return {
+                metric: {'Amount': repr(amount), 'Unit': unit}
+                for metric, amount, unit in zip(metrics, amounts, units)
+            }
+
+        periods = []
+        for index, (start, end) in enumerate(segments):
+            periods.append({
+                'TimePeriod': {'Start': start, 'End': end},
+                'Total': {} if group_by else metric_data(totals[index]),
+                'Groups': [
+                    {'Keys': list(keys), 'Metrics': metric_data(amounts)}
+                    for keys, amounts in sorted(groups[index].items())
+                ],
+                'Estimated': estimated[index]
+            })
+
+        response = {'ResultsByTime': periods}
+        if group_by:
+            response['GroupDefinitions'] = group_by
+        return response
@@ -1,16 +1,42 @@
 """Date utilities for AWS Cost Explorer."""
 
 import datetime
-from typing import Tuple, Optional
-from dateutil.relativedelta import relativedelta
+from typing import List, Tuple, Optional
 
+from aws_cost_explorer import instrumentation
 
+
+DATE_FORMAT = '%Y-%m-%d'
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+# Cost Explorer only keeps HOURLY data for the last 14 days
+HOURLY_LOOKBACK_DAYS = 14
+
+
+def parse_timestamp(value: str) -> datetime.datetime:
+    """
+    Parse a YYYY-MM-DD date or a YYYY-MM-DDThh:mm[:ss][Z] timestamp (UTC).
+
+    Raises:
+        ValueError: If value is in neither format
+    """
+    if 'T' not in value:
+        return datetime.datetime.strptime(value, DATE_FORMAT)
+    value = value.rstrip('Z')
+    try:
+        return datetime.datetime.strptime(value, '%Y-%m-%dT%H:%M:%S')
+    except ValueError:
+        return datetime.datetime.strptime(value, '%Y-%m-%dT%H:%M')
+
+
+@instrumentation.timed('date_utils.get_date_range')
 def get_date_range(
     start_date: Optional[str] = None, 
     end_date: Optional[str] = None,
     days: Optional[int] = None,
     month: bool = False,
-    previous_month: bool = False
+    previous_month: bool = False,
+    hourly: bool = False,
+    today: Optional[datetime.date] = None
 ) -> Tuple[str, str]:
     """
     Calculate the date range based on provided parameters.
@@ -21,15 +47,25 @@ def get_date_range(
         days: Number of days to look back from today
         month: Whether to use current month to date
         previous_month: Whether to use the previous month
+        hourly: Return timestamps for HOURLY queries. start_date and end_date
+            may then also be YYYY-MM-DDThh:mm:ssZ timestamps, and the range
+            defaults to the last HOURLY_LOOKBACK_DAYS days
+        today: Date relative ranges are calculated from (defaults to today)
         
     Returns:
-        Tuple of (start_date, end_date) in YYYY-MM-DD format
+        Tuple of (start_date, end_date) in YYYY-MM-DD format, or in
+        YYYY-MM-DDThh:mm:ssZ format if hourly is set
+    
+    Raises:
+        ValueError: If a date cannot be parsed, or a timestamp is given
+            without hourly
     
     Note:
         End date is inclusive when passed in but will be converted to exclusive
-        for AWS Cost Explorer which requires the end date to be exclusive.
+        for AWS Cost Explorer which requires the end date to be exclusive. An
+        end timestamp is already exclusive and is used as given.
     """
-    today = datetime.datetime.now().date()
+    today = today or datetime.datetime.now().date()
     
     # Process special date range options
     if days is not None:
@@ -42,18 +78,101 @@ def get_date_range(
     
     if previous_month:
         first_of_month = today.replace(day=1)
-        last_month = first_of_month - relativedelta(months=1)
+        last_month = (first_of_month - datetime.timedelta(days=1)).replace(day=1)
         start_date = last_month.strftime('%Y-%m-%d')
         end_date = (first_of_month - datetime.timedelta(days=1)).strftime('%Y-%m-%d')
     
-    # Default to 30 days ago and today if no dates or special options provided
+    # Default to 30 days ago (or the hourly lookback) and today if no dates or
+    # special options provided
     if not start_date and not end_date:
-        start_date = (today - datetime.timedelta(days=30)).strftime('%Y-%m-%d')
+        lookback = HOURLY_LOOKBACK_DAYS - 1 if hourly else 30
+        start_date = (today - datetime.timedelta(days=lookback)).strftime('%Y-%m-%d')
         end_date = today.strftime('%Y-%m-%d')
     
+    if not hourly and any('T' in date for date in (start_date, end_date) if date):
+        raise ValueError("Timestamps are only supported for HOURLY granularity; use YYYY-MM-DD")
+    
     # Make end date exclusive for AWS Cost Explorer
-    if end_date:
+    if end_date and 'T' not in end_date:
         end_date_obj = datetime.datetime.strptime(end_date, '%Y-%m-%d').date()
         end_date = (end_date_obj + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
     
-    return start_date, end_date
\ No newline at end of file
+    if hourly:
+        start_date, end_date = (
+            parse_timestamp(date).strftime(TIMESTAMP_FORMAT) if date else date
+            for date in (start_date, end_date)
+        )
+    
+    return start_date, end_date
+
+
+def check_hourly_start(start_date: str, today: Optional[datetime.date] = None) -> None:
+    """
+    Check that an HOURLY range starts within the last HOURLY_LOOKBACK_DAYS days.
+
+    Args:
+        start_date: Start date or timestamp of the range
+        today: Date the lookback is counted from (defaults to today)
+
+    Raises:
+        ValueError: If the range starts earlier, as Cost Explorer would
+            reject the request
+    """
+    today = today or datetime.datetime.now().date()
+    earliest = today - datetime.timedelta(days=HOURLY_LOOKBACK_DAYS - 1)
+    if parse_timestamp(start_date).date() < earliest:
+        raise ValueError(
+            f"Cost Explorer only keeps HOURLY data for the last {HOURLY_LOOKBACK_DAYS} days; "
+            f"start on or after {earliest.strftime(DATE_FORMAT)}"
+        )
+
+
+@instrumentation.timed('date_utils.split_date_range')
+def split_date_range(start_date: str, end_date: str, granularity: str = 'DAILY') -> List[Tuple[str, str]]:
+    """
+    Split an exclusive date range into the periods Cost Explorer reports.
+
+    Args:
+        start_date: Start date in YYYY-MM-DD format (inclusive)
+        end_date: End date in YYYY-MM-DD format (exclusive)
+        granularity: DAILY for one segment per day, MONTHLY for one segment
+            per calendar month (clipped to the range), HOURLY for one segment
+            per hour; HOURLY also accepts YYYY-MM-DDThh:mm:ssZ timestamps
+
+    Returns:
+        List of (start_date, end_date) tuples covering the range in order,
+        as YYYY-MM-DDThh:mm:ssZ timestamps for HOURLY
+
+    Raises:
+        ValueError: If granularity is not supported
+    """
+    if granularity == 'HOURLY':
+        return _split_hours(parse_timestamp(start_date), parse_timestamp(end_date))
+    if granularity not in ('DAILY', 'MONTHLY'):
+        raise ValueError(f"Cannot split date range by granularity: {granularity}")
+
+    current = datetime.datetime.strptime(start_date, '%Y-%m-%d').date()
+    end = datetime.datetime.strptime(end_date, '%Y-%m-%d').date()
+
+    segments = []
+    while current < end:
+        if granularity == 'DAILY':
+            boundary = current + datetime.timedelta(days=1)
+        else:
+            # Day 28 plus 4 days always lands in the next month
+            boundary = (current.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+        boundary = min(boundary, end)
+        segments.append((current.strftime('%Y-%m-%d'), boundary.strftime('%Y-%m-%d')))
+        current = boundary
+
+    return segments
+
+
+def _split_hours(current: datetime.datetime, end: datetime.datetime) -> List[Tuple[str, str]]:
+    """Split [current, end) into hours, clipped to the range."""
+    segments = []
+    while current < end:
+        boundary = min(current.replace(minute=0, second=0) + datetime.timedelta(hours=1), end)
+        segments.append((current.strftime(TIMESTAMP_FORMAT), boundary.strftime(TIMESTAMP_FORMAT)))
+        current = boundary
+    return segments
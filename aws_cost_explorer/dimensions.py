@@ -0,0 +1,258 @@
+"""Local index of dimension and tag values for completing and checking filters."""
+
+import bisect
+import datetime
+import difflib
+import fnmatch
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from aws_cost_explorer.cost_client import CostExplorerClient, parse_group_by
+
+
+DEFAULT_DIMENSIONS = [
+    'SERVICE', 'LINKED_ACCOUNT', 'REGION', 'USAGE_TYPE', 'INSTANCE_TYPE', 'OPERATION', 'RECORD_TYPE'
+]
+DEFAULT_LOOKBACK_DAYS = 90
+DEFAULT_MAX_AGE = 86400
+DEFAULT_MAX_WORKERS = 4
+WILDCARD_CHARACTERS = '*?['
+
+# Sorts after every other character, so prefix + LAST_CHARACTER bounds all
+# strings starting with prefix
+LAST_CHARACTER = '\U0010ffff'
+
+
+def default_index_path(profile: Optional[str] = None) -> str:
+    """Return the default index file for a profile, honouring XDG_CACHE_HOME."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'aws-cost-explorer', f"dimensions-{profile or 'default'}.json")
+
+
+def index_name(name: str) -> str:
+    """Normalize a dimension ('service') or tag ('tag:team') name as used in the index."""
+    definition = parse_group_by(name)
+    if definition['Type'] == 'DIMENSION':
+        return definition['Key']
+    return f"{definition['Type']}:{definition['Key']}"
+
+
+def _prefix_range(keys: List[str], prefix: str) -> slice:
+    """Slice of a sorted list holding the strings that start with prefix."""
+    return slice(bisect.bisect_left(keys, prefix), bisect.bisect_left(keys, prefix + LAST_CHARACTER))
+
+
+class DimensionIndex:
+    """
+    Sorted values of Cost Explorer dimensions and cost allocation tags.
+
+    Dimensions are indexed under their name ('SERVICE') and tags under
+    'TAG:<key>'. Values are kept sorted, so prefix completion and wildcard
+    expansion are binary searches rather than API calls. fetch() builds the
+    index from GetDimensionValues and GetTags, and load_or_fetch() keeps a
+    copy on disk that is refreshed once it is older than a day.
+    """
+
+    def __init__(self, values: Dict[str, Iterable[str]], fetched_at: float = 0.0):
+        """
+        Initialize the index.
+
+        Args:
+            values: Values for each dimension or 'TAG:<key>' name
+            fetched_at: Time the values were fetched, in seconds since the epoch
+        """
+        self.values = {index_name(name): sorted(set(name_values)) for name, name_values in values.items()}
+        self.fetched_at = fetched_at
+        # Case-folded copies, sorted, for case-insensitive completion
+        self._folded = {}
+        for name, name_values in self.values.items():
+            pairs = sorted((value.casefold(), value) for value in name_values)
+            self._folded[name] = ([key for key, _ in pairs], [value for _, value in pairs])
+
+    @classmethod
+    def fetch(
+        cls,
+        client: CostExplorerClient,
+        dimensions: Iterable[str] = DEFAULT_DIMENSIONS,
+        tag_keys: Optional[Iterable[str]] = None,
+        lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        clock: Callable[[], float] = time.time
+    ) -> 'DimensionIndex':
+        """
+        Fetch every value of the dimensions and tags from Cost Explorer.
+
+        Each dimension and tag key is looked up concurrently, following
+        pagination, through the client's throttler.
+
+        Args:
+            client: Client used to query Cost Explorer
+            dimensions: Dimensions to index
+            tag_keys: Tag keys to index (defaults to every key with usage)
+            lookback_days: Days of usage the values are collected from
+            max_workers: Maximum number of lookups run at once
+            clock: Function returning the current time in seconds
+
+        Returns:
+            The populated index
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        today = datetime.date.today()
+        period = {
+            'start_date': (today - datetime.timedelta(days=lookback_days)).strftime('%Y-%m-%d'),
+            'end_date': (today + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
+        }
+        if tag_keys is None:
+            tag_keys = client.get_tags(**period)
+
+        lookups = [(dimension.upper(), client.get_dimension_values, dimension) for dimension in dimensions]
+        lookups.extend((f"TAG:{key}", client.get_tags, key) for key in tag_keys)
+
+        workers = max(1, min(max_workers, len(lookups)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda lookup: lookup[1](lookup[2], **period), lookups))
+
+        return cls({name: values for (name, _, _), values in zip(lookups, results)}, fetched_at=clock())
+
+    @classmethod
+    def load(cls, path: str) -> Optional['DimensionIndex']:
+        """Read an index saved with save(), or return None if the file does not exist."""
+        if not os.path.exists(path):
+            return None
+        with open(path) as index_file:
+            data = json.load(index_file)
+        return cls(data.get('values', {}), fetched_at=data.get('fetched_at', 0.0))
+
+    def save(self, path: str) -> None:
+        """Write the index to a file, replacing it atomically."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, 'w') as index_file:
+            json.dump({'fetched_at': self.fetched_at, 'values': self.values}, index_file)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load_or_fetch(
+        cls,
+        client: CostExplorerClient,
+        path: Optional[str] = None,
+        max_age: float = DEFAULT_MAX_AGE,
+        clock: Callable[[], float] = time.time,
+        **fetch_options: Any
+    ) -> 'DimensionIndex':
+        """
+        Return the saved index, fetching and saving a new one if it is missing or stale.
+
+        Args:
+            client: Client used to query Cost Explorer
+            path: Index file (defaults to default_index_path() for the client's profile)
+            max_age: Seconds a saved index is used before it is fetched again
+            clock: Function returning the current time in seconds
+            **fetch_options: Keyword arguments for fetch()
+        """
+        path = path or default_index_path(client.profile)
+        index = cls.load(path)
+        if index is None or clock() - index.fetched_at >= max_age:
+            index = cls.fetch(client, clock=clock, **fetch_options)
+            index.save(path)
+        return index
+
+    def names(self) -> List[str]:
+        """Return the indexed dimension and 'TAG:<key>' names."""
+        return sorted(self.values)
+
+    def complete(self, name: str, prefix: str = '', limit: Optional[int] = None) -> List[str]:
+        """
+        Return the values of a dimension or tag starting with prefix, ignoring case.
+
+        Args:
+            name: Dimension name or 'TAG:<key>'
+            prefix: Start of the values to return
+            limit: Maximum number of values returned
+
+        Returns:
+            Matching values in case-insensitive order; empty if name is not indexed
+        """
+        keys, values = self._folded.get(index_name(name), ([], []))
+        matches = values[_prefix_range(keys, prefix.casefold())]
+        return matches[:limit] if limit else matches
+
+    def expand(self, name: str, pattern: str) -> List[str]:
+        """
+        Return the values of a dimension or tag matching a pattern.
+
+        Patterns use fnmatch wildcards (``*``, ``?`` and ``[...]``) and are
+        case-sensitive, as Cost Explorer values are. A pattern without
+        wildcards matches only itself.
+
+        Args:
+            name: Dimension name or 'TAG:<key>'
+            pattern: Value or wildcard pattern
+
+        Returns:
+            Matching values in sorted order
+        """
+        values = self.values.get(index_name(name), [])
+        wildcards = [pattern.find(character) for character in WILDCARD_CHARACTERS if character in pattern]
+        literal_end = min(wildcards, default=len(pattern))
+        candidates = values[_prefix_range(values, pattern[:literal_end])]
+        if literal_end == len(pattern):
+            return [pattern] if pattern in candidates else []
+        return [value for value in candidates if fnmatch.fnmatchcase(value, pattern)]
+
+    def validate_filter(self, expression: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Check a filter's dimension and tag values against the index and expand wildcards.
+
+        Conditions on names that are not indexed, and those using
+        MatchOptions other than EQUALS, are left for Cost Explorer to check.
+
+        Args:
+            expression: Cost Explorer Filter expression
+
+        Returns:
+            The expression with every wildcard pattern replaced by the
+            values it matches
+
+        Raises:
+            ValueError: Listing every value (or pattern) that matches
+                nothing, with close matches where there are any
+        """
+        errors = []
+        expanded = self._expand_expression(expression, errors)
+        if errors:
+            raise ValueError(f"Invalid filter: {'; '.join(errors)}")
+        return expanded
+
+    def _expand_expression(self, expression: Dict[str, Any], errors: List[str]) -> Dict[str, Any]:
+        expanded = dict(expression)
+        for operator in ('And', 'Or'):
+            if operator in expression:
+                expanded[operator] = [self._expand_expression(operand, errors) for operand in expression[operator]]
+        if 'Not' in expression:
+            expanded['Not'] = self._expand_expression(expression['Not'], errors)
+        if 'Dimensions' in expression:
+            condition = expression['Dimensions']
+            expanded['Dimensions'] = self._expand_condition(condition['Key'], condition, errors)
+        if 'Tags' in expression:
+            condition = expression['Tags']
+            expanded['Tags'] = self._expand_condition(f"TAG:{condition['Key']}", condition, errors)
+        return expanded
+
+    def _expand_condition(self, name: str, condition: Dict[str, Any], errors: List[str]) -> Dict[str, Any]:
+        name = index_name(name)
+        if name not in self.values or condition.get('MatchOptions', ['EQUALS']) != ['EQUALS']:
+            return condition
+
+        values = []
+        for pattern in condition.get('Values', []):
+            matches = self.expand(name, pattern)
+            if not matches:
+                close = difflib.get_close_matches(pattern, self.values[name], n=3)
+                hint = f" (did you mean {', '.join(repr(value) for value in close)}?)" if close else ''
+                errors.append(f"no {name} value matches {pattern!r}{hint}")
+            values.extend(matches)
+        return dict(condition, Values=list(dict.fromkeys(values)))
@@ -0,0 +1,192 @@
+"""Local stand-in for the AWS Cost Explorer API, for tests and benchmarks."""
+
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+
+from aws_cost_explorer.date_utils import split_date_range
+
+
+class FakeCostExplorer:
+    """
+    Synthesizes GetCostAndUsage responses without calling AWS.
+
+    Every period of the requested range gets ``groups`` groups (or a Total
+    when the request has no GroupBy). Group rows are paginated
+    ``page_size`` at a time across periods, the way Cost Explorer does.
+    Amounts are deterministic for a given seed, period and group.
+    GetDimensionValues and GetTags return ``groups`` values per dimension
+    or tag key, paginated the same way.
+    """
+
+    TAG_KEYS = ('env', 'team')
+
+    def __init__(
+        self,
+        groups: int = 10,
+        page_size: int = 1000,
+        latency: float = 0.0,
+        throttle_every: int = 0,
+        estimated_after: Optional[str] = None,
+        seed: int = 0
+    ):
+        """
+        Initialize the fake backend.
+
+        Args:
+            groups: Number of groups per period for grouped requests
+            page_size: Maximum group rows per response page
+            latency: Seconds each call sleeps before responding
+            throttle_every: Raise a ThrottlingException on every Nth call (0 disables)
+            estimated_after: Periods starting on or after this date are
+                marked Estimated
+            seed: Seed for the synthesized amounts
+        """
+        self.groups = groups
+        self.page_size = page_size
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.estimated_after = estimated_after
+        self.seed = seed
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _amount(self, *parts: Any) -> str:
+        """Deterministic amount for a period, group and metric."""
+        checksum = zlib.crc32(f"{self.seed}:{parts}".encode('utf-8'))
+        return f"{checksum / 2 ** 32 * 100:.10f}"
+
+    def _metrics(self, metrics: List[str], *parts: Any) -> Dict[str, Dict[str, str]]:
+        return {
+            metric: {'Amount': self._amount(metric, *parts), 'Unit': 'N/A' if metric == 'UsageQuantity' else 'USD'}
+            for metric in metrics
+        }
+
+    def _group_keys(self, request: Dict[str, Any], index: int) -> List[str]:
+        return [f"{definition['Key']}-{index:05d}" for definition in request['GroupBy']]
+
+    def get_cost_and_usage(self, **request: Any) -> Dict[str, Any]:
+        """Return one page of synthesized results for a GetCostAndUsage request."""
+        with self._lock:
+            self.calls.append(request)
+            call_number = len(self.calls)
+
+        if self.latency:
+            time.sleep(self.latency)
+        if self.throttle_every and call_number % self.throttle_every == 0:
+            from botocore.exceptions import ClientError
+
+            raise ClientError(
+                {'Error': {'Code': 'ThrottlingException', 'Message': 'Rate exceeded'}},
+                'GetCostAndUsage'
+            )
+
+        segments = split_date_range(
+            request['TimePeriod']['Start'], request['TimePeriod']['End'], request['Granularity']
+        )
+        grouped = bool(request.get('GroupBy'))
+        rows_per_period = self.groups if grouped else 1
+        offset = int(request.get('NextPageToken') or 0)
+        limit = offset + (self.page_size if grouped else len(segments))
+        total_rows = len(segments) * rows_per_period
+
+        results = []
+        for row in range(offset, min(limit, total_rows)):
+            period_index, group_index = divmod(row, rows_per_period)
+            start, end = segments[period_index]
+            if not results or results[-1]['TimePeriod']['Start'] != start:
+                results.append({
+                    'TimePeriod': {'Start': start, 'End': end},
+                    'Total': {} if grouped else self._metrics(request['Metrics'], start),
+                    'Groups': [],
+                    'Estimated': bool(self.estimated_after and start >= self.estimated_after)
+                })
+            if grouped:
+                results[-1]['Groups'].append({
+                    'Keys': self._group_keys(request, group_index),
+                    'Metrics': self._metrics(request['Metrics'], start, group_index)
+                })
+
+        response = {'ResultsByTime': results}
+        if grouped:
+            response['GroupDefinitions'] = request['GroupBy']
+        if limit < total_rows:
+            response['NextPageToken'] = str(limit)
+        return response
+
+    def _page(self, request: Dict[str, Any], field: str, values: List[Any]) -> Dict[str, Any]:
+        """Return the page of values selected by the request's NextPageToken."""
+        offset = int(request.get('NextPageToken') or 0)
+        response = {field: values[offset:offset + self.page_size]}
+        if offset + self.page_size < len(values):
+            response['NextPageToken'] = str(offset + self.page_size)
+        return response
+
+    def get_dimension_values(self, **request: Any) -> Dict[str, Any]:
+        """Return one page of values for a GetDimensionValues request."""
+        with self._lock:
+            self.calls.append(request)
+
+        values = [
+            {'Value': value, 'Attributes': {}}
+            for value in (f"{request['Dimension']}-{index:05d}" for index in range(self.groups))
+            if request.get('SearchString', '') in value
+        ]
+        return self._page(request, 'DimensionValues', values)
+
+    def get_tags(self, **request: Any) -> Dict[str, Any]:
+        """Return one page of tag keys, or values of a TagKey, for a GetTags request."""
+        with self._lock:
+            self.calls.append(request)
+
+        if request.get('TagKey'):
+            tags = [f"{request['TagKey']}-{index:05d}" for index in range(self.groups)]
+        else:
+            tags = list(self.TAG_KEYS)
+        return self._page(request, 'Tags', [tag for tag in tags if request.get('SearchString', '') in tag])
+
+    def get_cost_forecast(self, **request: Any) -> Dict[str, Any]:
+        """Return a synthesized GetCostForecast response."""
+        with self._lock:
+            self.calls.append(request)
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        segments = split_date_range(
+            request['TimePeriod']['Start'], request['TimePeriod']['End'], request['Granularity']
+        )
+        results = [
+            {
+                'TimePeriod': {'Start': start, 'End': end},
+                'MeanValue': self._amount(request['Metric'], start, request.get('Filter'))
+            }
+            for start, end in segments
+        ]
+        total = sum(float(result['MeanValue']) for result in results)
+        return {
+            'Total': {'Amount': f"{total:.10f}", 'Unit': 'USD'},
+            'ForecastResultsByTime': results
+        }
+
+
+class FakeSession:
+    """Minimal boto3.Session replacement whose 'ce' client is a fake backend."""
+
+    def __init__(self, backend: Optional[FakeCostExplorer] = None, profile_name: Optional[str] = None):
+        """
+        Initialize the fake session.
+
+        Args:
+            backend: Backend returned for the 'ce' service
+            profile_name: Profile name reported by the session
+        """
+        self.backend = backend or FakeCostExplorer()
+        self.profile_name = profile_name
+
+    def client(self, service_name: str, **kwargs: Any) -> FakeCostExplorer:
+        """Return the fake backend for the 'ce' service."""
+        if service_name != 'ce':
+            raise ValueError(f"FakeSession only provides the 'ce' service, not {service_name}")
+        return self.backend
@@ -0,0 +1,188 @@
+"""Month-end cost forecasts per dimension value, alongside actuals."""
+
+import datetime
+from typing import Any, Dict, Optional, Tuple, Union
+
+from aws_cost_explorer.cost_client import CostExplorerClient, parse_group_by
+
+
+DEFAULT_METRIC = 'UnblendedCost'
+DEFAULT_MAX_WORKERS = 8
+
+# Filter expression key for each GroupBy type
+FILTER_KEYS = {
+    'DIMENSION': 'Dimensions',
+    'TAG': 'Tags',
+    'COST_CATEGORY': 'CostCategories',
+}
+
+
+def group_filter(definition: Dict[str, str], key: str) -> Dict[str, Any]:
+    """
+    Build the filter selecting one group of a grouped query.
+
+    Args:
+        definition: GroupBy definition the key belongs to
+        key: Group key as reported by GetCostAndUsage. Tag and cost category
+            keys have the form '<name>$<value>'.
+
+    Returns:
+        A Cost Explorer Filter expression
+    """
+    value = key
+    if definition['Type'] != 'DIMENSION':
+        _, _, value = key.partition('$')
+    return {FILTER_KEYS[definition['Type']]: {'Key': definition['Key'], 'Values': [value]}}
+
+
+def _month_bounds(today: datetime.date) -> Tuple[datetime.date, datetime.date]:
+    """Return the first day of today's month and of the next month."""
+    month_start = today.replace(day=1)
+    next_month = (month_start + datetime.timedelta(days=32)).replace(day=1)
+    return month_start, next_month
+
+
+def _combine_filters(*filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """AND together the given filter expressions, skipping empty ones."""
+    filters = [expression for expression in filters if expression]
+    if len(filters) > 1:
+        return {'And': filters}
+    return filters[0] if filters else None
+
+
+def _actuals(
+    client: CostExplorerClient,
+    start: datetime.date,
+    end: datetime.date,
+    metric: str,
+    definition: Optional[Dict[str, str]],
+    filter_expression: Optional[Dict[str, Any]]
+) -> Dict[str, Tuple[float, str]]:
+    """Return (amount, unit) per group key ('' when ungrouped) for a range."""
+    response = client.get_cost_and_usage(
+        start_date=start.strftime('%Y-%m-%d'),
+        end_date=end.strftime('%Y-%m-%d'),
+        granularity='MONTHLY',
+        metrics=[metric],
+        group_by=[definition] if definition else None,
+        filter_expression=filter_expression
+    )
+
+    actuals = {}
+    for period in response.get('ResultsByTime', []):
+        if definition:
+            entries = [(group['Keys'][0], group['Metrics']) for group in period.get('Groups', [])]
+        else:
+            entries = [('', period.get('Total', {}))]
+        for key, metrics in entries:
+            if metric in metrics:
+                amount, _ = actuals.get(key, (0.0, ''))
+                actuals[key] = (amount + float(metrics[metric]['Amount']), metrics[metric]['Unit'])
+    return actuals
+
+
+def month_end_forecast(
+    client: CostExplorerClient,
+    group_by: Optional[Union[str, Dict[str, str]]] = None,
+    metric: str = DEFAULT_METRIC,
+    filter_expression: Optional[Dict[str, Any]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    today: Optional[datetime.date] = None
+) -> Dict[str, Any]:
+    """
+    Forecast this month's total cost, optionally per dimension value.
+
+    Month-to-date actuals are fetched with a single grouped query. Every
+    group with spend this month (or last month, on the first of the month)
+    then gets its own GetCostForecast call for the rest of the month. The
+    calls run concurrently, up to max_workers at a time, and go through the
+    client's throttler and cache, so they respect the request rate and are
+    only made once per day when a cache is configured.
+
+    Args:
+        client: Client used to query Cost Explorer
+        group_by: Dimension, 'TAG:<key>' or 'COST_CATEGORY:<name>' to
+            forecast each value of separately
+        metric: Cost metric, e.g. 'UnblendedCost'
+        filter_expression: Cost Explorer Filter applied to every query
+        max_workers: Maximum number of forecasts requested at once
+        today: Date the forecast is made on (defaults to today)
+
+    Returns:
+        Dict with a 'Forecast' entry holding TimePeriod, Metric,
+        GroupDefinitions, Groups with the Actual (month to date), Forecast
+        (rest of the month) and MonthEnd amounts of each key, largest first,
+        their Total, and Errors mapping keys to the message of any failed
+        forecast
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    today = today or datetime.date.today()
+    month_start, next_month = _month_bounds(today)
+    definition = parse_group_by(group_by) if group_by else None
+
+    actuals = {}
+    if today > month_start:
+        actuals = _actuals(client, month_start, today, metric, definition, filter_expression)
+
+    if not definition:
+        keys = ['']
+    elif today > month_start:
+        keys = [key for key, (amount, _) in actuals.items() if amount > 0]
+    else:
+        # Nothing is billed yet on the first of the month; use last month's groups
+        previous_start, _ = _month_bounds(month_start - datetime.timedelta(days=1))
+        previous = _actuals(client, previous_start, month_start, metric, definition, filter_expression)
+        keys = [key for key, (amount, _) in previous.items() if amount > 0]
+
+    def forecast(key):
+        return client.get_cost_forecast(
+            start_date=today.strftime('%Y-%m-%d'),
+            end_date=next_month.strftime('%Y-%m-%d'),
+            metric=metric,
+            filter_expression=_combine_filters(filter_expression, group_filter(definition, key) if definition else None)
+        )
+
+    workers = max(1, min(max_workers, len(keys)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [(key, executor.submit(forecast, key)) for key in keys]
+
+    groups = []
+    errors = {}
+    totals = {'Actual': 0.0, 'Forecast': 0.0}
+    unit = 'USD'
+    for key, future in futures:
+        actual, actual_unit = actuals.get(key, (0.0, ''))
+        error = future.exception()
+        if error is not None:
+            errors[key or 'Total'] = str(error) or type(error).__name__
+            continue
+
+        total = future.result().get('Total', {})
+        unit = total.get('Unit') or actual_unit or unit
+        remaining = float(total.get('Amount', 0.0))
+        totals['Actual'] += actual
+        totals['Forecast'] += remaining
+        if definition:
+            groups.append({
+                'Keys': [key],
+                'Actual': {'Amount': actual, 'Unit': unit},
+                'Forecast': {'Amount': remaining, 'Unit': unit},
+                'MonthEnd': {'Amount': actual + remaining, 'Unit': unit},
+            })
+
+    groups.sort(key=lambda group: -group['MonthEnd']['Amount'])
+    return {
+        'Forecast': {
+            'TimePeriod': {'Start': month_start.strftime('%Y-%m-%d'), 'End': next_month.strftime('%Y-%m-%d')},
+            'Metric': metric,
+            'GroupDefinitions': [definition] if definition else [],
+            'Groups': groups,
+            'Total': {
+                'Actual': {'Amount': totals['Actual'], 'Unit': unit},
+                'Forecast': {'Amount': totals['Forecast'], 'Unit': unit},
+                'MonthEnd': {'Amount': totals['Actual'] + totals['Forecast'], 'Unit': unit},
+            },
+            'Errors': errors,
+        }
+    }
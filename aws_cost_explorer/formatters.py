@@ -1,13 +1,26 @@
 """Formatters for AWS Cost Explorer data."""
 
+import csv
+import io
+import itertools
 import json
-from typing import Dict, Any, TextIO, Optional
+from typing import Dict, Any, BinaryIO, Iterable, Iterator, List, TextIO, Tuple, Optional, Union
 import sys
 
+from aws_cost_explorer import instrumentation
+from aws_cost_explorer.amounts import format_amounts, parse_amounts, to_floats
+from aws_cost_explorer.results import CostTable
+
+
+DEFAULT_BATCH_SIZE = 65536
+
 
 class CostFormatter:
     """Base class for cost data formatters."""
     
+    # Whether the formatter writes bytes rather than text
+    binary = False
+    
     def format(self, cost_data: Dict[str, Any]) -> str:
         """Format the cost data into a string representation."""
         raise NotImplementedError("Subclasses must implement format()")
@@ -22,37 +35,225 @@ class CostFormatter:
         """
         output_stream = output_stream or sys.stdout
         output_stream.write(self.format(cost_data))
+    
+    def write_periods(
+        self,
+        periods: Iterable[Dict[str, Any]],
+        output_stream: Optional[TextIO] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Format and output ResultsByTime entries as they are produced.
+        
+        Streaming formatters override this to write each period as soon as it
+        arrives, so memory use does not grow with the size of the result. The
+        default implementation collects the periods and calls output().
+        
+        Args:
+            periods: ResultsByTime entries, e.g. from iter_cost_and_usage()
+            output_stream: Stream to write the output to (defaults to sys.stdout)
+            metadata: Other top-level response fields, such as GroupDefinitions
+        """
+        cost_data = dict(metadata or {})
+        cost_data['ResultsByTime'] = list(periods)
+        self.output(cost_data, output_stream)
+    
+    def write_table(
+        self,
+        table: CostTable,
+        output_stream: Optional[TextIO] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Format and output a CostTable, such as one returned by resample().
+        
+        The default implementation writes table.iter_periods(); tabular
+        formatters read the table's parsed amounts directly instead.
+        
+        Args:
+            table: Table to write
+            output_stream: Stream to write the output to (defaults to sys.stdout)
+            metadata: Other top-level response fields, such as GroupDefinitions
+        """
+        self.write_periods(table.iter_periods(), output_stream, metadata)
 
 
 class PrettyFormatter(CostFormatter):
     """Pretty-prints cost data in a human-readable format."""
     
+    HEADER = "\n===== AWS COST REPORT =====\n"
+    FOOTER = "=========================\n"
+    
+    @instrumentation.timed('formatters.PrettyFormatter.format')
     def format(self, cost_data: Dict[str, Any]) -> str:
         """Format cost data as pretty-printed text."""
-        result = ["\n===== AWS COST REPORT =====\n"]
+        result = [self.HEADER]
         
-        for period in cost_data.get('ResultsByTime', []):
-            start_date = period['TimePeriod']['Start']
-            end_date = period['TimePeriod']['End']
-            
-            result.append(f"Period: {start_date} to {end_date}")
-            result.append("Costs:")
-            
-            for metric_name, metric_data in period['Total'].items():
-                amount = float(metric_data['Amount'])
-                unit = metric_data['Unit']
-                
-                # Only show cost metrics with non-zero amounts or if it's a usage quantity
-                if amount > 0 or metric_name == "UsageQuantity":
-                    result.append(f"  {metric_name}: {amount:.2f} {unit}")
-            
-            if period.get('Estimated', False):
-                result.append("  (Estimated: Yes)")
-            
-            result.append("")
+        if 'Accounts' in cost_data:
+            result.extend(self._format_accounts(cost_data))
+        elif 'Anomalies' in cost_data:
+            result.extend(self._format_anomalies(cost_data['Anomalies']))
+        elif 'Forecast' in cost_data:
+            result.extend(self._format_forecast(cost_data['Forecast']))
+        elif 'Comparison' in cost_data:
+            result.extend(self._format_comparison(cost_data['Comparison']))
+        else:
+            result.extend(self._format_periods(cost_data.get('ResultsByTime', [])))
         
-        result.append("=========================\n")
+        result.append(self.FOOTER)
         return "\n".join(result)
+    
+    @instrumentation.timed('formatters.PrettyFormatter.write_periods')
+    def write_periods(
+        self,
+        periods: Iterable[Dict[str, Any]],
+        output_stream: Optional[TextIO] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Write the report one period at a time."""
+        output_stream = output_stream or sys.stdout
+        output_stream.write(self.HEADER)
+        for period in periods:
+            output_stream.write("\n" + "\n".join(self._format_period(period)))
+        output_stream.write("\n" + self.FOOTER)
+    
+    def _format_accounts(self, cost_data: Dict[str, Any]) -> List[str]:
+        """Format a multi-account result, one section per account."""
+        result = []
+        for account, response in cost_data['Accounts'].items():
+            result.append(f"----- Account: {account} -----")
+            result.extend(self._format_periods(response.get('ResultsByTime', [])))
+        
+        for account, error in cost_data.get('Errors', {}).items():
+            result.append(f"----- Account: {account} -----")
+            result.append(f"  Error: {error}")
+            result.append("")
+        return result
+    
+    def _format_anomalies(self, anomalies: List[Dict[str, Any]]) -> List[str]:
+        """Format anomalies found by AnomalyDetector.detect()."""
+        result = ["Anomalies:"]
+        for anomaly in anomalies:
+            keys = ' / '.join(anomaly['Keys']) or 'Total'
+            estimated = " (Estimated)" if anomaly.get('Estimated') else ""
+            result.append(
+                f"  {anomaly['Date']}  {keys}: {anomaly['Amount']:.2f} {anomaly['Unit']}"
+                f" (expected {anomaly['Expected']:.2f}, z-score {anomaly['ZScore']:+.1f},"
+                f" {', '.join(anomaly['Methods'])}){estimated}"
+            )
+        if not anomalies:
+            result.append("  None found")
+        result.append("")
+        return result
+    
+    def _format_forecast(self, forecast: Dict[str, Any]) -> List[str]:
+        """Format a month-end forecast from month_end_forecast()."""
+        start_date = forecast['TimePeriod']['Start']
+        end_date = forecast['TimePeriod']['End']
+        result = [f"Forecast: {start_date} to {end_date} ({forecast['Metric']})"]
+        
+        rows = [(' / '.join(group['Keys']), group) for group in forecast.get('Groups', [])]
+        rows.append(('Total', forecast['Total']))
+        for name, row in rows:
+            result.append(
+                f"  {name}: {row['Actual']['Amount']:.2f} to date + {row['Forecast']['Amount']:.2f} forecast"
+                f" = {row['MonthEnd']['Amount']:.2f} {row['MonthEnd']['Unit']}"
+            )
+        
+        for key, error in forecast.get('Errors', {}).items():
+            result.append(f"  {key}: Error: {error}")
+        result.append("")
+        return result
+    
+    def _format_comparison(self, comparison: Dict[str, Any]) -> List[str]:
+        """Format a comparison of two date ranges from compare_costs()."""
+        current = comparison['Current']
+        previous = comparison['Previous']
+        result = [
+            f"Comparison: {current['Start']} to {current['End']} vs {previous['Start']} to {previous['End']}",
+            "Total:"
+        ]
+        result.extend(self._format_changes(comparison['Total'], "  "))
+        
+        for group in comparison.get('Groups', []):
+            result.append(f"{' / '.join(group['Keys'])}:")
+            result.extend(self._format_changes(group['Metrics'], "  "))
+        
+        if current.get('Estimated') or previous.get('Estimated'):
+            result.append("(Estimated: Yes)")
+        result.append("")
+        return result
+    
+    def _format_changes(self, changes: Dict[str, Any], indent: str) -> List[str]:
+        """Format a metric name to Current/Previous/Change mapping."""
+        result = []
+        for metric_name, change in changes.items():
+            percent = change['PercentChange']
+            result.append(
+                f"{indent}{metric_name}: {change['Current']['Amount']:.2f} vs {change['Previous']['Amount']:.2f}"
+                f" {change['Change']['Unit']} ({change['Change']['Amount']:+.2f}, "
+                f"{'n/a' if percent is None else f'{percent:+.1f}%'})"
+            )
+        return result
+    
+    def _format_periods(self, periods: Iterable[Dict[str, Any]]) -> List[str]:
+        """Format ResultsByTime entries."""
+        result = []
+        for period in periods:
+            result.extend(self._format_period(period))
+        return result
+    
+    def _format_period(self, period: Dict[str, Any]) -> List[str]:
+        """Format a single ResultsByTime entry."""
+        start_date = period['TimePeriod']['Start']
+        end_date = period['TimePeriod']['End']
+        
+        result = [f"Period: {start_date} to {end_date}", "Costs:"]
+        
+        total = period.get('Total', {})
+        groups = period.get('Groups', [])
+        # Parse and format the period's amounts in one batch, in the order they are shown
+        amounts = parse_amounts([
+            metric_data['Amount']
+            for metrics in itertools.chain([total], (group.get('Metrics', {}) for group in groups))
+            for metric_data in metrics.values()
+        ])
+        amounts = iter(zip(amounts, format_amounts(amounts)))
+        
+        result.extend(self._format_metrics(total, amounts, "  "))
+        
+        for group in groups:
+            metric_lines = self._format_metrics(group.get('Metrics', {}), amounts, "    ")
+            if metric_lines:
+                result.append(f"  {' / '.join(group['Keys'])}:")
+                result.extend(metric_lines)
+        
+        if period.get('Estimated', False):
+            result.append("  (Estimated: Yes)")
+        
+        result.append("")
+        return result
+    
+    def _format_metrics(
+        self, metrics: Dict[str, Any], amounts: Iterator[Tuple[int, str]], indent: str
+    ) -> List[str]:
+        """
+        Format a metric name to Amount/Unit mapping.
+        
+        Args:
+            metrics: Metric name to Amount/Unit mapping
+            amounts: Iterator over (parsed amount, formatted amount) pairs,
+                advanced past this mapping's amounts
+            indent: Prefix of each line
+        """
+        result = []
+        for (metric_name, metric_data), (amount, text) in zip(metrics.items(), amounts):
+            unit = metric_data['Unit']
+            
+            # Only show cost metrics with non-zero amounts or if it's a usage quantity
+            if amount > 0 or metric_name == "UsageQuantity":
+                result.append(f"{indent}{metric_name}: {text} {unit}")
+        return result
 
 
 class JsonFormatter(CostFormatter):
@@ -67,9 +268,343 @@ class JsonFormatter(CostFormatter):
         """
         self.indent = indent
     
+    @instrumentation.timed('formatters.JsonFormatter.format')
     def format(self, cost_data: Dict[str, Any]) -> str:
         """Format cost data as JSON."""
         return json.dumps(cost_data, indent=self.indent, default=str)
+    
+    def _dumps(self, value: Any, level: int) -> str:
+        """Serialize a value as it would appear nested at the given depth."""
+        text = json.dumps(value, indent=self.indent, default=str)
+        if self.indent is None:
+            return text
+        return text.replace("\n", "\n" + " " * (self.indent * level))
+    
+    @instrumentation.timed('formatters.JsonFormatter.write_periods')
+    def write_periods(
+        self,
+        periods: Iterable[Dict[str, Any]],
+        output_stream: Optional[TextIO] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Write a JSON document one period at a time.
+        
+        The output is identical to format() applied to the metadata plus a
+        ResultsByTime list holding all of the periods.
+        """
+        output_stream = output_stream or sys.stdout
+        if self.indent is None:
+            separator, newline, inner = ", ", "", ""
+        else:
+            separator, newline, inner = ",", "\n", " " * self.indent
+        
+        output_stream.write("{")
+        for key, value in (metadata or {}).items():
+            output_stream.write(f"{newline}{inner}{json.dumps(key)}: {self._dumps(value, 1)}{separator}")
+        output_stream.write(f"{newline}{inner}\"ResultsByTime\": [")
+        
+        count = 0
+        for period in periods:
+            output_stream.write(f"{separator if count else ''}{newline}{inner * 2}{self._dumps(period, 2)}")
+            count += 1
+        
+        output_stream.write(f"{newline}{inner}]" if count else "]")
+        output_stream.write(f"{newline}}}")
+
+
+class JsonLinesFormatter(CostFormatter):
+    """Formats cost data as JSON Lines, one ResultsByTime entry (or anomaly) per line."""
+    
+    @instrumentation.timed('formatters.JsonLinesFormatter.format')
+    def format(self, cost_data: Dict[str, Any]) -> str:
+        """
+        Format cost data as JSON Lines.
+        
+        Multi-account results get one line per account and period, with an
+        'Account' field, then one line with the 'Error' of each failed account.
+        """
+        if 'Accounts' in cost_data:
+            entries = [
+                dict({'Account': account}, **period)
+                for account, response in cost_data['Accounts'].items()
+                for period in response.get('ResultsByTime', [])
+            ]
+            entries.extend(
+                {'Account': account, 'Error': str(error)} for account, error in cost_data.get('Errors', {}).items()
+            )
+        elif 'Anomalies' in cost_data:
+            entries = cost_data['Anomalies']
+        else:
+            entries = cost_data.get('ResultsByTime', [])
+        return "".join(self._format_line(entry) for entry in entries)
+    
+    def _format_line(self, period: Dict[str, Any]) -> str:
+        return json.dumps(period, separators=(',', ':'), default=str) + "\n"
+    
+    @instrumentation.timed('formatters.JsonLinesFormatter.write_periods')
+    def write_periods(
+        self,
+        periods: Iterable[Dict[str, Any]],
+        output_stream: Optional[TextIO] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Write one line per period as it arrives."""
+        output_stream = output_stream or sys.stdout
+        for period in periods:
+            output_stream.write(self._format_line(period))
+
+
+def group_column_names(group_definitions: List[Dict[str, str]]) -> List[str]:
+    """
+    Return column names for the group keys of a grouped query.
+    
+    Args:
+        group_definitions: GroupDefinitions of the response
+        
+    Returns:
+        'service'-style names for dimensions and 'tag:<key>' or
+        'cost_category:<name>' for tags and cost categories
+    """
+    names = []
+    for definition in group_definitions:
+        if definition.get('Type') == 'DIMENSION':
+            names.append(definition['Key'].lower())
+        else:
+            names.append(f"{definition.get('Type', 'group').lower()}:{definition['Key']}")
+    return names
+
+
+def flatten_periods(periods: Iterable[Dict[str, Any]], group_count: int) -> Iterator[Tuple[Any, ...]]:
+    """
+    Flatten ResultsByTime entries into one row per period, group and metric.
+    
+    Each period's amounts are parsed in one batch with parse_amounts();
+    CostTable.iter_rows() yields the same rows from a parsed table.
+    
+    Args:
+        periods: ResultsByTime entries
+        group_count: Number of group key columns
+        
+    Yields:
+        (start, end, *group_keys, metric, amount, unit, estimated) tuples
+    """
+    no_keys = ('',) * group_count
+    for period in periods:
+        start = period['TimePeriod']['Start']
+        end = period['TimePeriod']['End']
+        estimated = bool(period.get('Estimated', False))
+        
+        groups = period.get('Groups')
+        if groups:
+            entries = [
+                (tuple(group['Keys'][:group_count]) + no_keys[len(group['Keys']):], group.get('Metrics', {}))
+                for group in groups
+            ]
+        else:
+            entries = [(no_keys, period.get('Total', {}))]
+        
+        amounts = iter(to_floats(parse_amounts([
+            metric_data['Amount'] for _, metrics in entries for metric_data in metrics.values()
+        ])))
+        for keys, metrics in entries:
+            prefix = (start, end) + keys
+            for (metric_name, metric_data), amount in zip(metrics.items(), amounts):
+                yield prefix + (metric_name, amount, metric_data['Unit'], estimated)
+
+
+class TabularFormatter(CostFormatter):
+    """
+    Base class for formatters writing one row per period, group and metric.
+    
+    Columns are start, end, one column per group key, metric, amount (as a
+    float), unit and estimated.
+    """
+    
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Initialize the formatter.
+        
+        Args:
+            batch_size: Number of rows converted and written at a time
+        """
+        self.batch_size = batch_size
+    
+    @instrumentation.timed('formatters.TabularFormatter.output')
+    def output(self, cost_data: Dict[str, Any], output_stream: Optional[Union[TextIO, BinaryIO]] = None) -> None:
+        """
+        Format and output the cost data.
+        
+        Multi-account results get a leading 'account' column. Accounts that
+        failed have no rows, so their errors are written to stderr.
+        """
+        if 'Accounts' not in cost_data:
+            metadata = {key: value for key, value in cost_data.items() if key != 'ResultsByTime'}
+            self.write_periods(cost_data.get('ResultsByTime', []), output_stream, metadata)
+            return
+        
+        responses = cost_data['Accounts']
+        group_definitions = next(
+            (response['GroupDefinitions'] for response in responses.values() if response.get('GroupDefinitions')),
+            None
+        )
+        first = next(
+            (period for response in responses.values() for period in response.get('ResultsByTime', [])),
+            None
+        )
+        group_columns = self._group_columns(group_definitions, first)
+        rows = (
+            (account,) + row
+            for account, response in responses.items()
+            for row in flatten_periods(response.get('ResultsByTime', []), len(group_columns))
+        )
+        self._write_rows(['account'] + self._columns(group_columns), rows, output_stream)
+        for account, error in cost_data.get('Errors', {}).items():
+            sys.stderr.write(f"Error: account {account}: {error}\n")
+    
+    @instrumentation.timed('formatters.TabularFormatter.write_periods')
+    def write_periods(
+        self,
+        periods: Iterable[Dict[str, Any]],
+        output_stream: Optional[Union[TextIO, BinaryIO]] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Write rows in batches as periods arrive."""
+        periods = iter(periods)
+        first = next(periods, None)
+        if first is not None:
+            periods = itertools.chain([first], periods)
+        
+        group_columns = self._group_columns((metadata or {}).get('GroupDefinitions'), first)
+        rows = flatten_periods(periods, len(group_columns))
+        self._write_rows(self._columns(group_columns), rows, output_stream)
+    
+    @instrumentation.timed('formatters.TabularFormatter.write_table')
+    def write_table(
+        self,
+        table: CostTable,
+        output_stream: Optional[Union[TextIO, BinaryIO]] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Write the same rows as write_periods(table.iter_periods()), without formatting amounts as text."""
+        group_count = max((len(key) for key in table.keys), default=0)
+        group_definitions = (metadata or {}).get('GroupDefinitions')
+        if group_definitions:
+            group_columns = group_column_names(group_definitions)
+        else:
+            group_columns = [f"group_{index + 1}" for index in range(group_count)]
+        rows = table.iter_rows(len(group_columns))
+        self._write_rows(self._columns(group_columns), rows, output_stream)
+    
+    def _group_columns(
+        self,
+        group_definitions: Optional[List[Dict[str, str]]],
+        first_period: Optional[Dict[str, Any]]
+    ) -> List[str]:
+        """Name the group key columns, inferring them from the data if needed."""
+        if group_definitions:
+            return group_column_names(group_definitions)
+        
+        groups = (first_period or {}).get('Groups') or [{'Keys': []}]
+        return [f"group_{index + 1}" for index in range(len(groups[0]['Keys']))]
+    
+    def _columns(self, group_columns: List[str]) -> List[str]:
+        return ['start', 'end'] + group_columns + ['metric', 'amount', 'unit', 'estimated']
+    
+    def _write_rows(
+        self,
+        columns: List[str],
+        rows: Iterator[Tuple[Any, ...]],
+        output_stream: Optional[Union[TextIO, BinaryIO]]
+    ) -> None:
+        """Split rows into batches and write them."""
+        if output_stream is None:
+            output_stream = sys.stdout.buffer if self.binary else sys.stdout
+        batches = iter(lambda: list(itertools.islice(rows, self.batch_size)), [])
+        self._write_batches(columns, batches, output_stream)
+    
+    def _write_batches(
+        self,
+        columns: List[str],
+        batches: Iterator[List[Tuple[Any, ...]]],
+        output_stream: Union[TextIO, BinaryIO]
+    ) -> None:
+        """Write the header (if any) and each batch of rows."""
+        raise NotImplementedError("Subclasses must implement _write_batches()")
+
+
+class CsvFormatter(TabularFormatter):
+    """Formats cost data as CSV."""
+    
+    def format(self, cost_data: Dict[str, Any]) -> str:
+        """Format cost data as CSV."""
+        output_buffer = io.StringIO()
+        self.output(cost_data, output_buffer)
+        return output_buffer.getvalue()
+    
+    def _write_batches(self, columns, batches, output_stream):
+        writer = csv.writer(output_stream, lineterminator="\n")
+        writer.writerow(columns)
+        for batch in batches:
+            writer.writerows(batch)
+
+
+class ArrowFormatter(TabularFormatter):
+    """Formats cost data as an Apache Arrow IPC stream. Requires pyarrow."""
+    
+    binary = True
+    
+    def format(self, cost_data: Dict[str, Any]) -> str:
+        """Not supported; Arrow output is binary. Use output() instead."""
+        raise TypeError(f"{type(self).__name__} produces binary output; use output() with a binary stream")
+    
+    def _schema(self, columns: List[str]) -> Any:
+        """Build the Arrow schema for the flattened columns."""
+        pa = _import_pyarrow()
+        fields = [pa.field(name, pa.string()) for name in columns[:-3]]
+        fields.append(pa.field('amount', pa.float64()))
+        fields.append(pa.field('unit', pa.string()))
+        fields.append(pa.field('estimated', pa.bool_()))
+        return pa.schema(fields)
+    
+    def _record_batches(self, schema: Any, batches: Iterator[List[Tuple[Any, ...]]]) -> Iterator[Any]:
+        """Convert row batches into Arrow record batches."""
+        pa = _import_pyarrow()
+        for batch in batches:
+            arrays = [
+                pa.array(column, type=field.type)
+                for column, field in zip(zip(*batch), schema)
+            ]
+            yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+    
+    def _write_batches(self, columns, batches, output_stream):
+        pa = _import_pyarrow()
+        schema = self._schema(columns)
+        with pa.ipc.new_stream(output_stream, schema) as writer:
+            for record_batch in self._record_batches(schema, batches):
+                writer.write_batch(record_batch)
+
+
+class ParquetFormatter(ArrowFormatter):
+    """Formats cost data as a Parquet file. Requires pyarrow."""
+    
+    def _write_batches(self, columns, batches, output_stream):
+        schema = self._schema(columns)
+        import pyarrow.parquet as pq
+        
+        with pq.ParquetWriter(output_stream, schema) as writer:
+            for record_batch in self._record_batches(schema, batches):
+                writer.write_batch(record_batch)
+
+
+def _import_pyarrow() -> Any:
+    """Import pyarrow, explaining how to install it if it is missing."""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError as error:
+        raise ImportError("Arrow and Parquet output require pyarrow: pip install pyarrow") from error
+    return pyarrow
 
 
 def get_formatter(format_type: str) -> CostFormatter:
@@ -77,7 +612,8 @@ def get_formatter(format_type: str) -> CostFormatter:
     Factory function to get the appropriate formatter.
     
     Args:
-        format_type: Type of formatter ('pretty', 'json')
+        format_type: Type of formatter ('pretty', 'json', 'jsonl', 'csv',
+            'arrow', 'parquet')
         
     Returns:
         An instance of the requested formatter
@@ -87,7 +623,11 @@ def get_formatter(format_type: str) -> CostFormatter:
     """
     formatters = {
         'pretty': PrettyFormatter,
-        'json': JsonFormatter
+        'json': JsonFormatter,
+        'jsonl': JsonLinesFormatter,
+        'csv': CsvFormatter,
+        'arrow': ArrowFormatter,
+        'parquet': ParquetFormatter
     }
     
     if format_type not in formatters:
@@ -0,0 +1,203 @@
+"""Opt-in timers, counters and hooks for profiling a run."""
+
+import functools
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+
+# Hooks receive (kind, name, value): kind is 'timer' (value in seconds) or 'counter'
+Hook = Callable[[str, str, float], None]
+
+_enabled = False
+_lock = threading.Lock()
+_timers = {}
+_counters = {}
+_hooks = []
+
+
+def enable() -> None:
+    """Start recording timers and counters."""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Stop recording; instrumented code goes back to its fast path."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Return True if instrumentation is recording."""
+    return _enabled
+
+
+def reset() -> None:
+    """Clear everything recorded so far."""
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+
+
+def add_hook(hook: Hook) -> None:
+    """
+    Register a callback for every recorded timer and counter increment.
+
+    Hooks run synchronously on the recording thread, so they should be
+    quick (e.g. hand the value to a metrics client).
+    """
+    with _lock:
+        _hooks.append(hook)
+
+
+def remove_hook(hook: Hook) -> None:
+    """Unregister a callback added with add_hook()."""
+    with _lock:
+        _hooks.remove(hook)
+
+
+def _notify(kind: str, name: str, value: float) -> None:
+    for hook in list(_hooks):
+        hook(kind, name, value)
+
+
+def count(name: str, value: float = 1) -> None:
+    """Add value to a counter, if enabled."""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+    _notify('counter', name, value)
+
+
+def record_time(name: str, seconds: float) -> None:
+    """Add one measurement to a timer, if enabled."""
+    if not _enabled:
+        return
+    with _lock:
+        stats = _timers.get(name)
+        if stats is None:
+            stats = _timers[name] = [0, 0.0, 0.0]
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] = max(stats[2], seconds)
+    _notify('timer', name, seconds)
+
+
+class _Timer:
+    """Context manager recording the time spent in its block."""
+
+    __slots__ = ('name', 'started')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> '_Timer':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        record_time(self.name, time.perf_counter() - self.started)
+
+
+class _NullTimer:
+    """Shared do-nothing timer returned while disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullTimer':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name: str) -> Any:
+    """
+    Time a block of code.
+
+    Usage::
+
+        with instrumentation.timer('api.get_cost_and_usage'):
+            ...
+    """
+    return _Timer(name) if _enabled else _NULL_TIMER
+
+
+def timed(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator timing every call of a function under the given name."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def counted(items: Iterable[Any], name: str) -> Iterable[Any]:
+    """Count items as they are consumed from an iterable, if enabled."""
+    if not _enabled:
+        return items
+    return _count_items(items, name)
+
+
+def _count_items(items: Iterable[Any], name: str) -> Iterator[Any]:
+    for item in items:
+        count(name)
+        yield item
+
+
+class _CountingStream:
+    """Stream proxy counting the characters (or bytes) written through it."""
+
+    def __init__(self, stream: Any, name: str):
+        self._stream = stream
+        self._name = name
+
+    def write(self, data: Any) -> int:
+        count(self._name, len(data))
+        return self._stream.write(data)
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._stream, attribute)
+
+
+def counting_stream(stream: Any, name: str) -> Any:
+    """Wrap a stream so its writes are counted, if enabled."""
+    return _CountingStream(stream, name) if _enabled else stream
+
+
+def peak_memory_bytes() -> Optional[int]:
+    """Return the peak resident set size of the process, where available."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def summary() -> Dict[str, Any]:
+    """
+    Return everything recorded so far.
+
+    Returns:
+        Dict with 'timers' (count, total_seconds and max_seconds per name),
+        'counters' and 'peak_memory_bytes'
+    """
+    with _lock:
+        timers = {
+            name: {'count': calls, 'total_seconds': total, 'max_seconds': longest}
+            for name, (calls, total, longest) in sorted(_timers.items())
+        }
+        counters = dict(sorted(_counters.items()))
+    return {'timers': timers, 'counters': counters, 'peak_memory_bytes': peak_memory_bytes()}
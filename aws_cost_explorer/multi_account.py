@@ -0,0 +1,99 @@
+"""Query AWS Cost Explorer across several profiles concurrently."""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from aws_cost_explorer.cache import ResponseCache
+from aws_cost_explorer.cost_client import CostExplorerClient
+
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def read_profiles_file(path: str) -> List[str]:
+    """
+    Read profile names from a file, one per line.
+
+    Blank lines and lines starting with '#' are ignored.
+
+    Args:
+        path: Path to the profiles file
+
+    Returns:
+        Profile names in file order
+    """
+    with open(path) as profiles_file:
+        lines = (line.strip() for line in profiles_file)
+        return [line for line in lines if line and not line.startswith('#')]
+
+
+class MultiAccountClient:
+    """Runs the same cost query against many AWS profiles in parallel."""
+
+    def __init__(
+        self,
+        profiles: List[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        cache: Optional[ResponseCache] = None,
+        client_factory: Optional[Callable[[str], CostExplorerClient]] = None
+    ):
+        """
+        Initialize the multi-account client.
+
+        Args:
+            profiles: AWS profile names to query
+            max_workers: Maximum number of profiles queried at once
+            cache: Response cache shared by all per-profile clients
+            client_factory: Callable creating a client for a profile name
+                (defaults to CostExplorerClient)
+        """
+        self.profiles = list(dict.fromkeys(profiles))
+        self.max_workers = max_workers
+        self.cache = cache
+        self.client_factory = client_factory or self._create_client
+        self._clients = {}
+
+    def _create_client(self, profile: str) -> CostExplorerClient:
+        """Create a client with its own boto3 session for a profile."""
+        return CostExplorerClient(profile=profile, cache=self.cache)
+
+    def _get_client(self, profile: str) -> CostExplorerClient:
+        """Return the client for a profile, creating it on first use."""
+        # Each profile is handled by a single worker at a time, and boto3
+        # sessions are created inside that worker rather than shared.
+        if profile not in self._clients:
+            self._clients[profile] = self.client_factory(profile)
+        return self._clients[profile]
+
+    def get_cost_and_usage(self, **query: Any) -> Dict[str, Any]:
+        """
+        Query every profile concurrently.
+
+        A failure in one profile does not affect the others; its error
+        message is reported under 'Errors' instead.
+
+        Args:
+            **query: Arguments passed to CostExplorerClient.get_cost_and_usage()
+
+        Returns:
+            Dict with 'Accounts' mapping profile to response and 'Errors'
+            mapping profile to error message, both in profile order
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        def fetch(profile):
+            return self._get_client(profile).get_cost_and_usage(**query)
+
+        workers = max(1, min(self.max_workers, len(self.profiles)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [(profile, executor.submit(fetch, profile)) for profile in self.profiles]
+
+        accounts = {}
+        errors = {}
+        for profile, future in futures:
+            error = future.exception()
+            if error is not None:
+                errors[profile] = str(error) or type(error).__name__
+            else:
+                accounts[profile] = future.result()
+
+        return {'Accounts': accounts, 'Errors': errors}
@@ -0,0 +1,310 @@
+"""Plan and run many overlapping cost reports with as few queries as possible."""
+
+import decimal
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from aws_cost_explorer.cost_client import CostExplorerClient, parse_group_by
+from aws_cost_explorer.date_utils import split_date_range
+
+
+DEFAULT_METRICS = ['BlendedCost', 'UnblendedCost', 'UsageQuantity']
+DEFAULT_MAX_WORKERS = 4
+
+# Metrics whose MONTHLY amounts are exactly the sum of their DAILY amounts.
+# Blended rates are averaged over the whole month, so BlendedCost is not.
+ADDITIVE_METRICS = frozenset([
+    'AmortizedCost',
+    'NetAmortizedCost',
+    'NetUnblendedCost',
+    'NormalizedUsageAmount',
+    'UnblendedCost',
+    'UsageQuantity',
+])
+
+
+def _is_month_start(date: str) -> bool:
+    return date.endswith('-01')
+
+
+class ReportSpec:
+    """A single report: the arguments of one get_cost_and_usage() call, named."""
+
+    def __init__(
+        self,
+        name: str,
+        start_date: str,
+        end_date: str,
+        granularity: str = 'DAILY',
+        metrics: Optional[List[str]] = None,
+        group_by: Optional[List[Union[str, Dict[str, str]]]] = None,
+        filter_expression: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize the report.
+
+        Args:
+            name: Name the report's result is returned under
+            start_date: Start date in YYYY-MM-DD format (inclusive)
+            end_date: End date in YYYY-MM-DD format (exclusive)
+            granularity: DAILY or MONTHLY
+            metrics: Cost metrics (defaults to DEFAULT_METRICS)
+            group_by: Up to two groupings, as for get_cost_and_usage()
+            filter_expression: Cost Explorer Filter expression
+        """
+        self.name = name
+        self.start_date = start_date
+        self.end_date = end_date
+        self.granularity = granularity
+        self.metrics = list(metrics or DEFAULT_METRICS)
+        self.group_by = [parse_group_by(spec) for spec in group_by or []]
+        self.filter_expression = filter_expression
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ReportSpec':
+        """Build a report from a dict of constructor arguments, e.g. parsed JSON."""
+        return cls(**data)
+
+    def shape(self) -> str:
+        """Key shared by reports whose data can come from the same queries."""
+        return json.dumps([self.group_by, self.filter_expression], sort_keys=True)
+
+
+class _Interval:
+    """A planned query range and the reports it serves."""
+
+    def __init__(self, start_date: str, end_date: str):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.metrics = []
+        self.reports = []
+
+    def add(self, report: ReportSpec) -> None:
+        self.start_date = min(self.start_date, report.start_date)
+        self.end_date = max(self.end_date, report.end_date)
+        self.metrics.extend(metric for metric in report.metrics if metric not in self.metrics)
+        self.reports.append(report)
+
+
+def _merge_ranges(reports: List[ReportSpec]) -> List[_Interval]:
+    """Group reports into query ranges; overlapping and adjacent ranges share one interval."""
+    intervals = []
+    for report in sorted(reports, key=lambda report: (report.start_date, report.end_date)):
+        last = intervals[-1] if intervals else None
+        if last and report.start_date <= last.end_date:
+            last.add(report)
+        else:
+            interval = _Interval(report.start_date, report.end_date)
+            interval.add(report)
+            intervals.append(interval)
+    return intervals
+
+
+def _merge_monthly(reports: List[ReportSpec]) -> List[_Interval]:
+    """
+    Group MONTHLY reports into MONTHLY query ranges.
+
+    A MONTHLY query's periods split at month starts and at its own start
+    and end. Reports share a query when their ranges overlap or touch and
+    each report's start and end stays a period boundary of the merged
+    query, so its periods can be sliced out exactly.
+    """
+    intervals = []
+    for report in sorted(reports, key=lambda report: (report.start_date, report.end_date)):
+        last = intervals[-1] if intervals else None
+        if last and report.start_date <= last.end_date:
+            end_date = max(last.end_date, report.end_date)
+            if (report.start_date == last.start_date or _is_month_start(report.start_date)) and all(
+                member.end_date == end_date or _is_month_start(member.end_date)
+                for member in last.reports + [report]
+            ):
+                last.add(report)
+                continue
+        interval = _Interval(report.start_date, report.end_date)
+        interval.add(report)
+        intervals.append(interval)
+    return intervals
+
+
+def plan_queries(reports: Iterable[ReportSpec]) -> Tuple[List[Dict[str, Any]], Dict[str, Tuple[int, bool]]]:
+    """
+    Plan the upstream queries needed for a set of reports.
+
+    Reports only share queries when their group_by and filter match. Within
+    that:
+
+    - DAILY reports with overlapping or adjacent ranges share one DAILY
+      query, requesting the union of their metrics.
+    - MONTHLY reports using only ADDITIVE_METRICS, whose range lies within
+      such a DAILY query, are summed from its days instead of fetched.
+    - Other MONTHLY reports share a MONTHLY query when their ranges
+      overlap or touch and every report's start and end is a month start
+      or an end of the merged range (so the query's periods match theirs
+      exactly), e.g. last month and this month to date.
+
+    Args:
+        reports: Reports to plan
+
+    Returns:
+        (queries, sources): get_cost_and_usage() keyword arguments for each
+        query, and for each report name the index of the query it reads
+        from and whether its MONTHLY periods are derived from DAILY data
+    """
+    shapes = {}
+    for report in reports:
+        shapes.setdefault(report.shape(), []).append(report)
+
+    queries = []
+    sources = {}
+
+    def add_query(interval, granularity, template):
+        sources.update((report.name, (len(queries), granularity != report.granularity)) for report in interval.reports)
+        query = {
+            'start_date': interval.start_date,
+            'end_date': interval.end_date,
+            'granularity': granularity,
+            'metrics': interval.metrics,
+        }
+        if template.group_by:
+            query['group_by'] = template.group_by
+        if template.filter_expression:
+            query['filter_expression'] = template.filter_expression
+        queries.append(query)
+
+    for shape_reports in shapes.values():
+        daily = _merge_ranges([report for report in shape_reports if report.granularity == 'DAILY'])
+
+        monthly = []
+        for report in shape_reports:
+            if report.granularity == 'DAILY':
+                continue
+            covering = next((
+                interval for interval in daily
+                if interval.start_date <= report.start_date and report.end_date <= interval.end_date
+            ), None)
+            if covering is not None and set(report.metrics) <= ADDITIVE_METRICS:
+                covering.add(report)
+            else:
+                monthly.append(report)
+
+        for interval in daily:
+            add_query(interval, 'DAILY', shape_reports[0])
+        for interval in _merge_monthly(monthly):
+            add_query(interval, 'MONTHLY', shape_reports[0])
+
+    return queries, sources
+
+
+def _select_metrics(metrics: Dict[str, Any], names: List[str]) -> Dict[str, Any]:
+    return {name: metrics[name] for name in names if name in metrics}
+
+
+def _slice_periods(report: ReportSpec, periods: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return the report's periods and metrics from a query's periods."""
+    sliced = []
+    for period in periods:
+        if period['TimePeriod']['Start'] < report.start_date or period['TimePeriod']['End'] > report.end_date:
+            continue
+        sliced.append({
+            'TimePeriod': period['TimePeriod'],
+            'Total': _select_metrics(period.get('Total', {}), report.metrics),
+            'Groups': [
+                {'Keys': group['Keys'], 'Metrics': _select_metrics(group.get('Metrics', {}), report.metrics)}
+                for group in period.get('Groups', [])
+            ],
+            'Estimated': period.get('Estimated', False)
+        })
+    return sliced
+
+
+def _sum_metrics(target: Dict[str, Any], metrics: Dict[str, Any]) -> None:
+    """Add Amount strings into target exactly, keeping the sums as Decimals."""
+    for name, data in metrics.items():
+        if name in target:
+            target[name]['Amount'] += decimal.Decimal(data['Amount'])
+        else:
+            target[name] = {'Amount': decimal.Decimal(data['Amount']), 'Unit': data['Unit']}
+
+
+def _metric_strings(sums: Dict[str, Any]) -> Dict[str, Any]:
+    """Format the sums from _sum_metrics() as plain decimal Amount strings, as Cost Explorer returns them."""
+    return {name: {'Amount': format(data['Amount'], 'f'), 'Unit': data['Unit']} for name, data in sums.items()}
+
+
+def _roll_up_monthly(report: ReportSpec, daily_periods: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Sum a report's DAILY periods into its MONTHLY periods."""
+    months = split_date_range(report.start_date, report.end_date, 'MONTHLY')
+    totals = [{} for _ in months]
+    groups = [{} for _ in months]
+    estimated = [False for _ in months]
+
+    index = 0
+    for period in daily_periods:
+        while period['TimePeriod']['Start'] >= months[index][1]:
+            index += 1
+        _sum_metrics(totals[index], period.get('Total', {}))
+        for group in period.get('Groups', []):
+            _sum_metrics(groups[index].setdefault(tuple(group['Keys']), {}), group.get('Metrics', {}))
+        estimated[index] = estimated[index] or period.get('Estimated', False)
+
+    return [
+        {
+            'TimePeriod': {'Start': start, 'End': end},
+            'Total': _metric_strings(totals[index]),
+            'Groups': [
+                {'Keys': list(keys), 'Metrics': _metric_strings(sums)} for keys, sums in groups[index].items()
+            ],
+            'Estimated': estimated[index]
+        }
+        for index, (start, end) in enumerate(months)
+    ]
+
+
+def run_reports(
+    client: CostExplorerClient,
+    reports: Iterable[ReportSpec],
+    max_workers: int = DEFAULT_MAX_WORKERS
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Produce many reports from a minimal set of upstream queries.
+
+    The queries from plan_queries() run concurrently through the client
+    (and its cache and throttler), then each report's periods and metrics
+    are sliced out of the query that covers it.
+
+    Args:
+        client: Client used to query Cost Explorer
+        reports: Reports to produce; names must be unique
+        max_workers: Maximum number of queries run at once
+
+    Returns:
+        Response in the shape of get_cost_and_usage() for each report name,
+        in the order the reports were given
+
+    Raises:
+        ValueError: If two reports share a name
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    reports = list(reports)
+    names = [report.name for report in reports]
+    if len(set(names)) != len(names):
+        raise ValueError("Report names must be unique")
+
+    queries, sources = plan_queries(reports)
+    workers = max(1, min(max_workers, len(queries)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        responses = list(executor.map(lambda query: client.get_cost_and_usage(**query), queries))
+
+    results = {}
+    for report in reports:
+        index, derived = sources[report.name]
+        periods = _slice_periods(report, responses[index].get('ResultsByTime', []))
+        if derived:
+            periods = _roll_up_monthly(report, periods)
+
+        response = {'ResultsByTime': periods}
+        if report.group_by:
+            response['GroupDefinitions'] = report.group_by
+        results[report.name] = response
+    return results
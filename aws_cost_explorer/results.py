@@ -0,0 +1,307 @@
+"""Columnar representation of AWS Cost Explorer results."""
+
+import itertools
+import operator
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from aws_cost_explorer.amounts import SCALE, UNITS, amount_text, parse_amounts, to_floats
+
+
+# Key used for the Total row of ungrouped results
+TOTAL_KEY = ()
+
+_AMOUNT = operator.itemgetter('Amount')
+
+
+def _in_layout_order(
+    shape: Tuple[int, int, int],
+    group_periods: array,
+    group_rows: array,
+    group_sizes: array,
+    cell_columns: array
+) -> bool:
+    """Whether amounts arrived in exactly the table's layout order, with no gaps."""
+    period_count, key_count, metric_count = shape
+    row_count = period_count * key_count
+    return (
+        len(cell_columns) == row_count * metric_count
+        and group_sizes == array('l', [metric_count]) * row_count
+        and cell_columns == array('l', range(metric_count)) * row_count
+        and group_rows == array('l', range(key_count)) * period_count
+        and group_periods == array('l', itertools.chain.from_iterable(
+            itertools.repeat(position, key_count) for position in range(period_count)
+        ))
+    )
+
+
+def _scatter(
+    shape: Tuple[int, int, int],
+    group_periods: array,
+    group_rows: array,
+    group_sizes: array,
+    cell_columns: array,
+    amounts: array
+) -> array:
+    """Place amounts at their period, key and metric, adding up repeated cells."""
+    period_count, key_count, metric_count = shape
+    values = array(amounts.typecode, bytes(amounts.itemsize * period_count * key_count * metric_count))
+    all_columns = array('l', range(metric_count))
+    cell = 0
+    for position, row, size in zip(group_periods, group_rows, group_sizes):
+        base = (position * key_count + row) * metric_count
+        end = cell + size
+        if cell_columns[cell:end] == all_columns and not any(values[base:base + size]):
+            # The usual case: a whole row of metrics in order, copied at once
+            values[base:base + size] = amounts[cell:end]
+        else:
+            for offset in range(cell, end):
+                values[base + cell_columns[offset]] += amounts[offset]
+        cell = end
+    return values
+
+
+class CostTable:
+    """
+    Dense periods x group keys x metrics table of metric amounts.
+
+    Amounts are parsed from their string form once, in a single batch when
+    the table is built, into whole numbers of 10^-8 units (see the amounts
+    module), so sums over periods and groups are exact and do not depend
+    on the order they are added in. They are stored in one flat
+    ``array('q')`` laid out as
+    ``values[(period * len(keys) + key) * len(metrics) + metric]``; the
+    accessors below return floats. Group keys are tuples of interned
+    strings; ungrouped results have the single key TOTAL_KEY. Groups
+    absent from a period are stored as 0.
+
+    Building a table from a stream of periods (e.g. HOURLY results from
+    iter_cost_and_usage()) never holds the nested response dicts: each
+    amount is kept in parallel arrays until the final layout is known.
+    """
+
+    def __init__(
+        self,
+        periods: List[Tuple[str, str]],
+        keys: List[Tuple[str, ...]],
+        metrics: List[str],
+        units: Dict[str, str],
+        values: array,
+        estimated: List[bool]
+    ):
+        """
+        Initialize the table. Use from_response() or from_periods() instead.
+
+        Args:
+            periods: (start, end) of each period
+            keys: Group key tuple of each row
+            metrics: Metric names
+            units: Unit of each metric
+            values: Flat array of amounts in 10^-8 units, as returned by
+                parse_amounts(), in period, key, metric order
+            estimated: Estimated flag of each period
+        """
+        self.periods = periods
+        self.keys = keys
+        self.metrics = metrics
+        self.units = units
+        self.values = values
+        self.estimated = estimated
+        self._key_index = {key: index for index, key in enumerate(keys)}
+        self._metric_index = {metric: index for index, metric in enumerate(metrics)}
+
+    @classmethod
+    def from_response(cls, response: Dict[str, Any]) -> 'CostTable':
+        """Build a table from a GetCostAndUsage response."""
+        return cls.from_periods(response.get('ResultsByTime', []))
+
+    @classmethod
+    def from_periods(cls, periods: Iterable[Dict[str, Any]]) -> 'CostTable':
+        """
+        Build a table from ResultsByTime entries.
+
+        Args:
+            periods: ResultsByTime entries, e.g. from iter_cost_and_usage()
+
+        Returns:
+            The populated table
+        """
+        period_list = []
+        estimated = []
+        key_index = {}
+        metric_index = {}
+        units = {}
+        # Metric names seen so far, in column order, and their columns
+        metric_names = ()
+        all_columns = array('l')
+        # Period position, key row and number of amounts of each group (or
+        # Total), then the metric column and Amount string of each amount;
+        # the strings are parsed all at once at the end
+        group_periods = array('l')
+        group_rows = array('l')
+        group_sizes = array('l')
+        cell_columns = array('l')
+        cell_texts = []
+
+        for position, period in enumerate(periods):
+            period_list.append((period['TimePeriod']['Start'], period['TimePeriod']['End']))
+            estimated.append(bool(period.get('Estimated', False)))
+
+            groups = period.get('Groups')
+            if not groups:
+                groups = [{'Keys': TOTAL_KEY, 'Metrics': period['Total']}] if period.get('Total') else []
+
+            for group in groups:
+                metrics = group.get('Metrics', {})
+                group_periods.append(position)
+                group_rows.append(key_index.setdefault(tuple(map(sys.intern, group['Keys'])), len(key_index)))
+                group_sizes.append(len(metrics))
+
+                if tuple(metrics) == metric_names:
+                    # The usual case: every metric, in column order
+                    cell_columns.extend(all_columns)
+                    cell_texts.extend(map(_AMOUNT, metrics.values()))
+                    continue
+
+                for metric, data in metrics.items():
+                    column = metric_index.get(metric)
+                    if column is None:
+                        column = metric_index[metric] = len(metric_index)
+                        units[metric] = UNITS.intern(data.get('Unit', ''))
+                        metric_names = tuple(metric_index)
+                        all_columns = array('l', range(len(metric_names)))
+                    cell_columns.append(column)
+                    cell_texts.append(data['Amount'])
+
+        shape = (len(period_list), len(key_index), len(metric_index))
+        amounts = parse_amounts(cell_texts)
+        if _in_layout_order(shape, group_periods, group_rows, group_sizes, cell_columns):
+            values = amounts
+        else:
+            values = _scatter(shape, group_periods, group_rows, group_sizes, cell_columns, amounts)
+
+        return cls(
+            period_list,
+            sorted(key_index, key=key_index.get),
+            sorted(metric_index, key=metric_index.get),
+            units,
+            values,
+            estimated
+        )
+
+    def _offset(self, period: int, key: int, metric: int) -> int:
+        return (period * len(self.keys) + key) * len(self.metrics) + metric
+
+    def value(self, period: int, key: Tuple[str, ...], metric: str) -> float:
+        """Return the amount for a period index, group key and metric."""
+        return self.values[self._offset(period, self._key_index[key], self._metric_index[metric])] / SCALE
+
+    def series(self, key: Tuple[str, ...], metric: str) -> array:
+        """Return one group's amounts for a metric across all periods."""
+        row = self._key_index[key]
+        column = self._metric_index[metric]
+        stride = len(self.keys) * len(self.metrics)
+        start = row * len(self.metrics) + column
+        return to_floats(self.values[start::stride]) if stride else array('d')
+
+    def period_totals(self, metric: str) -> array:
+        """Return the amount for a metric summed over all groups, per period."""
+        column = self._metric_index[metric]
+        width = len(self.keys) * len(self.metrics)
+        totals = array('d')
+        for period in range(len(self.periods)):
+            row_values = self.values[period * width + column:(period + 1) * width:len(self.metrics)]
+            totals.append(sum(row_values) / SCALE)
+        return totals
+
+    def key_totals(self, metric: str) -> Dict[Tuple[str, ...], float]:
+        """Return the amount for a metric summed over all periods, per group."""
+        column = self._metric_index[metric]
+        stride = len(self.keys) * len(self.metrics)
+        return {
+            key: sum(self.values[row * len(self.metrics) + column::stride]) / SCALE
+            for row, key in enumerate(self.keys)
+        }
+
+    def iter_periods(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the table as ResultsByTime entries, e.g. for a formatter's write_periods().
+
+        Groups whose amounts are all 0.0 in a period are left out, as Cost
+        Explorer leaves out groups without usage.
+        """
+        width = len(self.metrics)
+        for position, (start, end) in enumerate(self.periods):
+            total = {}
+            groups = []
+            for row, key in enumerate(self.keys):
+                offset = self._offset(position, row, 0)
+                amounts = self.values[offset:offset + width]
+                metrics = {
+                    metric: {'Amount': amount_text(amount), 'Unit': self.units[metric]}
+                    for metric, amount in zip(self.metrics, amounts)
+                }
+                if key == TOTAL_KEY:
+                    total = metrics
+                elif any(amounts):
+                    groups.append({'Keys': list(key), 'Metrics': metrics})
+            yield {
+                'TimePeriod': {'Start': start, 'End': end},
+                'Total': total,
+                'Groups': groups,
+                'Estimated': self.estimated[position]
+            }
+
+    def iter_rows(self, group_count: int = 0) -> Iterator[Tuple[Any, ...]]:
+        """
+        Yield the rows flatten_periods() would yield for iter_periods().
+
+        Amounts are converted to floats a period at a time, straight from
+        the table, rather than being formatted and parsed again.
+
+        Args:
+            group_count: Number of group key columns
+
+        Yields:
+            (start, end, *group_keys, metric, amount, unit, estimated) tuples
+        """
+        width = len(self.metrics)
+        no_keys = ('',) * group_count
+        prefixes = [tuple(key[:group_count]) + no_keys[len(key):] for key in self.keys]
+        units = [self.units[metric] for metric in self.metrics]
+        total_row = self._key_index.get(TOTAL_KEY)
+        group_rows = [row for row, key in enumerate(self.keys) if key != TOTAL_KEY]
+        block = len(self.keys) * width
+        for position, (start, end) in enumerate(self.periods):
+            estimated = self.estimated[position]
+            amounts = to_floats(self.values[position * block:(position + 1) * block])
+            rows = [row for row in group_rows if any(amounts[row * width:(row + 1) * width])]
+            if not rows and total_row is not None:
+                rows = [total_row]
+            for row in rows:
+                prefix = (start, end) + prefixes[row]
+                for metric, amount, unit in zip(self.metrics, amounts[row * width:(row + 1) * width], units):
+                    yield prefix + (metric, amount, unit, estimated)
+
+    def to_numpy(self) -> Any:
+        """
+        Return the amounts as a NumPy float64 array of shape (periods, keys, metrics).
+
+        The amounts are divided by SCALE, so this is a new array rather than
+        a view of the table; ``numpy.frombuffer(table.values, numpy.int64)``
+        views the 10^-8 units themselves without copying.
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        import numpy
+
+        dtype = numpy.int64 if self.values.typecode == 'q' else numpy.float64
+        return numpy.frombuffer(self.values, dtype=dtype).reshape(
+            len(self.periods), len(self.keys), len(self.metrics)
+        ) / SCALE
+
+    def __len__(self) -> int:
+        return len(self.periods)
+
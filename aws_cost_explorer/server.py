@@ -0,0 +1,349 @@
+"""Local HTTP server answering cost queries from warm clients."""
+
+import collections
+import io
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from aws_cost_explorer.cache import ResponseCache, make_cache_key
+from aws_cost_explorer.cost_client import CostExplorerClient
+from aws_cost_explorer.date_utils import check_hourly_start, get_date_range
+from aws_cost_explorer.formatters import get_formatter
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+DEFAULT_HOT_ENTRIES = 256
+DEFAULT_HOT_TTL = 300
+
+CONTENT_TYPES = {
+    'pretty': 'text/plain; charset=utf-8',
+    'json': 'application/json',
+    'jsonl': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+    'arrow': 'application/vnd.apache.arrow.stream',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+class HotCache:
+    """
+    Small in-memory LRU of rendered query results.
+
+    Entries expire after ``ttl`` seconds so estimated data is refreshed, and
+    the least recently used entry is dropped once ``max_entries`` is reached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_HOT_ENTRIES,
+        ttl: float = DEFAULT_HOT_TTL,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of results kept
+            ttl: Seconds a result is served before it is fetched again
+            clock: Function returning the current time in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a fresh cached value, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.clock() - stored_at >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = (self.clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class QueryError(ValueError):
+    """Raised for invalid query parameters."""
+
+
+def parse_query(params: Dict[str, List[str]]) -> Tuple[Optional[str], str, Dict[str, Any]]:
+    """
+    Convert URL query parameters into client arguments.
+
+    Accepted parameters mirror the command line: start, end, days, month,
+    previous_month, profile, granularity, group_by (repeatable), filter (JSON)
+    and output.
+
+    Args:
+        params: Parsed query string, as from urllib.parse.parse_qs()
+
+    Returns:
+        (profile, output format, get_cost_and_usage() keyword arguments)
+
+    Raises:
+        QueryError: If a parameter is invalid
+    """
+    def single(name):
+        values = params.get(name)
+        return values[-1] if values else None
+
+    def flag(name):
+        return (single(name) or '').lower() in ('1', 'true', 'yes')
+
+    try:
+        days = int(single('days')) if single('days') else None
+        filter_expression = json.loads(single('filter')) if single('filter') else None
+    except ValueError as error:
+        raise QueryError(f"Invalid query parameter: {error}")
+
+    granularity = (single('granularity') or 'DAILY').upper()
+    if granularity not in ('DAILY', 'MONTHLY', 'HOURLY'):
+        raise QueryError(f"Invalid granularity: {granularity}. Valid values: DAILY, MONTHLY, HOURLY")
+
+    group_by = params.get('group_by') or None
+    if group_by and len(group_by) > 2:
+        raise QueryError("group_by may be given at most twice")
+
+    output = single('output') or 'json'
+    if output not in CONTENT_TYPES:
+        raise QueryError(f"Invalid output: {output}. Valid values: {', '.join(CONTENT_TYPES)}")
+
+    try:
+        start_date, end_date = get_date_range(
+            start_date=single('start'),
+            end_date=single('end'),
+            days=days,
+            month=flag('month'),
+            previous_month=flag('previous_month'),
+            hourly=granularity == 'HOURLY'
+        )
+        if granularity == 'HOURLY':
+            check_hourly_start(start_date)
+    except ValueError as error:
+        raise QueryError(str(error))
+
+    query = {
+        'start_date': start_date,
+        'end_date': end_date,
+        'granularity': granularity,
+        'group_by': group_by,
+        'filter_expression': filter_expression
+    }
+    return single('profile'), output, query
+
+
+class CostServer(ThreadingHTTPServer):
+    """
+    HTTP server keeping one warm CostExplorerClient per profile.
+
+    GET /costs answers a query with the formatter output, from the hot
+    cache when the same query was answered recently. GET /stats reports
+    request counts and latencies. Every response carries an
+    X-Response-Time-Ms header and X-Cache (hit or miss) for /costs.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = (DEFAULT_HOST, DEFAULT_PORT),
+        cache: Optional[ResponseCache] = None,
+        hot_cache: Optional[HotCache] = None,
+        client_factory: Optional[Callable[[Optional[str]], CostExplorerClient]] = None,
+        log_stream: Any = None
+    ):
+        """
+        Initialize and bind the server.
+
+        Args:
+            address: (host, port) to listen on; port 0 picks a free port
+            cache: On-disk response cache shared by all clients
+            hot_cache: In-memory cache of rendered results
+            client_factory: Callable creating a client for a profile name
+                (defaults to CostExplorerClient)
+            log_stream: Stream for the access log (defaults to sys.stderr;
+                pass io.StringIO() to silence it)
+        """
+        super().__init__(address, CostRequestHandler)
+        self.cache = cache
+        self.hot_cache = hot_cache if hot_cache is not None else HotCache()
+        self.client_factory = client_factory or self._create_client
+        self.log_stream = log_stream or sys.stderr
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'hits': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+
+    def _create_client(self, profile: Optional[str]) -> CostExplorerClient:
+        return CostExplorerClient(profile=profile, cache=self.cache)
+
+    def get_client(self, profile: Optional[str]) -> CostExplorerClient:
+        """
+        Return the warm client for a profile, creating it on first use.
+
+        Clients build their boto3 session and Cost Explorer client lazily;
+        a new client's are built here, under the lock, since boto3 sessions
+        must not be created from several handler threads at once.
+        """
+        with self._clients_lock:
+            if profile not in self._clients:
+                client = self.client_factory(profile)
+                client.ce_client
+                self._clients[profile] = client
+            return self._clients[profile]
+
+    def warm(self, profiles: Iterable[Optional[str]]) -> None:
+        """
+        Create clients for profiles ahead of the first request.
+
+        This imports boto3 and resolves each profile's credentials before
+        the server starts answering.
+        """
+        for profile in profiles:
+            self.get_client(profile)
+
+    def record(self, milliseconds: float, hit: bool = False, error: bool = False) -> None:
+        """Add one request to the statistics."""
+        with self._stats_lock:
+            self.stats['requests'] += 1
+            self.stats['hits'] += int(hit)
+            self.stats['errors'] += int(error)
+            self.stats['total_ms'] += milliseconds
+            self.stats['max_ms'] = max(self.stats['max_ms'], milliseconds)
+
+    def stats_snapshot(self) -> Dict[str, Any]:
+        """Return the statistics with the mean latency and cache size."""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['mean_ms'] = stats['total_ms'] / stats['requests'] if stats['requests'] else 0.0
+        stats['hot_entries'] = len(self.hot_cache)
+        stats['profiles'] = [profile or 'default' for profile in self._clients]
+        return stats
+
+
+class CostRequestHandler(BaseHTTPRequestHandler):
+    """Request handler for CostServer."""
+
+    server_version = 'aws-cost-explorer'
+
+    def do_GET(self) -> None:
+        """Dispatch GET requests by path."""
+        started = time.perf_counter()
+        url = urlsplit(self.path)
+        if url.path == '/costs':
+            self._handle_costs(parse_qs(url.query), started)
+        elif url.path == '/stats':
+            self._send(200, 'application/json', json.dumps(self.server.stats_snapshot()).encode('utf-8'), started)
+        else:
+            self._send(404, 'text/plain; charset=utf-8', b'Not found\n', started)
+
+    def _handle_costs(self, params: Dict[str, List[str]], started: float) -> None:
+        """Answer a cost query from the hot cache or a warm client."""
+        try:
+            profile, output, query = parse_query(params)
+        except QueryError as error:
+            self._send(400, 'text/plain; charset=utf-8', f"{error}\n".encode('utf-8'), started, error=True)
+            return
+
+        key = make_cache_key(profile or 'default', dict(query, output=output))
+        body = self.server.hot_cache.get(key)
+        if body is not None:
+            self._send(200, CONTENT_TYPES[output], body, started, hit=True)
+            return
+
+        try:
+            response = self.server.get_client(profile).get_cost_and_usage(**query)
+        except Exception as error:
+            message = str(error) or type(error).__name__
+            self._send(502, 'text/plain; charset=utf-8', f"{message}\n".encode('utf-8'), started, error=True)
+            return
+
+        formatter = get_formatter(output)
+        if formatter.binary:
+            buffer = io.BytesIO()
+            formatter.output(response, buffer)
+            body = buffer.getvalue()
+        else:
+            body = formatter.format(response).encode('utf-8')
+        self.server.hot_cache.put(key, body)
+        self._send(200, CONTENT_TYPES[output], body, started, hit=False)
+
+    def _send(
+        self,
+        status: int,
+        content_type: str,
+        body: bytes,
+        started: float,
+        hit: Optional[bool] = None,
+        error: bool = False
+    ) -> None:
+        """Write a response with latency headers and record it."""
+        milliseconds = (time.perf_counter() - started) * 1000
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('X-Response-Time-Ms', f"{milliseconds:.3f}")
+        if hit is not None:
+            self.send_header('X-Cache', 'hit' if hit else 'miss')
+        self.end_headers()
+        self.wfile.write(body)
+
+        self.log_message('"%s" %d %d %.3fms', self.requestline, status, len(body), milliseconds)
+        if hit is not None or error:
+            self.server.record(milliseconds, hit=bool(hit), error=error)
+
+    def log_request(self, code: Any = '-', size: Any = '-') -> None:
+        """Skip the default access log; _send() logs with the latency."""
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Write log lines to the server's log stream."""
+        self.server.log_stream.write(f"{self.address_string()} - {format % args}\n")
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    profiles: Iterable[Optional[str]] = (None,),
+    cache: Optional[ResponseCache] = None
+) -> None:
+    """
+    Run a CostServer until interrupted.
+
+    Args:
+        host: Interface to listen on
+        port: Port to listen on
+        profiles: Profiles whose clients are created at startup
+        cache: On-disk response cache shared by all clients
+    """
+    server = CostServer((host, port), cache=cache)
+    server.warm(profiles)
+    server.log_stream.write(f"Serving cost queries on http://{host}:{server.server_address[1]}/costs\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,91 @@
+"""Unit tests for the aggregation module."""
+
+import unittest
+from array import array
+
+from aws_cost_explorer.aggregation import (
+    cumulative, group_totals, moving_average, period_over_period, resample, top_n
+)
+from aws_cost_explorer.results import CostTable
+
+
+def make_daily_response(days, services):
+    """Build a DAILY response with one group per service.
+
+    Day N of the range costs N + 1 for the first service, twice that for
+    the second, and so on.
+    """
+    periods = []
+    for index, (start, end) in enumerate(days):
+        periods.append({
+            'TimePeriod': {'Start': start, 'End': end},
+            'Total': {},
+            'Groups': [
+                {'Keys': [service], 'Metrics': {'BlendedCost': {'Amount': str((index + 1) * (position + 1)), 'Unit': 'USD'}}}
+                for position, service in enumerate(services)
+            ],
+            'Estimated': start >= '2023-02-01'
+        })
+    return {'ResultsByTime': periods}
+
+
+class TestAggregation(unittest.TestCase):
+    """Test the aggregation functions."""
+
+    def setUp(self):
+        """Set up five days spanning a month boundary for two services."""
+        days = [
+            ('2023-01-29', '2023-01-30'), ('2023-01-30', '2023-01-31'), ('2023-01-31', '2023-02-01'),
+            ('2023-02-01', '2023-02-02'), ('2023-02-02', '2023-02-03')
+        ]
+        self.table = CostTable.from_response(make_daily_response(days, ['EC2', 'S3']))
+
+    def test_resample_monthly(self):
+        """Test rolling days up into calendar months."""
+        monthly = resample(self.table, 'MONTHLY')
+
+        self.assertEqual(monthly.periods, [('2023-01-29', '2023-02-01'), ('2023-02-01', '2023-02-03')])
+        self.assertEqual(monthly.estimated, [False, True])
+        self.assertEqual(list(monthly.series(('EC2',), 'BlendedCost')), [6.0, 9.0])
+        self.assertEqual(list(monthly.series(('S3',), 'BlendedCost')), [12.0, 18.0])
+
+    def test_resample_weekly(self):
+        """Test rolling days up into weeks starting on Monday."""
+        weekly = resample(self.table, 'WEEKLY')
+
+        # 2023-01-29 is a Sunday; 2023-01-30 starts a new week
+        self.assertEqual(weekly.periods, [('2023-01-29', '2023-01-30'), ('2023-01-30', '2023-02-03')])
+        self.assertEqual(list(weekly.period_totals('BlendedCost')), [3.0, 42.0])
+        with self.assertRaises(ValueError):
+            resample(self.table, 'YEARLY')
+
+    def test_resample_hourly_to_daily(self):
+        """Test rolling HOURLY periods up into days."""
+        hours = [
+            ('2023-01-31T22:00:00Z', '2023-01-31T23:00:00Z'), ('2023-01-31T23:00:00Z', '2023-02-01T00:00:00Z'),
+            ('2023-02-01T00:00:00Z', '2023-02-01T01:00:00Z')
+        ]
+        daily = resample(CostTable.from_response(make_daily_response(hours, ['EC2'])), 'DAILY')
+
+        self.assertEqual(daily.periods, [('2023-01-31T22:00:00Z', '2023-02-01T00:00:00Z'),
+                                         ('2023-02-01T00:00:00Z', '2023-02-01T01:00:00Z')])
+        self.assertEqual(list(daily.series(('EC2',), 'BlendedCost')), [3.0, 3.0])
+
+    def test_group_totals_and_top_n(self):
+        """Test ranking groups by total."""
+        self.assertEqual(group_totals(self.table, 'BlendedCost'), [(('S3',), 30.0), (('EC2',), 15.0)])
+        self.assertEqual(top_n(self.table, 'BlendedCost', 1), [(('S3',), 30.0)])
+
+    def test_series_functions(self):
+        """Test cumulative sums, moving averages and period-over-period change."""
+        series = array('d', [2.0, 4.0, 0.0, 6.0])
+
+        self.assertEqual(list(cumulative(series)), [2.0, 6.0, 6.0, 12.0])
+        self.assertEqual(list(moving_average(series, 2)), [2.0, 3.0, 2.0, 3.0])
+        self.assertEqual(period_over_period(series), [(None, None), (2.0, 100.0), (-4.0, -100.0), (6.0, None)])
+        with self.assertRaises(ValueError):
+            moving_average(series, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
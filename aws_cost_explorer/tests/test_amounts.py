@@ -0,0 +1,82 @@
+"""Unit tests for the amounts module."""
+
+import unittest
+
+from aws_cost_explorer.amounts import (
+    SCALE, UnitTable, add_amount_arrays, amount_text, format_amount, format_amounts, parse_amount, parse_amounts
+)
+
+
+class TestParsing(unittest.TestCase):
+    """Test parsing Amount strings into 10^-8 units."""
+
+    def test_parse_amount(self):
+        """Test exact parsing and rounding past the eighth decimal place."""
+        self.assertEqual(parse_amount('12.34'), 1234000000)
+        self.assertEqual(parse_amount('-0.00000001'), -1)
+        self.assertEqual(parse_amount('0.1234567891'), 12345679)
+        self.assertEqual(parse_amount('1e-3'), 100000)
+        self.assertEqual(parse_amount('123456789012345.6789'), 12345678901234567890000)
+        for text in ('', 'abc', 'nan', 'inf'):
+            with self.assertRaises(ValueError):
+                parse_amount(text)
+
+    def test_parse_amounts(self):
+        """Test that batches match parse_amount() and widen past the int64 range."""
+        texts = ['0.1', '0.2', '36.0', '1.2345678951']
+        amounts = parse_amounts(texts)
+
+        self.assertEqual(amounts.typecode, 'q')
+        self.assertEqual(list(amounts), [parse_amount(text) for text in texts])
+        self.assertEqual(sum(amounts[:2]), parse_amount('0.3'))
+
+        large = parse_amounts(['0.5', '123456789012.25'])
+        self.assertEqual(large.typecode, 'd')
+        self.assertAlmostEqual(float(amount_text(large[1])), 123456789012.25, places=3)
+        self.assertEqual(add_amount_arrays(amounts[:2], amounts[2:]).tolist(), [3610000000, 143456790])
+        with self.assertRaises(ValueError):
+            parse_amounts(['1', 'one'])
+
+
+class TestFormatting(unittest.TestCase):
+    """Test formatting 10^-8 units as decimal strings."""
+
+    def test_amount_text(self):
+        """Test exact round trips through amount_text()."""
+        for text in ('0.0', '36.0', '1.5', '-0.00000001', '12345.67891234'):
+            self.assertEqual(amount_text(parse_amount(text)), text)
+        self.assertEqual(amount_text(7 * SCALE), '7.0')
+
+    def test_format_amount(self):
+        """Test half-even rounding to fixed decimal places."""
+        self.assertEqual(format_amount(parse_amount('2.675')), '2.68')
+        self.assertEqual(format_amount(parse_amount('2.665')), '2.66')
+        self.assertEqual(format_amount(parse_amount('-0.004')), '0.00')
+        self.assertEqual(format_amount(parse_amount('-1234.5'), places=0), '-1234')
+        self.assertEqual(format_amount(parse_amount('0.05'), places=1), '0.0')
+        self.assertEqual(format_amount(parse_amount('123456789.125')), '123456789.12')
+
+    def test_format_amounts(self):
+        """Test that batches are formatted as each amount would be."""
+        texts = ['2.675', '2.665', '-0.004', '-1234.5', '123456789.125']
+        self.assertEqual(format_amounts(parse_amounts(texts)), [format_amount(parse_amount(text)) for text in texts])
+        self.assertEqual(format_amounts(parse_amounts(['1.25']), places=1), ['1.2'])
+        self.assertEqual(format_amounts(parse_amounts([])), [])
+
+
+class TestUnitTable(unittest.TestCase):
+    """Test the UnitTable class."""
+
+    def test_interning(self):
+        """Test that each unit gets one shared copy."""
+        units = UnitTable()
+        usd = ''.join(['U', 'SD'])
+
+        first = units.intern('USD')
+        units.intern('N/A')
+        self.assertIs(units.intern(usd), first)
+        self.assertEqual(len(units), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Unit tests for the anomalies module."""
+
+import datetime
+import os
+import statistics
+import tempfile
+import unittest
+
+from aws_cost_explorer.anomalies import AnomalyDetector, SeriesState
+from aws_cost_explorer.results import CostTable
+
+
+def make_table(amounts, start='2023-01-02', service='EC2', estimated_days=0):
+    """Build a one-service DAILY table with the given daily amounts, the last estimated_days of them Estimated."""
+    first = datetime.date(*map(int, start.split('-')))
+    periods = []
+    for offset, amount in enumerate(amounts):
+        day = first + datetime.timedelta(days=offset)
+        periods.append({
+            'TimePeriod': {'Start': day.isoformat(), 'End': (day + datetime.timedelta(days=1)).isoformat()},
+            'Total': {},
+            'Groups': [{'Keys': [service], 'Metrics': {'BlendedCost': {'Amount': str(amount), 'Unit': 'USD'}}}],
+            'Estimated': offset >= len(amounts) - estimated_days
+        })
+    return CostTable.from_periods(periods)
+
+
+class TestSeriesState(unittest.TestCase):
+    """Test the incremental statistics."""
+
+    def test_rolling_and_weekday_statistics(self):
+        """Test that running statistics match a full recomputation."""
+        values = [10.0, 12.0, 9.0, 15.0, 11.0, 13.0, 8.0, 14.0, 10.0, 12.0]
+        state = SeriesState(window=5)
+        for index, value in enumerate(values):
+            state.update(value, index % 7)
+
+        mean, deviation = state.baselines(0)['rolling']
+        self.assertAlmostEqual(mean, statistics.mean(values[-5:]))
+        self.assertAlmostEqual(deviation, statistics.stdev(values[-5:]))
+
+        state = SeriesState()
+        for value in [10.0, 20.0, 30.0]:
+            state.update(value, 2)
+        self.assertEqual(state.baselines(2)['weekday'], (20.0, 10.0))
+        self.assertNotIn('weekday', state.baselines(3))
+
+    def test_round_trip(self):
+        """Test that a restored state continues identically."""
+        state = SeriesState()
+        for index in range(40):
+            state.update(float(index % 5), index % 7)
+
+        restored = SeriesState.from_dict(state.to_dict())
+        self.assertEqual(restored.baselines(4), state.baselines(4))
+
+
+class TestAnomalyDetector(unittest.TestCase):
+    """Test the AnomalyDetector class."""
+
+    def test_detects_spike(self):
+        """Test that a spike after steady spending is flagged."""
+        detector = AnomalyDetector()
+        anomalies = detector.detect(make_table([100, 102, 98, 101, 99, 100, 103, 97, 100, 250]))
+
+        self.assertEqual(len(anomalies), 1)
+        anomaly = anomalies[0]
+        self.assertEqual(anomaly['Date'], '2023-01-11')
+        self.assertEqual(anomaly['Keys'], ['EC2'])
+        self.assertEqual(anomaly['Amount'], 250.0)
+        self.assertGreater(anomaly['ZScore'], 3)
+        self.assertIn('rolling', anomaly['Methods'])
+
+    def test_state_is_incremental(self):
+        """Test that saved state carries over and seen days are skipped."""
+        history = [100, 102, 98, 101, 99, 100, 103, 97, 100, 101]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'state.json')
+            detector = AnomalyDetector.load(path)
+            self.assertEqual(detector.detect(make_table(history)), [])
+            detector.save(path)
+
+            # Re-running over the same days plus one new spike only scores the new day
+            detector = AnomalyDetector.load(path)
+            anomalies = detector.detect(make_table(history + [300]))
+            self.assertEqual([anomaly['Date'] for anomaly in anomalies], ['2023-01-12'])
+            self.assertEqual(detector.series[next(iter(detector.series))].count, 11)
+
+    def test_estimated_days_are_not_committed(self):
+        """Test that a partial day is scored again once its final amount is known."""
+        history = [100, 102, 98, 101, 99, 100, 103, 97, 100, 101]
+        detector = AnomalyDetector()
+        detector.detect(make_table(history))
+        state = next(iter(detector.series.values()))
+
+        anomalies = detector.detect(make_table(history + [12], estimated_days=1))
+        self.assertEqual([anomaly['Estimated'] for anomaly in anomalies], [True])
+        self.assertEqual((state.count, state.last_date), (10, '2023-01-11'))
+
+        self.assertEqual(detector.detect(make_table(history + [101])), [])
+        self.assertEqual((state.count, state.last_date), (11, '2023-01-12'))
+        self.assertEqual(list(state.recent)[-1], 101.0)
+        self.assertNotIn(12.0, state.recent)
+
+    def test_namespaces_are_separate(self):
+        """Test that series from different namespaces do not share history."""
+        detector = AnomalyDetector()
+        detector.detect(make_table([100] * 10), namespace='prod')
+        self.assertEqual(detector.detect(make_table([100, 100, 500]), namespace='dev'), [])
+        self.assertEqual(len(detector.series), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Unit tests for the async_client module."""
+
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from aws_cost_explorer.async_client import AsyncCostExplorerClient
+from aws_cost_explorer.cost_client import CostExplorerClient
+
+
+def make_client(get_cost_and_usage):
+    """Build a CostExplorerClient around a fake ce_client method."""
+    session = MagicMock()
+    session.client.return_value.get_cost_and_usage.side_effect = get_cost_and_usage
+    return CostExplorerClient(session=session)
+
+
+class TestAsyncCostExplorerClient(unittest.TestCase):
+    """Test the AsyncCostExplorerClient class."""
+
+    def test_identical_in_flight_queries_are_coalesced(self):
+        """Test that concurrent identical queries make one upstream call."""
+        release = threading.Event()
+        calls = []
+
+        def get_cost_and_usage(**kwargs):
+            calls.append(kwargs)
+            release.wait(5)
+            return {'ResultsByTime': [], 'Granularity': kwargs['Granularity']}
+
+        async def run():
+            async with AsyncCostExplorerClient(make_client(get_cost_and_usage)) as client:
+                query = {'start_date': '2023-01-01', 'end_date': '2023-01-02'}
+                tasks = [asyncio.ensure_future(client.get_cost_and_usage(**query)) for _ in range(3)]
+                other = asyncio.ensure_future(client.get_cost_and_usage(granularity='MONTHLY', **query))
+                await asyncio.sleep(0.05)
+                release.set()
+                return await asyncio.gather(*tasks, other)
+
+        results = asyncio.run(run())
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual([result['Granularity'] for result in results], ['DAILY'] * 3 + ['MONTHLY'])
+
+    def test_event_loop_is_not_blocked(self):
+        """Test that other coroutines run while a query is in progress."""
+        release = threading.Event()
+
+        def get_cost_and_usage(**kwargs):
+            release.wait(5)
+            return {'ResultsByTime': []}
+
+        async def run():
+            async with AsyncCostExplorerClient(make_client(get_cost_and_usage)) as client:
+                query = asyncio.ensure_future(client.get_cost_and_usage())
+                await asyncio.sleep(0.01)
+                self.assertFalse(query.done())
+                release.set()
+                return await query
+
+        self.assertEqual(asyncio.run(run()), {'ResultsByTime': []})
+
+    def test_iter_cost_and_usage_follows_pages(self):
+        """Test async iteration across result pages."""
+        pages = [
+            {'ResultsByTime': [{'TimePeriod': {'Start': '2023-01-01', 'End': '2023-01-02'}}], 'NextPageToken': 't'},
+            {'ResultsByTime': [{'TimePeriod': {'Start': '2023-01-02', 'End': '2023-01-03'}}]}
+        ]
+
+        async def run():
+            async with AsyncCostExplorerClient(make_client(pages)) as client:
+                return [period['TimePeriod']['Start'] async for period in client.iter_cost_and_usage()]
+
+        self.assertEqual(asyncio.run(run()), ['2023-01-01', '2023-01-02'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+"""Unit tests for the cache module."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from aws_cost_explorer.benchmarks import loaded_heavy_modules
+from aws_cost_explorer.cache import ResponseCache, is_estimated, make_cache_key
+from aws_cost_explorer.cost_client import CostExplorerClient
+
+
+class FakeClock:
+    """Manually advanced clock for expiry tests."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test the ResponseCache class."""
+
+    def setUp(self):
+        """Set up an in-memory cache with a controllable clock."""
+        self.clock = FakeClock()
+        self.cache = ResponseCache(path=':memory:', ttl=60, clock=self.clock)
+
+    def test_make_cache_key_is_order_independent(self):
+        """Test that dict ordering does not change the key."""
+        first = make_cache_key('prod', {'Granularity': 'DAILY', 'Metrics': ['BlendedCost']})
+        second = make_cache_key('prod', {'Metrics': ['BlendedCost'], 'Granularity': 'DAILY'})
+        other = make_cache_key('dev', {'Granularity': 'DAILY', 'Metrics': ['BlendedCost']})
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+    def test_is_estimated(self):
+        """Test detection of estimated periods."""
+        self.assertTrue(is_estimated({'ResultsByTime': [{'Estimated': False}, {'Estimated': True}]}))
+        self.assertFalse(is_estimated({'ResultsByTime': [{'Estimated': False}]}))
+
+    def test_estimated_entries_expire(self):
+        """Test that only estimated entries are subject to the TTL."""
+        self.cache.put('final', {'value': 1}, estimated=False)
+        self.cache.put('estimate', {'value': 2}, estimated=True)
+
+        self.clock.now += 61
+
+        self.assertEqual(self.cache.get('final'), {'value': 1})
+        self.assertIsNone(self.cache.get('estimate'))
+        self.assertEqual(len(self.cache), 1)
+
+    def test_lru_eviction(self):
+        """Test that least recently used entries are evicted first."""
+        cache = ResponseCache(path=':memory:', max_bytes=30, clock=self.clock)
+        cache.put('a', 'x' * 10, estimated=False)
+        self.clock.now += 1
+        cache.put('b', 'y' * 10, estimated=False)
+        self.clock.now += 1
+        cache.get('a')
+        self.clock.now += 1
+        cache.put('c', 'z' * 10, estimated=False)
+
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+
+    @patch('boto3.Session')
+    def test_client_uses_cache(self, mock_session):
+        """Test that a cached response avoids a second API call."""
+        mock_ce_client = MagicMock()
+        mock_session.return_value.client.return_value = mock_ce_client
+        mock_ce_client.get_cost_and_usage.return_value = {
+            'ResultsByTime': [{'TimePeriod': {'Start': '2023-01-01', 'End': '2023-01-02'}, 'Estimated': False}]
+        }
+
+        client = CostExplorerClient(cache=self.cache)
+        first = client.get_cost_and_usage(start_date='2023-01-01', end_date='2023-01-02')
+        second = client.get_cost_and_usage(start_date='2023-01-01', end_date='2023-01-02')
+
+        self.assertEqual(first, second)
+        mock_ce_client.get_cost_and_usage.assert_called_once()
+
+    @patch('boto3.Session')
+    def test_client_fetches_only_uncached_periods(self, mock_session):
+        """Test that extending a cached range fetches just the new days."""
+        def fake_get_cost_and_usage(**kwargs):
+            start = int(kwargs['TimePeriod']['Start'][-2:])
+            end = int(kwargs['TimePeriod']['End'][-2:])
+            return {'ResultsByTime': [
+                {'TimePeriod': {'Start': f'2023-01-{day:02d}', 'End': f'2023-01-{day + 1:02d}'}, 'Estimated': False}
+                for day in range(start, end)
+            ]}
+
+        mock_ce_client = MagicMock()
+        mock_session.return_value.client.return_value = mock_ce_client
+        mock_ce_client.get_cost_and_usage.side_effect = fake_get_cost_and_usage
+
+        client = CostExplorerClient(cache=self.cache)
+        client.get_cost_and_usage(start_date='2023-01-02', end_date='2023-01-05')
+        result = client.get_cost_and_usage(start_date='2023-01-01', end_date='2023-01-07')
+
+        self.assertEqual(
+            [period['TimePeriod']['Start'] for period in result['ResultsByTime']],
+            ['2023-01-01', '2023-01-02', '2023-01-03', '2023-01-04', '2023-01-05', '2023-01-06']
+        )
+        requested = [call[1]['TimePeriod'] for call in mock_ce_client.get_cost_and_usage.call_args_list]
+        self.assertEqual(requested, [
+            {'Start': '2023-01-02', 'End': '2023-01-05'},
+            {'Start': '2023-01-01', 'End': '2023-01-02'},
+            {'Start': '2023-01-05', 'End': '2023-01-07'}
+        ])
+
+    @patch('boto3.Session')
+    def test_cached_responses_keep_dimension_value_attributes(self, mock_session):
+        """Test that DimensionValueAttributes are the same with and without cache hits."""
+        attributes = [
+            {'Value': '111111111111', 'Attributes': {'description': 'prod'}},
+            {'Value': '222222222222', 'Attributes': {'description': 'dev'}}
+        ]
+
+        def fake_get_cost_and_usage(**kwargs):
+            start = int(kwargs['TimePeriod']['Start'][-2:])
+            end = int(kwargs['TimePeriod']['End'][-2:])
+            return {
+                'ResultsByTime': [
+                    {
+                        'TimePeriod': {'Start': f'2023-01-{day:02d}', 'End': f'2023-01-{day + 1:02d}'},
+                        'Total': {},
+                        'Groups': [{'Keys': [attributes[day % 2]['Value']], 'Metrics': {}}],
+                        'Estimated': False
+                    }
+                    for day in range(start, end)
+                ],
+                'DimensionValueAttributes': [attributes[day % 2] for day in range(start, min(end, start + 2))]
+            }
+
+        mock_ce_client = MagicMock()
+        mock_session.return_value.client.return_value = mock_ce_client
+        mock_ce_client.get_cost_and_usage.side_effect = fake_get_cost_and_usage
+
+        uncached = CostExplorerClient().get_cost_and_usage(
+            start_date='2023-01-01', end_date='2023-01-04', group_by=['LINKED_ACCOUNT']
+        )
+        client = CostExplorerClient(cache=self.cache)
+        client.get_cost_and_usage(start_date='2023-01-02', end_date='2023-01-02', group_by=['LINKED_ACCOUNT'])
+        cached = client.get_cost_and_usage(start_date='2023-01-01', end_date='2023-01-04', group_by=['LINKED_ACCOUNT'])
+
+        self.assertEqual(cached['ResultsByTime'], uncached['ResultsByTime'])
+        self.assertCountEqual(cached['DimensionValueAttributes'], attributes)
+        self.assertCountEqual(uncached['DimensionValueAttributes'], attributes)
+        self.assertNotIn('DimensionValueAttributes', cached['ResultsByTime'][1])
+
+    def test_cache_hits_do_not_import_boto3(self):
+        """Test that a fully cached query never imports boto3."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.sqlite')
+            code = (
+                "from aws_cost_explorer.cache import ResponseCache\n"
+                "from aws_cost_explorer.cost_client import CostExplorerClient\n"
+                "from aws_cost_explorer.fake_backend import FakeSession\n"
+                f"cache = ResponseCache({path!r})\n"
+                "query = dict(start_date='2023-01-01', end_date='2023-01-04', group_by=['SERVICE'])\n"
+                "CostExplorerClient(profile='prod', session=FakeSession(), cache=cache).get_cost_and_usage(**query)\n"
+                "CostExplorerClient(profile='prod', cache=cache).get_cost_and_usage(**query)"
+            )
+            self.assertEqual(loaded_heavy_modules(code), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
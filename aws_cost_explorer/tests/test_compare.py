@@ -0,0 +1,112 @@
+"""Unit tests for the compare module."""
+
+import datetime
+import unittest
+
+from aws_cost_explorer.cache import ResponseCache
+from aws_cost_explorer.compare import compare_costs, comparison_ranges
+from aws_cost_explorer.cost_client import CostExplorerClient
+from aws_cost_explorer.fake_backend import FakeCostExplorer, FakeSession
+from aws_cost_explorer.throttling import RateLimiter, Throttler
+
+
+class TestComparisonRanges(unittest.TestCase):
+    """Test comparison_ranges()."""
+
+    def test_month(self):
+        """Test this month to date against the whole previous month."""
+        self.assertEqual(
+            comparison_ranges('month', today=datetime.date(2023, 6, 10)),
+            (('2023-06-01', '2023-06-11'), ('2023-05-01', '2023-06-01'))
+        )
+
+    def test_week_year_over_year(self):
+        """Test this week against the same weekdays a year earlier."""
+        current, previous = comparison_ranges('week-yoy', today=datetime.date(2023, 6, 14))
+
+        self.assertEqual(current, ('2023-06-12', '2023-06-15'))
+        self.assertEqual(previous, ('2022-06-13', '2022-06-16'))
+        self.assertEqual(datetime.date(2022, 6, 13).weekday(), 0)
+
+    def test_previous(self):
+        """Test a range against the range of the same length before it."""
+        self.assertEqual(
+            comparison_ranges('previous', days=7, today=datetime.date(2023, 6, 14)),
+            (('2023-06-07', '2023-06-15'), ('2023-05-30', '2023-06-07'))
+        )
+        self.assertEqual(
+            comparison_ranges('previous', start_date='2023-06-01', end_date='2023-06-10'),
+            (('2023-06-01', '2023-06-11'), ('2023-05-22', '2023-06-01'))
+        )
+        with self.assertRaises(ValueError):
+            comparison_ranges('quarter')
+
+
+class TestCompareCosts(unittest.TestCase):
+    """Test compare_costs()."""
+
+    def setUp(self):
+        """Set up a client backed by a fake Cost Explorer."""
+        self.backend = FakeCostExplorer(groups=3)
+        self.client = CostExplorerClient(
+            session=FakeSession(self.backend),
+            cache=ResponseCache(':memory:'),
+            throttler=Throttler(limiter=RateLimiter(rate=10000, burst=10000))
+        )
+
+    def monthly_totals(self, start_date, end_date, metric):
+        """Sum a metric per service over a range with a direct query."""
+        response = self.client.get_cost_and_usage(
+            start_date=start_date, end_date=end_date, granularity='MONTHLY', metrics=[metric], group_by=['SERVICE']
+        )
+        totals = {}
+        for period in response['ResultsByTime']:
+            for group in period['Groups']:
+                key = group['Keys'][0]
+                totals[key] = totals.get(key, 0.0) + float(group['Metrics'][metric]['Amount'])
+        return totals
+
+    def test_month_over_month_is_one_query(self):
+        """Test per-group deltas from a single query over both ranges."""
+        result = compare_costs(
+            self.client, ('2023-06-01', '2023-06-11'), ('2023-05-01', '2023-06-01'), group_by=['SERVICE']
+        )['Comparison']
+
+        self.assertEqual(len(self.backend.calls), 1)
+        self.assertEqual(self.backend.calls[0]['TimePeriod'], {'Start': '2023-05-01', 'End': '2023-06-11'})
+        self.assertEqual(result['Current'], {'Start': '2023-06-01', 'End': '2023-06-11', 'Estimated': False})
+        self.assertEqual(result['Metrics'], ['BlendedCost', 'UnblendedCost', 'UsageQuantity'])
+
+        current = self.monthly_totals('2023-06-01', '2023-06-11', 'UnblendedCost')
+        previous = self.monthly_totals('2023-05-01', '2023-06-01', 'UnblendedCost')
+        for group in result['Groups']:
+            change = group['Metrics']['UnblendedCost']
+            key = group['Keys'][0]
+            self.assertAlmostEqual(change['Current']['Amount'], current[key])
+            self.assertAlmostEqual(change['Previous']['Amount'], previous[key])
+            self.assertAlmostEqual(change['Change']['Amount'], current[key] - previous[key])
+            # Amounts are kept to 10^-8, while the fake backend reports 10 decimal places
+            self.assertAlmostEqual(
+                change['PercentChange'], (current[key] - previous[key]) / previous[key] * 100, places=5
+            )
+
+        impacts = [abs(group['Metrics']['UnblendedCost']['Change']['Amount']) for group in result['Groups']]
+        self.assertEqual(impacts, sorted(impacts, reverse=True))
+        self.assertAlmostEqual(result['Total']['UnblendedCost']['Current']['Amount'], sum(current.values()))
+        self.assertEqual(result['Total']['UsageQuantity']['Change']['Unit'], 'N/A')
+
+    def test_distant_ranges_and_repeated_comparisons(self):
+        """Test year-over-year ranges fetched separately and then from the cache."""
+        ranges = (('2023-06-12', '2023-06-15'), ('2022-06-13', '2022-06-16'))
+        result = compare_costs(self.client, *ranges, metrics=['UsageQuantity'])['Comparison']
+
+        self.assertEqual(len(self.backend.calls), 2)
+        self.assertEqual(result['Groups'], [])
+        self.assertEqual(list(result['Total']), ['UsageQuantity'])
+
+        compare_costs(self.client, *ranges, metrics=['UsageQuantity'])
+        self.assertEqual(len(self.backend.calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,15 @@ import unittest
 from unittest.mock import MagicMock, patch
 from datetime import datetime, timedelta
 
-from aws_cost_explorer.cost_client import CostExplorerClient
+from aws_cost_explorer.cost_client import CostExplorerClient, parse_group_by
+from aws_cost_explorer.fake_backend import FakeCostExplorer, FakeSession
+from aws_cost_explorer.results import CostTable
+from aws_cost_explorer.throttling import RateLimiter, Throttler
+
+
+def fast_throttler():
+    """Throttler that never makes the fake backend wait."""
+    return Throttler(limiter=RateLimiter(rate=10000, burst=10000))
 
 
 class TestCostExplorerClient(unittest.TestCase):
@@ -22,6 +30,10 @@ class TestCostExplorerClient(unittest.TestCase):
         # Create client with profile
         client = CostExplorerClient(profile='test-profile')
         
+        # Nothing is created until the client is first used
+        mock_session.assert_not_called()
+        self.assertEqual(client.ce_client, mock_ce_client)
+        
         # Verify session was created with the profile
         mock_session.assert_called_once_with(profile_name='test-profile')
         mock_session_instance.client.assert_called_once_with('ce')
@@ -39,6 +51,8 @@ class TestCostExplorerClient(unittest.TestCase):
         
         # Create client with session
         client = CostExplorerClient(session=mock_session_instance)
+        mock_session_instance.client.assert_not_called()
+        self.assertEqual(client.ce_client, mock_ce_client)
         
         # Verify a new session wasn't created
         mock_session.assert_not_called()
@@ -109,6 +123,136 @@ class TestCostExplorerClient(unittest.TestCase):
         self.assertEqual(call_args['Granularity'], 'MONTHLY')
         self.assertEqual(call_args['Metrics'], ['BlendedCost'])
 
+    @patch('boto3.Session')
+    def test_get_cost_and_usage_follows_next_page_token(self, mock_session):
+        """Test that every result page is fetched and merged."""
+        mock_ce_client = MagicMock()
+        mock_session.return_value.client.return_value = mock_ce_client
+        mock_ce_client.get_cost_and_usage.side_effect = [
+            {
+                'ResultsByTime': [{'TimePeriod': {'Start': '2023-01-01', 'End': '2023-01-02'}}],
+                'NextPageToken': 'page-2'
+            },
+            {
+                'ResultsByTime': [{'TimePeriod': {'Start': '2023-01-02', 'End': '2023-01-03'}}]
+            }
+        ]
+
+        client = CostExplorerClient()
+        result = client.get_cost_and_usage(start_date='2023-01-01', end_date='2023-01-03')
+
+        self.assertEqual(
+            [period['TimePeriod']['Start'] for period in result['ResultsByTime']],
+            ['2023-01-01', '2023-01-02']
+        )
+        self.assertNotIn('NextPageToken', result)
+        self.assertEqual(mock_ce_client.get_cost_and_usage.call_count, 2)
+        second_call = mock_ce_client.get_cost_and_usage.call_args_list[1][1]
+        self.assertEqual(second_call['NextPageToken'], 'page-2')
+
+    @patch('boto3.Session')
+    def test_iter_cost_and_usage_is_lazy_and_merges_split_periods(self, mock_session):
+        """Test that pages are fetched on demand and split periods are joined."""
+        mock_ce_client = MagicMock()
+        mock_session.return_value.client.return_value = mock_ce_client
+        period = {'Start': '2023-01-01', 'End': '2023-01-02'}
+        mock_ce_client.get_cost_and_usage.side_effect = [
+            {
+                'ResultsByTime': [{'TimePeriod': period, 'Groups': [{'Keys': ['EC2']}]}],
+                'NextPageToken': 'page-2'
+            },
+            {
+                'ResultsByTime': [
+                    {'TimePeriod': period, 'Groups': [{'Keys': ['S3']}]},
+                    {'TimePeriod': {'Start': '2023-01-02', 'End': '2023-01-03'}, 'Groups': []}
+                ]
+            }
+        ]
+
+        client = CostExplorerClient()
+        periods = client.iter_cost_and_usage(start_date='2023-01-01', end_date='2023-01-03')
+        mock_ce_client.get_cost_and_usage.assert_not_called()
+
+        first = next(periods)
+        self.assertEqual([group['Keys'] for group in first['Groups']], [['EC2'], ['S3']])
+        self.assertEqual(next(periods)['TimePeriod']['Start'], '2023-01-02')
+        self.assertEqual(list(periods), [])
+
+    @patch('boto3.Session')
+    def test_get_cost_and_usage_with_group_by_and_filter(self, mock_session):
+        """Test that grouping and filter arguments are sent to the API."""
+        mock_ce_client = MagicMock()
+        mock_session.return_value.client.return_value = mock_ce_client
+        mock_ce_client.get_cost_and_usage.return_value = {'ResultsByTime': []}
+        service_filter = {'Dimensions': {'Key': 'SERVICE', 'Values': ['Amazon S3']}}
+
+        client = CostExplorerClient()
+        client.get_cost_and_usage(group_by=['SERVICE', 'TAG:team'], filter_expression=service_filter)
+
+        call_args = mock_ce_client.get_cost_and_usage.call_args[1]
+        self.assertEqual(call_args['GroupBy'], [
+            {'Type': 'DIMENSION', 'Key': 'SERVICE'},
+            {'Type': 'TAG', 'Key': 'team'}
+        ])
+        self.assertEqual(call_args['Filter'], service_filter)
+
+    def test_parse_group_by(self):
+        """Test conversion of grouping shorthands."""
+        self.assertEqual(parse_group_by('linked_account'), {'Type': 'DIMENSION', 'Key': 'LINKED_ACCOUNT'})
+        self.assertEqual(parse_group_by('tag:Env'), {'Type': 'TAG', 'Key': 'Env'})
+        self.assertEqual(parse_group_by('COST_CATEGORY:Team'), {'Type': 'COST_CATEGORY', 'Key': 'Team'})
+        self.assertEqual(parse_group_by({'Type': 'TAG', 'Key': 'x'}), {'Type': 'TAG', 'Key': 'x'})
+        with self.assertRaises(ValueError):
+            parse_group_by('')
+
+    def test_long_ranges_are_split_into_month_chunks(self):
+        """Test that chunked fetching matches a single unsplit query."""
+        query = {'start_date': '2023-01-15', 'end_date': '2023-04-10', 'group_by': ['SERVICE']}
+
+        unsplit_backend = FakeCostExplorer(groups=5, page_size=7)
+        unsplit = CostExplorerClient(
+            session=FakeSession(unsplit_backend), throttler=fast_throttler(), chunk_workers=1
+        )
+        chunked_backend = FakeCostExplorer(groups=5, page_size=7)
+        chunked = CostExplorerClient(
+            session=FakeSession(chunked_backend), throttler=fast_throttler(), chunk_workers=3
+        )
+
+        expected = unsplit.get_cost_and_usage(**query)
+        self.assertEqual(chunked.get_cost_and_usage(**query), expected)
+        self.assertEqual(list(chunked.iter_cost_and_usage(**query)), expected['ResultsByTime'])
+
+        chunk_starts = sorted({call['TimePeriod']['Start'] for call in chunked_backend.calls})
+        self.assertEqual(chunk_starts, ['2023-01-15', '2023-02-01', '2023-03-01', '2023-04-01'])
+        self.assertEqual({call['TimePeriod']['Start'] for call in unsplit_backend.calls}, {'2023-01-15'})
+
+    def test_short_and_monthly_ranges_are_not_split(self):
+        """Test that chunking only applies to long DAILY ranges."""
+        backend = FakeCostExplorer()
+        client = CostExplorerClient(session=FakeSession(backend), chunk_threshold_days=62)
+
+        client.get_cost_and_usage(start_date='2023-01-15', end_date='2023-02-20')
+        client.get_cost_and_usage(start_date='2023-01-01', end_date='2023-12-01', granularity='MONTHLY')
+
+        self.assertEqual(len(backend.calls), 2)
+
+    def test_hourly_query(self):
+        """Test an HOURLY query through pagination and into a CostTable."""
+        backend = FakeCostExplorer(groups=3, page_size=10)
+        client = CostExplorerClient(session=FakeSession(backend), throttler=fast_throttler())
+
+        periods = client.iter_cost_and_usage(
+            start_date='2023-06-14T00:00:00Z', end_date='2023-06-15T00:00:00Z', granularity='HOURLY',
+            group_by=['SERVICE']
+        )
+        table = CostTable.from_periods(periods)
+
+        self.assertEqual(len(table), 24)
+        self.assertEqual(table.periods[1], ('2023-06-14T01:00:00Z', '2023-06-14T02:00:00Z'))
+        self.assertEqual(len(table.keys), 3)
+        self.assertEqual(backend.calls[0]['Granularity'], 'HOURLY')
+        self.assertEqual(len(backend.calls), 8)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,152 @@
+"""Unit tests for the cur module."""
+
+import csv
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+from aws_cost_explorer.cur import CurReader, _parquet_column
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+HEADER = [
+    'identity/LineItemId', 'bill/InvoiceId', 'lineItem/UsageAccountId', 'lineItem/UsageStartDate',
+    'lineItem/UsageAmount', 'lineItem/CurrencyCode', 'lineItem/UnblendedCost', 'lineItem/BlendedCost',
+    'product/ProductName', 'resourceTags/user:team'
+]
+
+
+def line_items():
+    """Build line items over four days: two services, two teams, one unbilled day."""
+    items = []
+    for day in range(1, 5):
+        invoice = '' if day == 4 else 'INV-1'
+        for hour in range(3):
+            start = f'2023-06-0{day}T0{hour}:00:00Z'
+            items.append([f'id-{day}-{hour}-a', invoice, '111111111111', start, '2', 'USD', '1.5', '1.25',
+                          'Amazon EC2', 'web'])
+            items.append([f'id-{day}-{hour}-b', invoice, '111111111111', start, '10', 'USD', '0.25', '0.25',
+                          'Amazon S3', ''])
+    return items
+
+
+class TestCurReader(unittest.TestCase):
+    """Test the CurReader class."""
+
+    def setUp(self):
+        """Write the line items as a CSV and a gzip CSV file."""
+        self.directory = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.directory, 'report-1.csv')
+        with open(self.csv_path, 'w', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(HEADER)
+            writer.writerows(line_items())
+
+        self.gzip_path = os.path.join(self.directory, 'gzip', 'report-1.csv.gz')
+        os.mkdir(os.path.dirname(self.gzip_path))
+        with open(self.csv_path, 'rb') as source, gzip.open(self.gzip_path, 'wb') as target:
+            shutil.copyfileobj(source, target)
+
+    def tearDown(self):
+        """Remove the CUR files."""
+        shutil.rmtree(self.directory)
+
+    def test_daily_totals(self):
+        """Test daily totals, the date range and unbilled days."""
+        response = CurReader(self.csv_path, max_workers=1).get_cost_and_usage('2023-06-02', '2023-06-06')
+        periods = response['ResultsByTime']
+
+        self.assertEqual([period['TimePeriod']['Start'] for period in periods],
+                         ['2023-06-02', '2023-06-03', '2023-06-04', '2023-06-05'])
+        self.assertEqual(periods[0]['Total']['UnblendedCost'], {'Amount': '5.25', 'Unit': 'USD'})
+        self.assertEqual(periods[0]['Total']['UsageQuantity'], {'Amount': '36.0', 'Unit': 'N/A'})
+        self.assertEqual(periods[3]['Total']['BlendedCost']['Amount'], '0.0')
+        self.assertEqual([period['Estimated'] for period in periods], [False, False, True, False])
+
+    def test_groups_and_monthly(self):
+        """Test grouping by service and tag over a MONTHLY period."""
+        response = CurReader(self.csv_path, max_workers=1).get_cost_and_usage(
+            '2023-06-01', '2023-07-01', granularity='MONTHLY', metrics=['UnblendedCost'],
+            group_by=['SERVICE', 'TAG:team']
+        )
+        period = response['ResultsByTime'][0]
+
+        self.assertEqual(response['GroupDefinitions'][1], {'Type': 'TAG', 'Key': 'team'})
+        self.assertEqual(period['Total'], {})
+        self.assertEqual(period['Groups'], [
+            {'Keys': ['Amazon EC2', 'team$web'], 'Metrics': {'UnblendedCost': {'Amount': '18.0', 'Unit': 'USD'}}},
+            {'Keys': ['Amazon S3', 'team$'], 'Metrics': {'UnblendedCost': {'Amount': '3.0', 'Unit': 'USD'}}}
+        ])
+        self.assertTrue(period['Estimated'])
+
+    def test_chunked_parallel_reads_match(self):
+        """Test that chunked, multi-process and gzip reads give the same result."""
+        query = {'start_date': '2023-06-01', 'end_date': '2023-06-05', 'group_by': ['SERVICE']}
+        expected = CurReader(self.csv_path, max_workers=1).get_cost_and_usage(**query)
+
+        self.assertEqual(CurReader(self.csv_path, max_workers=1, chunk_bytes=100).get_cost_and_usage(**query), expected)
+        self.assertEqual(CurReader(self.gzip_path, max_workers=1, chunk_bytes=100).get_cost_and_usage(**query), expected)
+        self.assertEqual(CurReader(self.csv_path, max_workers=2, chunk_bytes=300).get_cost_and_usage(**query), expected)
+
+    def test_directories(self):
+        """Test that directories are searched recursively for CUR files."""
+        reader = CurReader(self.directory)
+        self.assertEqual(reader.files(), sorted([self.csv_path, self.gzip_path]))
+
+        response = CurReader(self.directory, max_workers=1).get_cost_and_usage('2023-06-01', '2023-06-02')
+        self.assertEqual(response['ResultsByTime'][0]['Total']['UnblendedCost']['Amount'], '10.5')
+
+        empty = os.path.join(self.directory, 'empty')
+        os.mkdir(empty)
+        with self.assertRaises(ValueError):
+            CurReader(empty).files()
+
+    def test_hourly(self):
+        """Test HOURLY periods from ISO 8601 usage start dates."""
+        response = CurReader(self.csv_path, max_workers=1).get_cost_and_usage(
+            '2023-06-01T01:00:00Z', '2023-06-01T04:00:00Z', granularity='HOURLY', metrics=['UnblendedCost']
+        )
+        periods = response['ResultsByTime']
+
+        self.assertEqual([period['TimePeriod']['Start'] for period in periods],
+                         ['2023-06-01T01:00:00Z', '2023-06-01T02:00:00Z', '2023-06-01T03:00:00Z'])
+        self.assertEqual([period['Total']['UnblendedCost']['Amount'] for period in periods], ['1.75', '1.75', '0.0'])
+
+    def test_unsupported_queries(self):
+        """Test errors for metrics and dimensions missing from CUR data."""
+        reader = CurReader(self.csv_path, max_workers=1)
+        with self.assertRaises(ValueError):
+            reader.get_cost_and_usage('2023-06-01', '2023-06-02', metrics=['AmortizedCost'])
+        with self.assertRaises(ValueError):
+            reader.get_cost_and_usage('2023-06-01', '2023-06-02', group_by=['AZ'])
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_parquet(self):
+        """Test reading a Parquet export with snake case column names."""
+        columns = list(zip(*line_items()))
+        table = pyarrow.table({
+            _parquet_column(name): pyarrow.array(
+                [float(value) for value in column] if name.endswith(('Amount', 'Cost')) else list(column)
+            )
+            for name, column in zip(HEADER, columns)
+        })
+        path = os.path.join(self.directory, 'report-1.parquet')
+        pyarrow.parquet.write_table(table, path)
+
+        query = {'start_date': '2023-06-01', 'end_date': '2023-06-05', 'group_by': ['SERVICE']}
+        self.assertEqual(
+            CurReader(path, max_workers=1).get_cost_and_usage(**query),
+            CurReader(self.csv_path, max_workers=1).get_cost_and_usage(**query)
+        )
+        self.assertEqual(_parquet_column('resourceTags/user:team'), 'resource_tags_user_team')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,7 @@
 import unittest
 from datetime import datetime, timedelta
 from freezegun import freeze_time
-from aws_cost_explorer.date_utils import get_date_range
+from aws_cost_explorer.date_utils import check_hourly_start, get_date_range, split_date_range
 
 
 @freeze_time("2023-06-15")
@@ -62,6 +62,52 @@ class TestDateUtils(unittest.TestCase):
             self.assertEqual(start_date, "2023-05-01")
             self.assertEqual(end_date, "2023-06-01")  # June 1 (exclusive)
 
+    def test_split_date_range_daily(self):
+        """Test splitting a range into days."""
+        self.assertEqual(
+            split_date_range("2023-01-30", "2023-02-02"),
+            [("2023-01-30", "2023-01-31"), ("2023-01-31", "2023-02-01"), ("2023-02-01", "2023-02-02")]
+        )
+
+    def test_split_date_range_monthly(self):
+        """Test splitting a range into clipped calendar months."""
+        self.assertEqual(
+            split_date_range("2023-01-15", "2023-03-10", "MONTHLY"),
+            [("2023-01-15", "2023-02-01"), ("2023-02-01", "2023-03-01"), ("2023-03-01", "2023-03-10")]
+        )
+        with self.assertRaises(ValueError):
+            split_date_range("2023-01-01", "2023-02-01", "WEEKLY")
+
+    def test_get_date_range_hourly(self):
+        """Test timestamps for HOURLY queries."""
+        self.assertEqual(get_date_range(hourly=True), ("2023-06-02T00:00:00Z", "2023-06-16T00:00:00Z"))
+        self.assertEqual(
+            get_date_range(start_date="2023-06-14T06:00:00Z", end_date="2023-06-14T09:30", hourly=True),
+            ("2023-06-14T06:00:00Z", "2023-06-14T09:30:00Z")
+        )
+        self.assertEqual(get_date_range(days=1, hourly=True), ("2023-06-14T00:00:00Z", "2023-06-16T00:00:00Z"))
+        with self.assertRaises(ValueError):
+            get_date_range(start_date="2023-06-14T06:00:00Z", end_date="2023-06-15")
+
+    def test_check_hourly_start(self):
+        """Test that HOURLY ranges must start within the last 14 days."""
+        check_hourly_start(get_date_range(hourly=True)[0])
+        check_hourly_start("2023-06-02")
+        with self.assertRaisesRegex(ValueError, "start on or after 2023-06-02"):
+            check_hourly_start(get_date_range(days=14, hourly=True)[0])
+        with self.assertRaises(ValueError):
+            check_hourly_start("2023-06-01T23:00:00Z")
+
+    def test_split_date_range_hourly(self):
+        """Test splitting a range into hours."""
+        hours = split_date_range("2023-06-14", "2023-06-15", "HOURLY")
+        self.assertEqual(len(hours), 24)
+        self.assertEqual(hours[0], ("2023-06-14T00:00:00Z", "2023-06-14T01:00:00Z"))
+        self.assertEqual(
+            split_date_range("2023-06-14T22:30:00Z", "2023-06-15T00:00:00Z", "HOURLY"),
+            [("2023-06-14T22:30:00Z", "2023-06-14T23:00:00Z"), ("2023-06-14T23:00:00Z", "2023-06-15T00:00:00Z")]
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
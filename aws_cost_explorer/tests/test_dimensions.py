@@ -0,0 +1,120 @@
+"""Unit tests for the dimensions module."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from aws_cost_explorer.cost_client import CostExplorerClient
+from aws_cost_explorer.dimensions import DimensionIndex, index_name
+from aws_cost_explorer.fake_backend import FakeCostExplorer, FakeSession
+from aws_cost_explorer.throttling import RateLimiter, Throttler
+
+
+class TestDimensionIndex(unittest.TestCase):
+    """Test the DimensionIndex class."""
+
+    def setUp(self):
+        """Set up an index of services, regions and a team tag."""
+        self.index = DimensionIndex({
+            'SERVICE': ['Amazon Elastic Compute Cloud - Compute', 'Amazon EC2 Container Registry (ECR)',
+                        'Amazon Simple Storage Service', 'AWS Lambda', 'EC2 - Other'],
+            'region': ['us-east-1', 'us-east-2', 'eu-west-1'],
+            'TAG:team': ['data', 'web', 'web-admin']
+        })
+
+    def test_names(self):
+        """Test that names are normalized like --group-by values."""
+        self.assertEqual(self.index.names(), ['REGION', 'SERVICE', 'TAG:team'])
+        self.assertEqual(index_name('tag:team'), 'TAG:team')
+        self.assertEqual(index_name('linked_account'), 'LINKED_ACCOUNT')
+
+    def test_complete(self):
+        """Test case-insensitive prefix completion."""
+        self.assertEqual(self.index.complete('service', 'amazon e'),
+                         ['Amazon EC2 Container Registry (ECR)', 'Amazon Elastic Compute Cloud - Compute'])
+        self.assertEqual(self.index.complete('REGION', 'us-', limit=1), ['us-east-1'])
+        self.assertEqual(len(self.index.complete('REGION')), 3)
+        self.assertEqual(self.index.complete('TAG:team', 'x'), [])
+        self.assertEqual(self.index.complete('USAGE_TYPE', 'a'), [])
+
+    def test_expand(self):
+        """Test exact values and fnmatch wildcards."""
+        self.assertEqual(self.index.expand('REGION', 'us-*'), ['us-east-1', 'us-east-2'])
+        self.assertEqual(self.index.expand('REGION', '*-1'), ['eu-west-1', 'us-east-1'])
+        self.assertEqual(self.index.expand('REGION', 'us-east-[2-9]'), ['us-east-2'])
+        self.assertEqual(self.index.expand('REGION', 'us-east-1'), ['us-east-1'])
+        self.assertEqual(self.index.expand('REGION', 'US-*'), [])
+
+    def test_validate_filter(self):
+        """Test that filters are expanded and unknown values are reported."""
+        expression = {'And': [
+            {'Dimensions': {'Key': 'REGION', 'Values': ['us-*', 'us-east-1']}},
+            {'Not': {'Tags': {'Key': 'team', 'Values': ['web*']}}},
+            {'Dimensions': {'Key': 'SERVICE', 'Values': ['Amazon'], 'MatchOptions': ['STARTS_WITH']}},
+            {'CostCategories': {'Key': 'Unit', 'Values': ['Anything']}}
+        ]}
+        expanded = self.index.validate_filter(expression)
+
+        self.assertEqual(expanded['And'][0]['Dimensions']['Values'], ['us-east-1', 'us-east-2'])
+        self.assertEqual(expanded['And'][1]['Not']['Tags'], {'Key': 'team', 'Values': ['web', 'web-admin']})
+        self.assertEqual(expanded['And'][2:], expression['And'][2:])
+
+        with self.assertRaises(ValueError) as context:
+            self.index.validate_filter({'Or': [
+                {'Dimensions': {'Key': 'REGION', 'Values': ['us-east-3']}},
+                {'Tags': {'Key': 'team', 'Values': ['ops*']}}
+            ]})
+        self.assertIn("no REGION value matches 'us-east-3' (did you mean 'us-east-2', 'us-east-1'",
+                      str(context.exception))
+        self.assertIn("no TAG:team value matches 'ops*'", str(context.exception))
+
+
+class TestFetchingTheIndex(unittest.TestCase):
+    """Test building the index from Cost Explorer."""
+
+    def setUp(self):
+        """Set up a client on a paginating fake backend and a temporary directory."""
+        self.backend = FakeCostExplorer(groups=5, page_size=2)
+        throttler = Throttler(limiter=RateLimiter(rate=10000, burst=10000))
+        self.client = CostExplorerClient(session=FakeSession(self.backend), throttler=throttler)
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'dimensions.json')
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.directory)
+
+    def test_client_lookups_follow_pagination(self):
+        """Test the GetDimensionValues and GetTags wrappers."""
+        self.assertEqual(len(self.client.get_dimension_values('service')), 5)
+        self.assertEqual(self.client.get_dimension_values('SERVICE', search_string='003'), ['SERVICE-00003'])
+        self.assertEqual(self.client.get_tags(), ['env', 'team'])
+        self.assertEqual(self.client.get_tags('team')[-1], 'team-00004')
+        self.assertEqual(self.backend.calls[0]['Dimension'], 'SERVICE')
+
+    def test_load_or_fetch_refreshes_daily(self):
+        """Test that the index is fetched once, saved, and fetched again when stale."""
+        now = [1000.0]
+        clock = lambda: now[0]
+
+        index = DimensionIndex.load_or_fetch(self.client, self.path, clock=clock, dimensions=['SERVICE', 'REGION'])
+        calls = len(self.backend.calls)
+        self.assertEqual(index.names(), ['REGION', 'SERVICE', 'TAG:env', 'TAG:team'])
+        self.assertEqual(index.complete('TAG:team', 'team-0000')[0], 'team-00000')
+        # Tag keys, then 3 pages for each of the 2 dimensions and 2 tag keys
+        self.assertEqual(calls, 1 + 4 * 3)
+
+        now[0] += 3600
+        cached = DimensionIndex.load_or_fetch(self.client, self.path, clock=clock, dimensions=['SERVICE', 'REGION'])
+        self.assertEqual(len(self.backend.calls), calls)
+        self.assertEqual(cached.values, index.values)
+
+        now[0] += 86400
+        DimensionIndex.load_or_fetch(self.client, self.path, clock=clock, dimensions=['SERVICE'], tag_keys=[])
+        self.assertEqual(len(self.backend.calls), calls + 3)
+        self.assertEqual(DimensionIndex.load(self.path).names(), ['SERVICE'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Unit tests for the fake_backend and benchmarks modules."""
+
+import unittest
+
+from aws_cost_explorer.benchmarks import (
+    compare_to_baseline, format_report, loaded_heavy_modules, run_benchmarks, run_startup_benchmarks
+)
+from aws_cost_explorer.cost_client import CostExplorerClient
+from aws_cost_explorer.fake_backend import FakeCostExplorer, FakeSession
+from aws_cost_explorer.throttling import RateLimiter, RetryPolicy, Throttler
+
+
+class TestFakeCostExplorer(unittest.TestCase):
+    """Test the FakeCostExplorer backend."""
+
+    def make_client(self, backend):
+        """Build a client for a backend with a fast, non-waiting throttler."""
+        throttler = Throttler(
+            limiter=RateLimiter(rate=1000, burst=1000),
+            policy=RetryPolicy(base_delay=0, max_delay=0)
+        )
+        return CostExplorerClient(session=FakeSession(backend), throttler=throttler)
+
+    def test_grouped_results_are_paginated(self):
+        """Test that group rows are split across pages and merged back."""
+        backend = FakeCostExplorer(groups=7, page_size=5)
+        client = self.make_client(backend)
+
+        response = client.get_cost_and_usage(
+            start_date='2023-01-01', end_date='2023-01-04', group_by=['SERVICE']
+        )
+
+        self.assertEqual(len(backend.calls), 5)
+        self.assertEqual(len(response['ResultsByTime']), 3)
+        for period in response['ResultsByTime']:
+            self.assertEqual(len(period['Groups']), 7)
+        self.assertEqual(response['ResultsByTime'][0]['Groups'][6]['Keys'], ['SERVICE-00006'])
+
+    def test_ungrouped_results_and_estimates(self):
+        """Test Total-only results and the Estimated flag."""
+        backend = FakeCostExplorer(estimated_after='2023-01-02')
+        response = backend.get_cost_and_usage(
+            TimePeriod={'Start': '2023-01-01', 'End': '2023-01-03'},
+            Granularity='DAILY',
+            Metrics=['BlendedCost']
+        )
+
+        self.assertNotIn('NextPageToken', response)
+        self.assertEqual([period['Estimated'] for period in response['ResultsByTime']], [False, True])
+        self.assertEqual(response['ResultsByTime'][0]['Total']['BlendedCost']['Unit'], 'USD')
+
+    def test_amounts_are_deterministic(self):
+        """Test that the same query always returns the same amounts."""
+        request = {'TimePeriod': {'Start': '2023-01-01', 'End': '2023-01-02'}, 'Granularity': 'DAILY', 'Metrics': ['BlendedCost']}
+        self.assertEqual(
+            FakeCostExplorer(seed=1).get_cost_and_usage(**request),
+            FakeCostExplorer(seed=1).get_cost_and_usage(**request)
+        )
+
+    def test_throttling_is_retried_by_client(self):
+        """Test that simulated throttling errors are retried."""
+        backend = FakeCostExplorer(groups=4, page_size=2, throttle_every=2)
+        client = self.make_client(backend)
+
+        response = client.get_cost_and_usage(start_date='2023-01-01', end_date='2023-01-02', group_by=['SERVICE'])
+
+        self.assertEqual(len(response['ResultsByTime'][0]['Groups']), 4)
+        self.assertEqual(client.throttler.stats.retries, 1)
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Test the benchmark harness."""
+
+    def test_run_benchmarks(self):
+        """Test that every stage is measured and reported."""
+        results = run_benchmarks(days=3, groups=4, page_size=5, formats=['pretty', 'csv'])
+
+        self.assertEqual(
+            [result['stage'] for result in results],
+            ['fetch', 'parse', 'amounts:float', 'amounts:fixed', 'format:pretty', 'format:csv', 'table:csv']
+        )
+        self.assertEqual(results[0]['api_calls'], 3)
+        self.assertEqual(results[0]['rows'], 36)
+        self.assertIn('format:csv', format_report(results))
+
+    def test_startup_benchmarks(self):
+        """Test that CLI startup is measured and stays free of heavy imports."""
+        results = run_startup_benchmarks(runs=1)
+
+        self.assertEqual([result['stage'] for result in results], ['startup:import', 'startup:help'])
+        for result in results:
+            self.assertEqual(result['heavy_modules'], [])
+        self.assertIn('boto3', loaded_heavy_modules('import boto3'))
+
+    def test_compare_to_baseline(self):
+        """Test detection of slowed-down stages."""
+        baseline = [{'stage': 'parse', 'seconds': 1.0}, {'stage': 'fetch', 'seconds': 1.0}]
+        results = [{'stage': 'parse', 'seconds': 1.1}, {'stage': 'fetch', 'seconds': 2.0}]
+
+        regressions = compare_to_baseline(results, baseline, tolerance=0.25)
+
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith('fetch'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Unit tests for the forecast module."""
+
+import datetime
+import unittest
+
+from aws_cost_explorer.cache import ResponseCache
+from aws_cost_explorer.cost_client import CostExplorerClient
+from aws_cost_explorer.fake_backend import FakeCostExplorer, FakeSession
+from aws_cost_explorer.forecast import group_filter, month_end_forecast
+from aws_cost_explorer.throttling import RateLimiter, Throttler
+
+
+class TestMonthEndForecast(unittest.TestCase):
+    """Test month_end_forecast()."""
+
+    def setUp(self):
+        """Set up a client backed by a fake Cost Explorer."""
+        self.backend = FakeCostExplorer(groups=3)
+        self.client = CostExplorerClient(
+            session=FakeSession(self.backend),
+            cache=ResponseCache(':memory:'),
+            throttler=Throttler(limiter=RateLimiter(rate=10000, burst=10000))
+        )
+
+    def calls(self, operation_field):
+        """Return the backend calls that carry the given request field."""
+        return [call for call in self.backend.calls if operation_field in call]
+
+    def test_forecast_per_group(self):
+        """Test that each group gets a filtered forecast added to its actuals."""
+        result = month_end_forecast(self.client, group_by='SERVICE', today=datetime.date(2023, 6, 10))['Forecast']
+
+        self.assertEqual(result['TimePeriod'], {'Start': '2023-06-01', 'End': '2023-07-01'})
+        self.assertEqual(len(result['Groups']), 3)
+        self.assertEqual(result['Errors'], {})
+
+        forecasts = self.calls('Metric')
+        self.assertEqual(len(forecasts), 3)
+        self.assertEqual(forecasts[0]['TimePeriod'], {'Start': '2023-06-10', 'End': '2023-07-01'})
+        self.assertEqual(forecasts[0]['Metric'], 'UNBLENDED_COST')
+        self.assertEqual(
+            sorted(call['Filter']['Dimensions']['Values'][0] for call in forecasts),
+            ['SERVICE-00000', 'SERVICE-00001', 'SERVICE-00002']
+        )
+
+        for group in result['Groups']:
+            self.assertGreater(group['Actual']['Amount'], 0)
+            self.assertAlmostEqual(group['MonthEnd']['Amount'], group['Actual']['Amount'] + group['Forecast']['Amount'])
+        self.assertAlmostEqual(
+            result['Total']['MonthEnd']['Amount'],
+            sum(group['MonthEnd']['Amount'] for group in result['Groups'])
+        )
+        self.assertEqual(
+            [group['MonthEnd']['Amount'] for group in result['Groups']],
+            sorted((group['MonthEnd']['Amount'] for group in result['Groups']), reverse=True)
+        )
+
+    def test_forecasts_are_cached_for_the_day(self):
+        """Test that repeating a forecast on the same day makes no API calls."""
+        month_end_forecast(self.client, group_by='SERVICE', today=datetime.date(2023, 6, 10))
+        calls = len(self.backend.calls)
+
+        month_end_forecast(self.client, group_by='SERVICE', today=datetime.date(2023, 6, 10))
+        self.assertEqual(len(self.backend.calls), calls)
+
+    def test_first_day_of_month_uses_previous_month_groups(self):
+        """Test that groups come from last month when nothing is billed yet."""
+        result = month_end_forecast(self.client, group_by='SERVICE', today=datetime.date(2023, 6, 1))['Forecast']
+
+        self.assertEqual(self.calls('Metrics')[0]['TimePeriod'], {'Start': '2023-05-01', 'End': '2023-06-01'})
+        self.assertEqual(len(result['Groups']), 3)
+        self.assertEqual(result['Total']['Actual']['Amount'], 0.0)
+
+    def test_ungrouped_forecast(self):
+        """Test a single forecast for the whole account."""
+        result = month_end_forecast(self.client, today=datetime.date(2023, 6, 10))['Forecast']
+
+        self.assertEqual(result['Groups'], [])
+        self.assertEqual(len(self.calls('Metric')), 1)
+        self.assertNotIn('Filter', self.calls('Metric')[0])
+        self.assertGreater(result['Total']['MonthEnd']['Amount'], result['Total']['Actual']['Amount'])
+
+    def test_group_filter(self):
+        """Test filters for dimension, tag and cost category groups."""
+        self.assertEqual(
+            group_filter({'Type': 'DIMENSION', 'Key': 'SERVICE'}, 'Amazon S3'),
+            {'Dimensions': {'Key': 'SERVICE', 'Values': ['Amazon S3']}}
+        )
+        self.assertEqual(
+            group_filter({'Type': 'TAG', 'Key': 'team'}, 'team$web'),
+            {'Tags': {'Key': 'team', 'Values': ['web']}}
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,21 @@
 """Unit tests for the formatters module."""
 
+import contextlib
 import unittest
+import csv
 import json
 import io
 from aws_cost_explorer.formatters import (
-    CostFormatter, PrettyFormatter, JsonFormatter, get_formatter
+    CostFormatter, PrettyFormatter, JsonFormatter, JsonLinesFormatter,
+    CsvFormatter, ArrowFormatter, ParquetFormatter, get_formatter
 )
 
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
 
 class TestFormatters(unittest.TestCase):
     """Test the formatter classes and functions."""
@@ -115,6 +124,240 @@ class TestFormatters(unittest.TestCase):
         result = output_buffer.read()
         self.assertEqual(json.loads(result), {"test": "value"})
 
+    def test_pretty_formatter_groups(self):
+        """Test that grouped results are shown per group."""
+        formatter = PrettyFormatter()
+        result = formatter.format({
+            "ResultsByTime": [{
+                "TimePeriod": {"Start": "2023-06-01", "End": "2023-06-02"},
+                "Total": {},
+                "Groups": [
+                    {"Keys": ["Amazon EC2"], "Metrics": {"BlendedCost": {"Amount": "3.5", "Unit": "USD"}}},
+                    {"Keys": ["AWS Lambda"], "Metrics": {"BlendedCost": {"Amount": "0", "Unit": "USD"}}}
+                ]
+            }]
+        })
+
+        self.assertIn("  Amazon EC2:\n    BlendedCost: 3.50 USD", result)
+        self.assertNotIn("AWS Lambda", result)
+
+    def test_pretty_formatter_rounds_exactly(self):
+        """Test that amounts are rounded half to even from their decimal value."""
+        result = PrettyFormatter().format({
+            "ResultsByTime": [{
+                "TimePeriod": {"Start": "2023-06-01", "End": "2023-06-02"},
+                "Total": {
+                    "BlendedCost": {"Amount": "2.675", "Unit": "USD"},
+                    "UnblendedCost": {"Amount": "2.665", "Unit": "USD"}
+                }
+            }]
+        })
+
+        self.assertIn("BlendedCost: 2.68 USD", result)
+        self.assertIn("UnblendedCost: 2.66 USD", result)
+
+    def test_write_periods_matches_format(self):
+        """Test that streamed output is identical to the buffered output."""
+        metadata = {"GroupDefinitions": [{"Type": "DIMENSION", "Key": "SERVICE"}]}
+        expected_data = dict(metadata, ResultsByTime=self.sample_cost_data["ResultsByTime"])
+
+        for formatter in (PrettyFormatter(), JsonFormatter(indent=2), JsonFormatter(indent=None)):
+            output_buffer = io.StringIO()
+            formatter.write_periods(iter(self.sample_cost_data["ResultsByTime"]), output_buffer, metadata)
+            self.assertEqual(output_buffer.getvalue(), formatter.format(expected_data))
+
+    def test_write_periods_is_incremental(self):
+        """Test that each period is written before the next one is produced."""
+        output_buffer = io.StringIO()
+        written = []
+
+        def periods():
+            for period in self.sample_cost_data["ResultsByTime"]:
+                written.append(output_buffer.getvalue())
+                yield period
+
+        JsonLinesFormatter().write_periods(periods(), output_buffer)
+
+        self.assertEqual(written[0], "")
+        self.assertEqual(json.loads(written[1]), self.sample_cost_data["ResultsByTime"][0])
+
+    def test_json_lines_formatter(self):
+        """Test the JsonLinesFormatter class."""
+        formatter = get_formatter('jsonl')
+        self.assertIsInstance(formatter, JsonLinesFormatter)
+
+        lines = formatter.format(self.sample_cost_data).splitlines()
+        self.assertEqual([json.loads(line) for line in lines], self.sample_cost_data["ResultsByTime"])
+
+    def test_json_lines_formatter_accounts(self):
+        """Test one line per account and period, then one per failed account."""
+        formatter = get_formatter('jsonl')
+        result = formatter.format({'Accounts': {'prod': self.sample_cost_data}, 'Errors': {'dev': 'Access denied'}})
+        lines = [json.loads(line) for line in result.splitlines()]
+
+        self.assertEqual(len(lines), len(self.sample_cost_data["ResultsByTime"]) + 1)
+        self.assertEqual(lines[0], dict({'Account': 'prod'}, **self.sample_cost_data["ResultsByTime"][0]))
+        self.assertEqual(lines[-1], {'Account': 'dev', 'Error': 'Access denied'})
+
+    def test_anomalies(self):
+        """Test formatting anomaly detection results."""
+        anomaly = {
+            "Date": "2023-06-02", "Keys": ["Amazon EC2"], "Metric": "BlendedCost", "Amount": 250.0,
+            "Unit": "USD", "Expected": 100.0, "ZScore": 7.5, "Methods": ["rolling", "ewma"], "Estimated": False
+        }
+
+        result = PrettyFormatter().format({"Anomalies": [anomaly]})
+        self.assertIn("2023-06-02  Amazon EC2: 250.00 USD (expected 100.00, z-score +7.5, rolling, ewma)", result)
+        self.assertIn("None found", PrettyFormatter().format({"Anomalies": []}))
+        self.assertEqual(json.loads(JsonLinesFormatter().format({"Anomalies": [anomaly]})), anomaly)
+
+    def test_forecast(self):
+        """Test formatting a month-end forecast."""
+        def amounts(actual, forecast):
+            return {
+                "Actual": {"Amount": actual, "Unit": "USD"},
+                "Forecast": {"Amount": forecast, "Unit": "USD"},
+                "MonthEnd": {"Amount": actual + forecast, "Unit": "USD"}
+            }
+
+        forecast = {
+            "TimePeriod": {"Start": "2023-06-01", "End": "2023-07-01"},
+            "Metric": "UnblendedCost",
+            "GroupDefinitions": [{"Type": "DIMENSION", "Key": "SERVICE"}],
+            "Groups": [dict(amounts(30.0, 60.0), Keys=["Amazon EC2"])],
+            "Total": amounts(30.0, 60.0),
+            "Errors": {"Amazon S3": "Insufficient amount of historical data"}
+        }
+
+        result = PrettyFormatter().format({"Forecast": forecast})
+        self.assertIn("Forecast: 2023-06-01 to 2023-07-01 (UnblendedCost)", result)
+        self.assertIn("  Amazon EC2: 30.00 to date + 60.00 forecast = 90.00 USD", result)
+        self.assertIn("  Total: 30.00 to date + 60.00 forecast = 90.00 USD", result)
+        self.assertIn("  Amazon S3: Error: Insufficient amount of historical data", result)
+
+    def test_comparison(self):
+        """Test formatting a comparison of two ranges."""
+        def change(current, previous, percent):
+            return {
+                "Current": {"Amount": current, "Unit": "USD"},
+                "Previous": {"Amount": previous, "Unit": "USD"},
+                "Change": {"Amount": current - previous, "Unit": "USD"},
+                "PercentChange": percent
+            }
+
+        comparison = {
+            "Current": {"Start": "2023-06-01", "End": "2023-06-11", "Estimated": True},
+            "Previous": {"Start": "2023-05-01", "End": "2023-06-01", "Estimated": False},
+            "Metrics": ["UnblendedCost"],
+            "GroupDefinitions": [{"Type": "DIMENSION", "Key": "SERVICE"}],
+            "Groups": [
+                {"Keys": ["Amazon EC2"], "Metrics": {"UnblendedCost": change(30.0, 40.0, -25.0)}},
+                {"Keys": ["Amazon S3"], "Metrics": {"UnblendedCost": change(5.0, 0.0, None)}}
+            ],
+            "Total": {"UnblendedCost": change(35.0, 40.0, -12.5)}
+        }
+
+        result = PrettyFormatter().format({"Comparison": comparison})
+        self.assertIn("Comparison: 2023-06-01 to 2023-06-11 vs 2023-05-01 to 2023-06-01", result)
+        self.assertIn("Total:\n  UnblendedCost: 35.00 vs 40.00 USD (-5.00, -12.5%)", result)
+        self.assertIn("Amazon EC2:\n  UnblendedCost: 30.00 vs 40.00 USD (-10.00, -25.0%)", result)
+        self.assertIn("  UnblendedCost: 5.00 vs 0.00 USD (+5.00, n/a)", result)
+        self.assertIn("(Estimated: Yes)", result)
+        self.assertEqual(json.loads(JsonFormatter().format({"Comparison": comparison}))["Comparison"], comparison)
+
+    def grouped_cost_data(self):
+        """Build grouped cost data with GroupDefinitions."""
+        return {
+            "GroupDefinitions": [{"Type": "DIMENSION", "Key": "SERVICE"}, {"Type": "TAG", "Key": "team"}],
+            "ResultsByTime": [{
+                "TimePeriod": {"Start": "2023-06-01", "End": "2023-06-02"},
+                "Total": {},
+                "Groups": [
+                    {"Keys": ["Amazon EC2", "team$web"], "Metrics": {
+                        "BlendedCost": {"Amount": "3.5", "Unit": "USD"},
+                        "UsageQuantity": {"Amount": "12", "Unit": "N/A"}
+                    }},
+                    {"Keys": ["Amazon S3", "team$"], "Metrics": {
+                        "BlendedCost": {"Amount": "0.25", "Unit": "USD"},
+                        "UsageQuantity": {"Amount": "1", "Unit": "N/A"}
+                    }}
+                ],
+                "Estimated": True
+            }]
+        }
+
+    def test_csv_formatter(self):
+        """Test that CsvFormatter writes one row per period and metric."""
+        formatter = get_formatter('csv')
+        self.assertIsInstance(formatter, CsvFormatter)
+
+        rows = list(csv.reader(io.StringIO(formatter.format(self.sample_cost_data))))
+        self.assertEqual(rows[0], ['start', 'end', 'metric', 'amount', 'unit', 'estimated'])
+        self.assertEqual(rows[1], ['2023-06-01', '2023-06-02', 'BlendedCost', '10.5', 'USD', 'True'])
+        self.assertEqual(len(rows), 7)
+
+    def test_csv_formatter_groups(self):
+        """Test group key columns named after the GroupDefinitions."""
+        formatter = CsvFormatter(batch_size=1)
+        rows = list(csv.reader(io.StringIO(formatter.format(self.grouped_cost_data()))))
+
+        self.assertEqual(rows[0][:4], ['start', 'end', 'service', 'tag:team'])
+        self.assertEqual(rows[3], ['2023-06-01', '2023-06-02', 'Amazon S3', 'team$', 'BlendedCost', '0.25', 'USD', 'True'])
+        self.assertEqual(len(rows), 5)
+
+    def test_write_table(self):
+        """Test that writing a CostTable matches writing its periods."""
+        from aws_cost_explorer.results import CostTable
+
+        cost_data = self.grouped_cost_data()
+        table = CostTable.from_response(cost_data)
+        metadata = {'GroupDefinitions': cost_data['GroupDefinitions']}
+        for format_type in ('csv', 'pretty', 'json'):
+            formatter = get_formatter(format_type)
+            expected, written = io.StringIO(), io.StringIO()
+            formatter.write_periods(table.iter_periods(), expected, metadata)
+            formatter.write_table(table, written, metadata)
+            self.assertEqual(written.getvalue(), expected.getvalue())
+
+    def test_csv_formatter_accounts(self):
+        """Test that multi-account results get an account column."""
+        formatter = CsvFormatter()
+        result = formatter.format({'Accounts': {'prod': self.sample_cost_data}, 'Errors': {}})
+        rows = list(csv.reader(io.StringIO(result)))
+
+        self.assertEqual(rows[0][:2], ['account', 'start'])
+        self.assertEqual(rows[1][0], 'prod')
+
+    def test_csv_formatter_account_errors(self):
+        """Test that failed accounts are reported on stderr rather than dropped."""
+        errors = io.StringIO()
+        with contextlib.redirect_stderr(errors):
+            result = CsvFormatter().format({'Accounts': {'prod': self.sample_cost_data}, 'Errors': {'dev': 'Access denied'}})
+
+        self.assertNotIn('dev', result)
+        self.assertEqual(errors.getvalue(), "Error: account dev: Access denied\n")
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_arrow_and_parquet_formatters(self):
+        """Test typed columnar output through Arrow and Parquet."""
+        self.assertTrue(ArrowFormatter.binary)
+        with self.assertRaises(TypeError):
+            ArrowFormatter().format(self.sample_cost_data)
+
+        arrow_buffer = io.BytesIO()
+        get_formatter('arrow').output(self.grouped_cost_data(), arrow_buffer)
+        table = pyarrow.ipc.open_stream(arrow_buffer.getvalue()).read_all()
+        self.assertEqual(table.schema.field('amount').type, pyarrow.float64())
+        self.assertEqual(table.column('service').to_pylist(), ['Amazon EC2'] * 2 + ['Amazon S3'] * 2)
+
+        parquet_buffer = io.BytesIO()
+        ParquetFormatter(batch_size=3).output(self.grouped_cost_data(), parquet_buffer)
+        parquet_buffer.seek(0)
+        table = pyarrow.parquet.read_table(parquet_buffer)
+        self.assertEqual(table.num_rows, 4)
+        self.assertEqual(table.column('amount').to_pylist(), [3.5, 12.0, 0.25, 1.0])
+        self.assertEqual(table.column('estimated').to_pylist(), [True] * 4)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""Unit tests for the instrumentation module."""
+
+import io
+import unittest
+
+from aws_cost_explorer import instrumentation
+from aws_cost_explorer.cost_client import CostExplorerClient
+from aws_cost_explorer.fake_backend import FakeCostExplorer, FakeSession
+from aws_cost_explorer.formatters import JsonLinesFormatter
+from aws_cost_explorer.throttling import RateLimiter, RetryPolicy, Throttler
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test timers, counters and hooks."""
+
+    def setUp(self):
+        """Start each test with instrumentation enabled and empty."""
+        instrumentation.reset()
+        instrumentation.enable()
+
+    def tearDown(self):
+        """Leave instrumentation disabled for other tests."""
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_disabled_records_nothing(self):
+        """Test that nothing is recorded while disabled."""
+        instrumentation.disable()
+        instrumentation.count('calls')
+        with instrumentation.timer('block'):
+            pass
+        stream = io.StringIO()
+        self.assertIs(instrumentation.counting_stream(stream, 'bytes'), stream)
+
+        summary = instrumentation.summary()
+        self.assertEqual(summary['timers'], {})
+        self.assertEqual(summary['counters'], {})
+
+    def test_timers_and_counters(self):
+        """Test that timers and counters accumulate."""
+        @instrumentation.timed('work')
+        def work(value):
+            return value * 2
+
+        self.assertEqual(work(2), 4)
+        self.assertEqual(work(3), 6)
+        instrumentation.count('items', 5)
+        self.assertEqual(list(instrumentation.counted('abc', 'letters')), ['a', 'b', 'c'])
+        stream = instrumentation.counting_stream(io.StringIO(), 'bytes')
+        stream.write('hello')
+
+        summary = instrumentation.summary()
+        self.assertEqual(summary['timers']['work']['count'], 2)
+        self.assertGreaterEqual(summary['timers']['work']['total_seconds'], summary['timers']['work']['max_seconds'])
+        self.assertEqual(summary['counters'], {'bytes': 5, 'items': 5, 'letters': 3})
+        self.assertEqual(stream.getvalue(), 'hello')
+
+    def test_hooks(self):
+        """Test that hooks see every recorded value until removed."""
+        events = []
+        hook = lambda kind, name, value: events.append((kind, name))
+        instrumentation.add_hook(hook)
+        try:
+            instrumentation.count('calls')
+            instrumentation.record_time('block', 0.5)
+        finally:
+            instrumentation.remove_hook(hook)
+        instrumentation.count('calls')
+
+        self.assertEqual(events, [('counter', 'calls'), ('timer', 'block')])
+
+    def test_client_run(self):
+        """Test the counters recorded by a client query."""
+        throttler = Throttler(
+            limiter=RateLimiter(rate=1000, burst=1000),
+            policy=RetryPolicy(base_delay=0, max_delay=0)
+        )
+        backend = FakeCostExplorer(groups=4, page_size=2, throttle_every=3)
+        client = CostExplorerClient(session=FakeSession(backend), throttler=throttler)
+
+        periods = client.iter_cost_and_usage(start_date='2023-01-01', end_date='2023-01-03', group_by=['SERVICE'])
+        JsonLinesFormatter().write_periods(periods, io.StringIO())
+
+        summary = instrumentation.summary()
+        self.assertEqual(summary['counters']['api.calls'], 4)
+        self.assertEqual(summary['counters']['api.pages'], 4)
+        self.assertEqual(summary['counters']['api.retries'], 1)
+        self.assertEqual(summary['timers']['api.get_cost_and_usage']['count'], 4)
+        self.assertIn('date_utils.split_date_range', summary['timers'])
+        self.assertIn('formatters.JsonLinesFormatter.write_periods', summary['timers'])
+
+
+if __name__ == '__main__':
+    unittest.main()
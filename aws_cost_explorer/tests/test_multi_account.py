@@ -0,0 +1,77 @@
+"""Unit tests for the multi_account module."""
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from aws_cost_explorer.formatters import PrettyFormatter
+from aws_cost_explorer.multi_account import MultiAccountClient, read_profiles_file
+
+
+class TestMultiAccountClient(unittest.TestCase):
+    """Test the MultiAccountClient class."""
+
+    def test_results_keyed_by_profile_with_error_isolation(self):
+        """Test that one failing profile does not affect the others."""
+        def factory(profile):
+            client = MagicMock()
+            if profile == 'broken':
+                client.get_cost_and_usage.side_effect = RuntimeError('access denied')
+            else:
+                client.get_cost_and_usage.return_value = {'ResultsByTime': [], 'Profile': profile}
+            return client
+
+        client = MultiAccountClient(['prod', 'broken', 'dev'], client_factory=factory)
+        result = client.get_cost_and_usage(start_date='2023-01-01', end_date='2023-01-02')
+
+        self.assertEqual(list(result['Accounts']), ['prod', 'dev'])
+        self.assertEqual(result['Accounts']['dev']['Profile'], 'dev')
+        self.assertEqual(result['Errors'], {'broken': 'access denied'})
+
+    def test_queries_run_concurrently(self):
+        """Test that profiles are queried in parallel up to max_workers."""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def wait_for_all(**kwargs):
+            # Only returns once all three queries are in flight at the same time
+            barrier.wait()
+            return {'ResultsByTime': []}
+
+        def factory(profile):
+            client = MagicMock()
+            client.get_cost_and_usage.side_effect = wait_for_all
+            return client
+
+        client = MultiAccountClient(['a', 'b', 'c'], max_workers=3, client_factory=factory)
+        result = client.get_cost_and_usage()
+
+        self.assertEqual(result['Errors'], {})
+        self.assertEqual(len(result['Accounts']), 3)
+
+    def test_read_profiles_file(self):
+        """Test reading profile names from a file."""
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as profiles_file:
+            profiles_file.write("prod\n\n# staging\ndev\n")
+        self.addCleanup(os.remove, profiles_file.name)
+
+        self.assertEqual(read_profiles_file(profiles_file.name), ['prod', 'dev'])
+
+    def test_pretty_formatter_renders_accounts(self):
+        """Test that multi-account results are rendered per account."""
+        result = PrettyFormatter().format({
+            'Accounts': {'prod': {'ResultsByTime': [{
+                'TimePeriod': {'Start': '2023-01-01', 'End': '2023-01-02'},
+                'Total': {'BlendedCost': {'Amount': '3.5', 'Unit': 'USD'}}
+            }]}},
+            'Errors': {'dev': 'access denied'}
+        })
+
+        self.assertIn("----- Account: prod -----", result)
+        self.assertIn("BlendedCost: 3.50 USD", result)
+        self.assertIn("----- Account: dev -----\n  Error: access denied", result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""Unit tests for the planner module."""
+
+import decimal
+import unittest
+
+from aws_cost_explorer.cost_client import CostExplorerClient
+from aws_cost_explorer.fake_backend import FakeCostExplorer, FakeSession
+from aws_cost_explorer.planner import ReportSpec, _metric_strings, _sum_metrics, plan_queries, run_reports
+from aws_cost_explorer.throttling import RateLimiter, Throttler
+
+
+def make_client(backend):
+    """Build a client around a fake backend with no rate limiting."""
+    return CostExplorerClient(
+        session=FakeSession(backend), throttler=Throttler(limiter=RateLimiter(rate=10000, burst=10000))
+    )
+
+
+class TestPlanQueries(unittest.TestCase):
+    """Test plan_queries()."""
+
+    def test_overlapping_daily_reports_share_a_query(self):
+        """Test that overlapping ranges and metrics are merged."""
+        queries, sources = plan_queries([
+            ReportSpec('a', '2023-01-01', '2023-01-10', metrics=['UnblendedCost']),
+            ReportSpec('b', '2023-01-05', '2023-01-20', metrics=['UsageQuantity']),
+            ReportSpec('c', '2023-01-20', '2023-01-25', metrics=['UnblendedCost']),
+        ])
+
+        self.assertEqual(queries, [{
+            'start_date': '2023-01-01',
+            'end_date': '2023-01-25',
+            'granularity': 'DAILY',
+            'metrics': ['UnblendedCost', 'UsageQuantity'],
+        }])
+        self.assertEqual(sources, {'a': (0, False), 'b': (0, False), 'c': (0, False)})
+
+    def test_monthly_reports(self):
+        """Test deriving MONTHLY from DAILY only for additive metrics."""
+        queries, sources = plan_queries([
+            ReportSpec('daily', '2023-01-01', '2023-03-01', metrics=['UnblendedCost']),
+            ReportSpec('derived', '2023-01-01', '2023-03-01', granularity='MONTHLY', metrics=['UnblendedCost']),
+            ReportSpec('blended', '2023-01-01', '2023-02-01', granularity='MONTHLY', metrics=['BlendedCost']),
+            ReportSpec('quarter', '2023-01-01', '2023-04-01', granularity='MONTHLY', metrics=['UnblendedCost']),
+            ReportSpec('partial', '2023-01-15', '2023-02-15', granularity='MONTHLY', metrics=['UnblendedCost']),
+            ReportSpec('uncovered', '2023-02-15', '2023-03-15', granularity='MONTHLY', metrics=['UnblendedCost']),
+        ])
+
+        self.assertEqual([(query['granularity'], query['start_date'], query['end_date']) for query in queries], [
+            ('DAILY', '2023-01-01', '2023-03-01'),
+            ('MONTHLY', '2023-01-01', '2023-04-01'),
+            ('MONTHLY', '2023-02-15', '2023-03-15'),
+        ])
+        self.assertEqual(queries[1]['metrics'], ['BlendedCost', 'UnblendedCost'])
+        self.assertEqual(sources['derived'], (0, True))
+        self.assertEqual(sources['partial'], (0, True))
+        self.assertEqual(sources['blended'], (1, False))
+        self.assertEqual(sources['uncovered'], (2, False))
+
+    def test_monthly_reports_touching_at_a_month_start_share_a_query(self):
+        """Test that last month and this month to date are one MONTHLY query."""
+        queries, sources = plan_queries([
+            ReportSpec('previous', '2023-05-01', '2023-06-01', granularity='MONTHLY', metrics=['BlendedCost']),
+            ReportSpec('current', '2023-06-01', '2023-06-11', granularity='MONTHLY', metrics=['BlendedCost']),
+            ReportSpec('overlapping', '2023-06-05', '2023-06-20', granularity='MONTHLY', metrics=['BlendedCost']),
+        ])
+
+        self.assertEqual([(query['start_date'], query['end_date']) for query in queries], [
+            ('2023-05-01', '2023-06-11'), ('2023-06-05', '2023-06-20')
+        ])
+        self.assertEqual(sources, {'previous': (0, False), 'current': (0, False), 'overlapping': (1, False)})
+
+    def test_different_groupings_are_planned_separately(self):
+        """Test that reports only share queries with the same group_by and filter."""
+        queries, _ = plan_queries([
+            ReportSpec('services', '2023-01-01', '2023-01-10', group_by=['SERVICE']),
+            ReportSpec('accounts', '2023-01-01', '2023-01-10', group_by=['LINKED_ACCOUNT']),
+            ReportSpec('more-services', '2023-01-05', '2023-01-12', group_by=[{'Type': 'DIMENSION', 'Key': 'SERVICE'}]),
+        ])
+
+        self.assertEqual(len(queries), 2)
+
+
+class TestRunReports(unittest.TestCase):
+    """Test run_reports()."""
+
+    def test_results_match_individual_queries(self):
+        """Test that sliced results equal what each report would fetch alone."""
+        backend = FakeCostExplorer(groups=3)
+        reports = [
+            ReportSpec('early', '2023-01-01', '2023-01-20', metrics=['UnblendedCost'], group_by=['SERVICE']),
+            ReportSpec('late', '2023-01-10', '2023-02-05', metrics=['UsageQuantity'], group_by=['SERVICE']),
+            ReportSpec('total', '2023-01-01', '2023-02-01', granularity='MONTHLY', metrics=['BlendedCost']),
+        ]
+
+        results = run_reports(make_client(backend), reports)
+        self.assertEqual(len(backend.calls), 2)
+
+        for report in reports:
+            expected = make_client(FakeCostExplorer(groups=3)).get_cost_and_usage(
+                start_date=report.start_date, end_date=report.end_date, granularity=report.granularity,
+                metrics=report.metrics, group_by=report.group_by
+            )
+            self.assertEqual(results[report.name], expected)
+
+    def test_monthly_report_is_summed_from_daily(self):
+        """Test that a derived MONTHLY report sums the DAILY amounts exactly."""
+        backend = FakeCostExplorer(groups=2)
+        results = run_reports(make_client(backend), [
+            ReportSpec('daily', '2023-01-20', '2023-02-10', metrics=['UnblendedCost'], group_by=['SERVICE']),
+            ReportSpec('monthly', '2023-01-20', '2023-02-10', granularity='MONTHLY',
+                       metrics=['UnblendedCost'], group_by=['SERVICE']),
+        ])
+
+        self.assertEqual(len(backend.calls), 1)
+        monthly = results['monthly']['ResultsByTime']
+        self.assertEqual([period['TimePeriod'] for period in monthly], [
+            {'Start': '2023-01-20', 'End': '2023-02-01'}, {'Start': '2023-02-01', 'End': '2023-02-10'}
+        ])
+
+        january = [period for period in results['daily']['ResultsByTime'] if period['TimePeriod']['Start'] < '2023-02']
+        expected = sum(decimal.Decimal(period['Groups'][0]['Metrics']['UnblendedCost']['Amount']) for period in january)
+        self.assertEqual(monthly[0]['Groups'][0]['Keys'], ['SERVICE-00000'])
+        self.assertEqual(decimal.Decimal(monthly[0]['Groups'][0]['Metrics']['UnblendedCost']['Amount']), expected)
+
+    def test_summed_amounts_are_plain_decimals(self):
+        """Test that sums are formatted like Cost Explorer amounts, without exponents."""
+        sums = {}
+        for amount in ('0.0000001', '0.0000000234', '0E-10'):
+            _sum_metrics(sums, {'UnblendedCost': {'Amount': amount, 'Unit': 'USD'}})
+        _sum_metrics(sums, {'UsageQuantity': {'Amount': '0E-10', 'Unit': 'N/A'}})
+
+        self.assertEqual(_metric_strings(sums), {
+            'UnblendedCost': {'Amount': '0.0000001234', 'Unit': 'USD'},
+            'UsageQuantity': {'Amount': '0.0000000000', 'Unit': 'N/A'}
+        })
+
+    def test_duplicate_names(self):
+        """Test that report names must be unique."""
+        with self.assertRaises(ValueError):
+            run_reports(make_client(FakeCostExplorer()), [
+                ReportSpec('a', '2023-01-01', '2023-01-02'), ReportSpec('a', '2023-01-01', '2023-01-03')
+            ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""Unit tests for the results module."""
+
+import unittest
+
+from aws_cost_explorer.results import TOTAL_KEY, CostTable
+
+
+def make_group(keys, blended, usage):
+    """Build a Groups entry with BlendedCost and UsageQuantity metrics."""
+    return {
+        'Keys': keys,
+        'Metrics': {
+            'BlendedCost': {'Amount': blended, 'Unit': 'USD'},
+            'UsageQuantity': {'Amount': usage, 'Unit': 'N/A'}
+        }
+    }
+
+
+class TestCostTable(unittest.TestCase):
+    """Test the CostTable class."""
+
+    def setUp(self):
+        """Set up a grouped response where one group is missing a day."""
+        self.response = {
+            'GroupDefinitions': [{'Type': 'DIMENSION', 'Key': 'SERVICE'}],
+            'ResultsByTime': [
+                {
+                    'TimePeriod': {'Start': '2023-01-01', 'End': '2023-01-02'},
+                    'Total': {},
+                    'Groups': [make_group(['EC2'], '10.5', '3'), make_group(['S3'], '1.25', '7')],
+                    'Estimated': False
+                },
+                {
+                    'TimePeriod': {'Start': '2023-01-02', 'End': '2023-01-03'},
+                    'Total': {},
+                    'Groups': [make_group(['EC2'], '4.5', '1')],
+                    'Estimated': True
+                }
+            ]
+        }
+
+    def test_from_response_grouped(self):
+        """Test building a table from grouped results."""
+        table = CostTable.from_response(self.response)
+
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.keys, [('EC2',), ('S3',)])
+        self.assertEqual(table.metrics, ['BlendedCost', 'UsageQuantity'])
+        self.assertEqual(table.units, {'BlendedCost': 'USD', 'UsageQuantity': 'N/A'})
+        self.assertEqual(table.estimated, [False, True])
+        self.assertEqual(table.value(0, ('S3',), 'BlendedCost'), 1.25)
+        self.assertEqual(table.value(1, ('S3',), 'BlendedCost'), 0.0)
+
+    def test_aggregations(self):
+        """Test series and totals over the flat value array."""
+        table = CostTable.from_response(self.response)
+
+        self.assertEqual(list(table.series(('EC2',), 'BlendedCost')), [10.5, 4.5])
+        self.assertEqual(list(table.period_totals('BlendedCost')), [11.75, 4.5])
+        self.assertEqual(table.key_totals('UsageQuantity'), {('EC2',): 4.0, ('S3',): 7.0})
+
+    def test_from_response_ungrouped(self):
+        """Test that ungrouped totals use the TOTAL_KEY row."""
+        table = CostTable.from_response({'ResultsByTime': [{
+            'TimePeriod': {'Start': '2023-01-01', 'End': '2023-01-02'},
+            'Total': {'UnblendedCost': {'Amount': '2.5', 'Unit': 'USD'}}
+        }]})
+
+        self.assertEqual(table.keys, [TOTAL_KEY])
+        self.assertEqual(table.value(0, TOTAL_KEY, 'UnblendedCost'), 2.5)
+
+    def test_iter_periods(self):
+        """Test converting a table back into ResultsByTime entries."""
+        periods = list(CostTable.from_response(self.response).iter_periods())
+
+        self.assertEqual(periods[0]['TimePeriod'], {'Start': '2023-01-01', 'End': '2023-01-02'})
+        self.assertEqual(periods[0]['Groups'][1], make_group(['S3'], '1.25', '7.0'))
+        self.assertEqual([group['Keys'] for group in periods[1]['Groups']], [['EC2']])
+        self.assertEqual([period['Estimated'] for period in periods], [False, True])
+        self.assertEqual(CostTable.from_periods(periods).values, CostTable.from_response(self.response).values)
+
+    def test_exact_sums_in_any_order(self):
+        """Test that amounts are summed exactly, whatever order metrics and groups arrive in."""
+        periods = [
+            {
+                'TimePeriod': {'Start': '2023-01-01', 'End': '2023-01-02'},
+                'Groups': [make_group(['EC2'], '0.1', '1'), make_group(['S3'], '0.2', '2')]
+            },
+            {
+                'TimePeriod': {'Start': '2023-01-02', 'End': '2023-01-03'},
+                'Groups': [
+                    {'Keys': ['S3'], 'Metrics': {'UsageQuantity': {'Amount': '3', 'Unit': 'N/A'}}},
+                    {'Keys': ['EC2'], 'Metrics': {
+                        'UsageQuantity': {'Amount': '4', 'Unit': 'N/A'},
+                        'BlendedCost': {'Amount': '0.30000000004', 'Unit': 'USD'}
+                    }}
+                ]
+            }
+        ]
+        table = CostTable.from_periods(periods)
+
+        self.assertEqual(table.values.typecode, 'q')
+        self.assertEqual(list(table.period_totals('BlendedCost')), [0.3, 0.3])
+        self.assertEqual(table.key_totals('UsageQuantity'), {('EC2',): 5.0, ('S3',): 5.0})
+        self.assertEqual(table.value(1, ('S3',), 'BlendedCost'), 0.0)
+        self.assertEqual(list(table.iter_periods())[1]['Groups'][0]['Metrics']['BlendedCost']['Amount'], '0.3')
+
+    def test_iter_rows(self):
+        """Test that iter_rows() matches flattening iter_periods()."""
+        from aws_cost_explorer.formatters import flatten_periods
+
+        table = CostTable.from_response(self.response)
+        self.assertEqual(list(table.iter_rows(1)), list(flatten_periods(table.iter_periods(), 1)))
+        self.assertEqual(
+            list(table.iter_rows(1))[-1], ('2023-01-02', '2023-01-03', 'EC2', 'UsageQuantity', 1.0, 'N/A', True)
+        )
+
+    def test_empty_response(self):
+        """Test that an empty response builds an empty table."""
+        table = CostTable.from_response({'ResultsByTime': []})
+
+        self.assertEqual(len(table), 0)
+        self.assertEqual(table.keys, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""Unit tests for the server module."""
+
+import io
+import json
+import threading
+import unittest
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from aws_cost_explorer.cost_client import CostExplorerClient
+from aws_cost_explorer.fake_backend import FakeCostExplorer, FakeSession
+from aws_cost_explorer.server import CostServer, HotCache, QueryError, parse_query
+from aws_cost_explorer.throttling import RateLimiter, Throttler
+
+
+class FakeClock:
+    """Manually advanced clock for expiry tests."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestHotCache(unittest.TestCase):
+    """Test the HotCache class."""
+
+    def test_lru_and_expiry(self):
+        """Test that old and least recently used entries are dropped."""
+        clock = FakeClock()
+        cache = HotCache(max_entries=2, ttl=10, clock=clock)
+        cache.put('a', b'1')
+        cache.put('b', b'2')
+        cache.get('a')
+        cache.put('c', b'3')
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), b'1')
+
+        clock.now += 10
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 1)
+
+
+class TestParseQuery(unittest.TestCase):
+    """Test parse_query()."""
+
+    def test_parse_query(self):
+        """Test converting URL parameters into client arguments."""
+        profile, output, query = parse_query({
+            'start': ['2023-01-01'], 'end': ['2023-01-31'], 'profile': ['prod'],
+            'group_by': ['SERVICE', 'TAG:team'], 'granularity': ['monthly'], 'output': ['csv']
+        })
+
+        self.assertEqual(profile, 'prod')
+        self.assertEqual(output, 'csv')
+        self.assertEqual(query['start_date'], '2023-01-01')
+        self.assertEqual(query['end_date'], '2023-02-01')
+        self.assertEqual(query['granularity'], 'MONTHLY')
+        self.assertEqual(query['group_by'], ['SERVICE', 'TAG:team'])
+
+    def test_invalid_parameters(self):
+        """Test that invalid parameters raise QueryError."""
+        for params in ({'days': ['x']}, {'filter': ['{']}, {'output': ['xml']}, {'start': ['2023-13-01'], 'end': ['bad']}):
+            with self.assertRaises(QueryError):
+                parse_query(params)
+
+
+class TestCostServer(unittest.TestCase):
+    """Test the CostServer class over a real socket."""
+
+    def setUp(self):
+        """Start a server on a free port backed by a fake Cost Explorer."""
+        self.backend = FakeCostExplorer(groups=2)
+        self.created = []
+
+        def client_factory(profile):
+            self.created.append(profile)
+            return CostExplorerClient(
+                profile=profile,
+                session=FakeSession(self.backend, profile),
+                throttler=Throttler(limiter=RateLimiter(rate=10000, burst=10000))
+            )
+
+        self.server = CostServer(('127.0.0.1', 0), client_factory=client_factory, log_stream=io.StringIO())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get(self, path):
+        with urlopen(self.base_url + path) as response:
+            return response.headers, response.read().decode('utf-8')
+
+    def test_repeated_queries_are_served_from_memory(self):
+        """Test that a repeated query is answered without calling the API."""
+        path = '/costs?start=2023-01-01&end=2023-01-03&group_by=SERVICE&profile=prod'
+        headers, body = self.get(path)
+        self.assertEqual(headers['X-Cache'], 'miss')
+        self.assertEqual(len(json.loads(body)['ResultsByTime']), 3)
+        self.assertIn('X-Response-Time-Ms', headers)
+
+        headers, cached_body = self.get(path)
+        self.assertEqual(headers['X-Cache'], 'hit')
+        self.assertEqual(cached_body, body)
+        self.assertEqual(len(self.backend.calls), 1)
+        self.assertEqual(self.created, ['prod'])
+        self.assertIs(self.server.get_client('prod')._ce_client, self.backend)
+
+        _, stats = self.get('/stats')
+        stats = json.loads(stats)
+        self.assertEqual((stats['requests'], stats['hits']), (2, 1))
+        self.assertEqual(stats['profiles'], ['prod'])
+
+    def test_warm_builds_cost_explorer_clients(self):
+        """Test that warm() creates each profile's Cost Explorer client before any request."""
+        self.server.warm(['prod', None])
+
+        self.assertEqual(self.created, ['prod', None])
+        for profile in ('prod', None):
+            self.assertIs(self.server.get_client(profile)._ce_client, self.backend)
+        self.assertEqual(self.backend.calls, [])
+
+    def test_output_formats_and_errors(self):
+        """Test other output formats, bad parameters and unknown paths."""
+        headers, body = self.get('/costs?start=2023-01-01&end=2023-01-01&output=pretty')
+        self.assertTrue(headers['Content-Type'].startswith('text/plain'))
+        self.assertIn('AWS COST REPORT', body)
+
+        with self.assertRaises(HTTPError) as context:
+            self.get('/costs?output=xml')
+        self.assertEqual(context.exception.code, 400)
+
+        with self.assertRaises(HTTPError) as context:
+            self.get('/nothing')
+        self.assertEqual(context.exception.code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
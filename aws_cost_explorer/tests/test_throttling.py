@@ -0,0 +1,107 @@
+"""Unit tests for the throttling module."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from aws_cost_explorer.cost_client import CostExplorerClient
+from aws_cost_explorer.throttling import RateLimiter, RetryPolicy, Throttler, is_throttling_error
+
+
+class FakeClock:
+    """Clock advanced by the fake sleep function."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class ThrottledError(Exception):
+    """Stand-in for a botocore ClientError."""
+
+    def __init__(self, code='ThrottlingException'):
+        super().__init__(code)
+        self.response = {'Error': {'Code': code}}
+
+
+class TestThrottling(unittest.TestCase):
+    """Test the rate limiter and retry logic."""
+
+    def setUp(self):
+        """Set up a limiter driven by a fake clock."""
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(rate=2, burst=2, clock=self.clock, sleep=self.clock.sleep)
+
+    def test_is_throttling_error(self):
+        """Test recognition of throttling error codes."""
+        self.assertTrue(is_throttling_error(ThrottledError()))
+        self.assertTrue(is_throttling_error(ThrottledError('LimitExceededException')))
+        self.assertFalse(is_throttling_error(ThrottledError('AccessDeniedException')))
+        self.assertFalse(is_throttling_error(ValueError('boom')))
+
+    def test_rate_limiter_waits_once_burst_is_used(self):
+        """Test that tokens refill at the configured rate."""
+        self.assertEqual(self.limiter.acquire(), 0)
+        self.assertEqual(self.limiter.acquire(), 0)
+        self.assertAlmostEqual(self.limiter.acquire(), 0.5)
+        self.assertAlmostEqual(self.clock.now, 0.5)
+
+    def test_rate_adapts_to_throttling(self):
+        """Test that throttling halves the rate and success restores it."""
+        self.limiter.on_throttle()
+        self.assertEqual(self.limiter.rate, 1)
+        for _ in range(20):
+            self.limiter.on_success()
+        self.assertEqual(self.limiter.rate, 2)
+
+    def test_throttler_retries_throttling_errors(self):
+        """Test that throttled calls are retried and counted."""
+        func = MagicMock(side_effect=[ThrottledError(), ThrottledError(), {'ok': True}])
+        throttler = Throttler(limiter=self.limiter, policy=RetryPolicy(base_delay=1), sleep=self.clock.sleep)
+
+        self.assertEqual(throttler.call(func, Key='value'), {'ok': True})
+        func.assert_called_with(Key='value')
+
+        stats = throttler.stats.as_dict()
+        self.assertEqual(stats['calls'], 3)
+        self.assertEqual(stats['retries'], 2)
+        self.assertEqual(stats['throttled'], 2)
+
+    def test_throttler_gives_up_and_reraises(self):
+        """Test that errors propagate once attempts are exhausted."""
+        func = MagicMock(side_effect=ThrottledError())
+        throttler = Throttler(limiter=self.limiter, policy=RetryPolicy(max_attempts=3), sleep=self.clock.sleep)
+
+        with self.assertRaises(ThrottledError):
+            throttler.call(func)
+        self.assertEqual(func.call_count, 3)
+
+    def test_throttler_does_not_retry_other_errors(self):
+        """Test that non-throttling errors are raised immediately."""
+        func = MagicMock(side_effect=ThrottledError('AccessDeniedException'))
+        throttler = Throttler(limiter=self.limiter, sleep=self.clock.sleep)
+
+        with self.assertRaises(ThrottledError):
+            throttler.call(func)
+        func.assert_called_once()
+
+    @patch('boto3.Session')
+    def test_client_calls_go_through_throttler(self, mock_session):
+        """Test that CostExplorerClient retries a throttled request."""
+        mock_ce_client = MagicMock()
+        mock_session.return_value.client.return_value = mock_ce_client
+        mock_ce_client.get_cost_and_usage.side_effect = [ThrottledError(), {'ResultsByTime': []}]
+        throttler = Throttler(limiter=self.limiter, sleep=self.clock.sleep)
+
+        client = CostExplorerClient(throttler=throttler)
+
+        self.assertEqual(client.get_cost_and_usage(), {'ResultsByTime': []})
+        self.assertEqual(throttler.stats.retries, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""Unit tests for the warehouse module."""
+
+import unittest
+
+from aws_cost_explorer.cost_client import CostExplorerClient
+from aws_cost_explorer.fake_backend import FakeCostExplorer, FakeSession
+from aws_cost_explorer.warehouse import CostWarehouse
+
+
+class FakeClock:
+    """Manually advanced clock for expiry tests."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCostWarehouse(unittest.TestCase):
+    """Test the CostWarehouse class."""
+
+    def setUp(self):
+        """Set up an in-memory warehouse fed by a fake backend."""
+        self.clock = FakeClock()
+        self.backend = FakeCostExplorer(groups=3, estimated_after='2023-01-04')
+        self.client = CostExplorerClient(session=FakeSession(self.backend))
+        self.warehouse = CostWarehouse(':memory:', estimated_ttl=60, clock=self.clock)
+
+    def requested_ranges(self):
+        """Return the TimePeriods sent to the fake backend."""
+        return [call['TimePeriod'] for call in self.backend.calls]
+
+    def test_sync_fetches_only_missing_and_stale_days(self):
+        """Test incremental syncing and re-fetching of estimated days."""
+        self.assertEqual(self.warehouse.sync(self.client, '2023-01-02', '2023-01-05'), 3)
+        self.assertEqual(self.warehouse.sync(self.client, '2023-01-01', '2023-01-06'), 2)
+
+        self.clock.now += 61
+        self.assertEqual(self.warehouse.missing_days('2023-01-01', '2023-01-06'), ['2023-01-04', '2023-01-05'])
+
+        self.assertEqual(self.requested_ranges(), [
+            {'Start': '2023-01-02', 'End': '2023-01-05'},
+            {'Start': '2023-01-01', 'End': '2023-01-02'},
+            {'Start': '2023-01-05', 'End': '2023-01-06'}
+        ])
+        self.assertEqual(self.backend.calls[0]['GroupBy'], [
+            {'Type': 'DIMENSION', 'Key': 'LINKED_ACCOUNT'},
+            {'Type': 'DIMENSION', 'Key': 'SERVICE'}
+        ])
+
+    def test_query_matches_api_totals(self):
+        """Test that local daily totals equal the sum of the synced groups."""
+        self.warehouse.sync(self.client, '2023-01-01', '2023-01-03')
+        api = self.client.get_cost_and_usage(
+            start_date='2023-01-01', end_date='2023-01-03', group_by=['LINKED_ACCOUNT', 'SERVICE']
+        )
+
+        local = self.warehouse.query('2023-01-01', '2023-01-03', metrics=['BlendedCost'])
+
+        self.assertEqual(len(local['ResultsByTime']), 2)
+        for api_period, local_period in zip(api['ResultsByTime'], local['ResultsByTime']):
+            expected = sum(float(group['Metrics']['BlendedCost']['Amount']) for group in api_period['Groups'])
+            self.assertAlmostEqual(float(local_period['Total']['BlendedCost']['Amount']), expected)
+            self.assertEqual(local_period['Total']['BlendedCost']['Unit'], 'USD')
+
+    def test_query_monthly_grouped(self):
+        """Test monthly rollup by service with estimated flags."""
+        self.backend.estimated_after = '2023-02-01'
+        self.warehouse.sync(self.client, '2023-01-30', '2023-02-02')
+
+        response = self.warehouse.query('2023-01-30', '2023-02-02', granularity='MONTHLY', group_by=['service'])
+
+        self.assertEqual(response['GroupDefinitions'], [{'Type': 'DIMENSION', 'Key': 'SERVICE'}])
+        self.assertEqual(
+            [period['TimePeriod'] for period in response['ResultsByTime']],
+            [{'Start': '2023-01-30', 'End': '2023-02-01'}, {'Start': '2023-02-01', 'End': '2023-02-02'}]
+        )
+        self.assertEqual(
+            [group['Keys'] for group in response['ResultsByTime'][0]['Groups']],
+            [['SERVICE-00000'], ['SERVICE-00001'], ['SERVICE-00002']]
+        )
+        self.assertEqual([period['Estimated'] for period in response['ResultsByTime']], [False, True])
+
+    def test_query_rejects_unknown_dimension(self):
+        """Test that only locally stored dimensions can be grouped by."""
+        with self.assertRaises(ValueError):
+            self.warehouse.query('2023-01-01', '2023-01-02', group_by=['REGION'])
+
+
+if __name__ == '__main__':
+    unittest.main()
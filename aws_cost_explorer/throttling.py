@@ -0,0 +1,256 @@
+"""Rate limiting and throttling retries for AWS Cost Explorer calls."""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from aws_cost_explorer import instrumentation
+
+
+DEFAULT_RATE = 5.0
+DEFAULT_BURST = 10
+DEFAULT_MAX_ATTEMPTS = 8
+
+THROTTLING_ERROR_CODES = frozenset([
+    'ThrottlingException',
+    'Throttling',
+    'LimitExceededException',
+    'RequestLimitExceeded',
+    'TooManyRequestsException',
+])
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    """Return True if a botocore ClientError reports throttling."""
+    response = getattr(error, 'response', None)
+    if not isinstance(response, dict):
+        return False
+    return response.get('Error', {}).get('Code') in THROTTLING_ERROR_CODES
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket with adaptive refill rate.
+
+    Each throttling error halves the refill rate (down to ``min_rate``) and
+    each successful call raises it again by ``increase`` up to ``rate``, so
+    callers settle just below the sustained limit the API enforces.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        min_rate: float = 0.5,
+        increase: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate: Maximum sustained requests per second
+            burst: Maximum number of requests allowed back to back
+            min_rate: Lower bound for the adaptive rate
+            increase: Requests per second added back after each success
+            clock: Monotonic time source
+            sleep: Function used to wait
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min(min_rate, rate)
+        self.increase = increase
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """
+        Take one token, waiting until one is available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            self.sleep(delay)
+            waited += delay
+
+    def on_success(self) -> None:
+        """Recover the refill rate after a successful call."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self) -> None:
+        """Back the refill rate off after a throttling error."""
+        with self._lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for throttled calls."""
+
+    def __init__(
+        self,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0
+    ):
+        """
+        Initialize the retry policy.
+
+        Args:
+            max_attempts: Total attempts per call, including the first
+            base_delay: Backoff ceiling in seconds for the first retry
+            max_delay: Upper bound on any single backoff
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, retry: int) -> float:
+        """Return the backoff in seconds before the given retry (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** retry)))
+
+
+class ThrottleStats:
+    """Counters describing how calls were throttled."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self.backoff_seconds = 0.0
+
+    def record(self, **increments: Any) -> None:
+        """Add to one or more counters."""
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters as a dictionary."""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'retries': self.retries,
+                'throttled': self.throttled,
+                'wait_seconds': self.wait_seconds,
+                'backoff_seconds': self.backoff_seconds,
+            }
+
+
+class Throttler:
+    """Sends calls through a shared rate limiter, retrying on throttling."""
+
+    def __init__(
+        self,
+        limiter: Optional[RateLimiter] = None,
+        policy: Optional[RetryPolicy] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize the throttler.
+
+        Args:
+            limiter: Rate limiter every call acquires a token from
+            policy: Retry policy for throttling errors
+            sleep: Function used to wait between retries
+        """
+        self.limiter = limiter or RateLimiter()
+        self.policy = policy or RetryPolicy()
+        self.sleep = sleep
+        self.stats = ThrottleStats()
+
+    def call(self, func: Callable[..., Any], **kwargs: Any) -> Any:
+        """
+        Call func(**kwargs) under the rate limit.
+
+        Args:
+            func: The API method to call
+            **kwargs: Arguments for the call
+
+        Returns:
+            The result of the call
+
+        Raises:
+            Exception: The throttling error once max_attempts is exhausted,
+                or any other error from the call immediately
+        """
+        for attempt in range(self.policy.max_attempts):
+            waited = self.limiter.acquire()
+            self.stats.record(calls=1, wait_seconds=waited)
+            instrumentation.record_time('api.rate_limit_wait', waited)
+            try:
+                result = func(**kwargs)
+            except Exception as error:
+                if not is_throttling_error(error):
+                    raise
+                self.limiter.on_throttle()
+                self.stats.record(throttled=1)
+                instrumentation.count('api.throttled')
+                if attempt + 1 >= self.policy.max_attempts:
+                    raise
+
+                backoff = self.policy.delay(attempt)
+                self.stats.record(retries=1, backoff_seconds=backoff)
+                instrumentation.count('api.retries')
+                instrumentation.record_time('api.backoff', backoff)
+                self.sleep(backoff)
+                continue
+
+            self.limiter.on_success()
+            return result
+
+
+_default_throttler = Throttler()
+
+
+def get_default_throttler() -> Throttler:
+    """Return the process-wide throttler shared by all clients."""
+    return _default_throttler
+
+
+def configure(
+    rate: Optional[float] = None,
+    burst: Optional[int] = None,
+    max_attempts: Optional[int] = None
+) -> Throttler:
+    """
+    Replace the process-wide throttler with new settings.
+
+    Args:
+        rate: Maximum sustained requests per second
+        burst: Maximum number of requests allowed back to back
+        max_attempts: Total attempts per call, including the first
+
+    Returns:
+        The new process-wide throttler
+    """
+    global _default_throttler
+    limiter = RateLimiter(
+        rate=rate if rate is not None else DEFAULT_RATE,
+        burst=burst if burst is not None else DEFAULT_BURST
+    )
+    policy = RetryPolicy(max_attempts=max_attempts if max_attempts is not None else DEFAULT_MAX_ATTEMPTS)
+    _default_throttler = Throttler(limiter=limiter, policy=policy)
+    return _default_throttler
@@ -0,0 +1,275 @@
+"""Local SQLite store of daily per-account, per-service cost data."""
+
+import bisect
+import datetime
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from aws_cost_explorer.cost_client import CostExplorerClient
+from aws_cost_explorer.date_utils import split_date_range
+
+
+DEFAULT_METRICS = ['BlendedCost', 'UnblendedCost', 'UsageQuantity']
+DEFAULT_ESTIMATED_TTL = 3600
+
+# Dimensions stored per row, and the column each one maps to
+GROUP_COLUMNS = {
+    'LINKED_ACCOUNT': 'linked_account',
+    'SERVICE': 'service',
+}
+
+
+def default_warehouse_path() -> str:
+    """Return the default warehouse location, honouring XDG_DATA_HOME."""
+    base = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    return os.path.join(base, 'aws-cost-explorer', 'warehouse.sqlite')
+
+
+def _coalesce_days(days: List[str]) -> List[Tuple[str, str]]:
+    """Merge sorted YYYY-MM-DD days into contiguous [start, end) ranges."""
+    ranges = []
+    for day in days:
+        next_day = (datetime.datetime.strptime(day, '%Y-%m-%d') + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
+        if ranges and ranges[-1][1] == day:
+            ranges[-1] = (ranges[-1][0], next_day)
+        else:
+            ranges.append((day, next_day))
+    return ranges
+
+
+class CostWarehouse:
+    """
+    Indexed local store of daily costs by linked account and service.
+
+    Days are ingested with sync() and read back with query(), which returns
+    the same ResultsByTime shape as CostExplorerClient.get_cost_and_usage().
+    Days still marked Estimated by Cost Explorer are re-fetched once they
+    are older than ``estimated_ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        estimated_ttl: float = DEFAULT_ESTIMATED_TTL,
+        clock: Any = time.time
+    ):
+        """
+        Initialize the warehouse, creating the database if needed.
+
+        Args:
+            path: SQLite database file (defaults to default_warehouse_path()).
+                Use ':memory:' for a process-local store.
+            estimated_ttl: Seconds before an estimated day is fetched again
+            clock: Function returning the current time in seconds
+        """
+        self.path = path or default_warehouse_path()
+        self.estimated_ttl = estimated_ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(
+            'CREATE TABLE IF NOT EXISTS costs ('
+            ' profile TEXT NOT NULL,'
+            ' date TEXT NOT NULL,'
+            ' linked_account TEXT NOT NULL,'
+            ' service TEXT NOT NULL,'
+            ' metric TEXT NOT NULL,'
+            ' amount REAL NOT NULL,'
+            ' unit TEXT NOT NULL,'
+            ' PRIMARY KEY (profile, date, linked_account, service, metric));'
+            'CREATE INDEX IF NOT EXISTS costs_date ON costs (profile, date);'
+            'CREATE INDEX IF NOT EXISTS costs_account ON costs (profile, linked_account, date);'
+            'CREATE INDEX IF NOT EXISTS costs_service ON costs (profile, service, date);'
+            'CREATE TABLE IF NOT EXISTS synced_days ('
+            ' profile TEXT NOT NULL,'
+            ' date TEXT NOT NULL,'
+            ' estimated INTEGER NOT NULL,'
+            ' synced_at REAL NOT NULL,'
+            ' PRIMARY KEY (profile, date));'
+        )
+        self._conn.commit()
+
+    def missing_days(self, start_date: str, end_date: str, profile: str = 'default') -> List[str]:
+        """
+        List days in [start_date, end_date) that need fetching.
+
+        Args:
+            start_date: Start date in YYYY-MM-DD format (inclusive)
+            end_date: End date in YYYY-MM-DD format (exclusive)
+            profile: Profile the data belongs to
+
+        Returns:
+            Days that were never synced, or are estimated and stale
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT date, estimated, synced_at FROM synced_days'
+                ' WHERE profile = ? AND date >= ? AND date < ?',
+                (profile, start_date, end_date)
+            ).fetchall()
+
+        now = self.clock()
+        fresh = {
+            date for date, estimated, synced_at in rows
+            if not estimated or now - synced_at < self.estimated_ttl
+        }
+        return [start for start, _ in split_date_range(start_date, end_date) if start not in fresh]
+
+    def sync(
+        self,
+        client: CostExplorerClient,
+        start_date: str,
+        end_date: str,
+        metrics: Optional[List[str]] = None
+    ) -> int:
+        """
+        Fetch and store the days in a range that are missing or stale.
+
+        Args:
+            client: Client used to query Cost Explorer
+            start_date: Start date in YYYY-MM-DD format (inclusive)
+            end_date: End date in YYYY-MM-DD format (exclusive)
+            metrics: Metrics to store (defaults to DEFAULT_METRICS)
+
+        Returns:
+            Number of days fetched from the API
+        """
+        profile = client.profile or 'default'
+        days = self.missing_days(start_date, end_date, profile)
+        for range_start, range_end in _coalesce_days(days):
+            periods = client.iter_cost_and_usage(
+                start_date=range_start,
+                end_date=range_end,
+                granularity='DAILY',
+                metrics=metrics or DEFAULT_METRICS,
+                group_by=list(GROUP_COLUMNS)
+            )
+            for period in periods:
+                self._store_day(profile, period)
+        return len(days)
+
+    def _store_day(self, profile: str, period: Dict[str, Any]) -> None:
+        """Replace the stored rows for one DAILY period."""
+        date = period['TimePeriod']['Start']
+        rows = [
+            (profile, date, group['Keys'][0], group['Keys'][1], metric, float(data['Amount']), data['Unit'])
+            for group in period.get('Groups', [])
+            for metric, data in group.get('Metrics', {}).items()
+        ]
+        with self._lock:
+            with self._conn:
+                self._conn.execute('DELETE FROM costs WHERE profile = ? AND date = ?', (profile, date))
+                self._conn.executemany('INSERT INTO costs VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO synced_days VALUES (?, ?, ?, ?)',
+                    (profile, date, int(period.get('Estimated', False)), self.clock())
+                )
+
+    def query(
+        self,
+        start_date: str,
+        end_date: str,
+        granularity: str = 'DAILY',
+        metrics: Optional[List[str]] = None,
+        group_by: Optional[List[str]] = None,
+        profile: str = 'default'
+    ) -> Dict[str, Any]:
+        """
+        Answer a cost query from the local store.
+
+        Args:
+            start_date: Start date in YYYY-MM-DD format (inclusive)
+            end_date: End date in YYYY-MM-DD format (exclusive)
+            granularity: DAILY or MONTHLY
+            metrics: Metrics to return (defaults to DEFAULT_METRICS)
+            group_by: Up to two of 'LINKED_ACCOUNT' and 'SERVICE'
+            profile: Profile the data belongs to
+
+        Returns:
+            Response in the shape of GetCostAndUsage
+
+        Raises:
+            ValueError: If a group_by dimension is not stored locally
+        """
+        metrics = metrics or DEFAULT_METRICS
+        group_by = [dimension.upper() for dimension in group_by or []]
+        unknown = [dimension for dimension in group_by if dimension not in GROUP_COLUMNS]
+        if unknown:
+            raise ValueError(
+                f"Cannot group local data by {', '.join(unknown)}. "
+                f"Valid dimensions: {', '.join(GROUP_COLUMNS)}"
+            )
+
+        segments = split_date_range(start_date, end_date, granularity)
+        segment_starts = [start for start, _ in segments]
+        totals = [{} for _ in segments]
+        groups = [{} for _ in segments]
+        estimated = [False for _ in segments]
+
+        group_columns = [GROUP_COLUMNS[dimension] for dimension in group_by]
+        select_groups = ''.join(f', {column}' for column in group_columns)
+        placeholders = ', '.join('?' for _ in metrics)
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT date{select_groups}, metric, SUM(amount), MAX(unit) FROM costs'
+                f' WHERE profile = ? AND date >= ? AND date < ? AND metric IN ({placeholders})'
+                f' GROUP BY date{select_groups}, metric',
+                [profile, start_date, end_date] + list(metrics)
+            ).fetchall()
+            estimated_days = [date for (date,) in self._conn.execute(
+                'SELECT date FROM synced_days WHERE profile = ? AND date >= ? AND date < ? AND estimated',
+                (profile, start_date, end_date)
+            )]
+
+        units = {}
+        for row in rows:
+            date, keys, (metric, amount, unit) = row[0], row[1:-3], row[-3:]
+            index = bisect.bisect_right(segment_starts, date) - 1
+            units[metric] = unit
+            bucket = groups[index].setdefault(keys, {}) if group_by else totals[index]
+            bucket[metric] = bucket.get(metric, 0.0) + amount
+
+        for date in estimated_days:
+            estimated[bisect.bisect_right(segment_starts, date) - 1] = True
+
+        periods = []
+        for index, (start, end) in enumerate(segments):
+            if group_by:
+                total = {}
+                period_groups = [
+                    {'Keys': list(keys), 'Metrics': _to_metric_data(amounts, units)}
+                    for keys, amounts in sorted(groups[index].items())
+                ]
+            else:
+                total = _to_metric_data(
+                    {metric: totals[index].get(metric, 0.0) for metric in metrics if metric in units}, units
+                )
+                period_groups = []
+            periods.append({
+                'TimePeriod': {'Start': start, 'End': end},
+                'Total': total,
+                'Groups': period_groups,
+                'Estimated': estimated[index]
+            })
+
+        response = {'ResultsByTime': periods}
+        if group_by:
+            response['GroupDefinitions'] = [{'Type': 'DIMENSION', 'Key': dimension} for dimension in group_by]
+        return response
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def _to_metric_data(amounts: Dict[str, float], units: Dict[str, str]) -> Dict[str, Dict[str, str]]:
+    """Convert summed amounts into Cost Explorer's Amount/Unit strings."""
+    return {metric: {'Amount': repr(amount), 'Unit': units[metric]} for metric, amount in amounts.items()}
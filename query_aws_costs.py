@@ -7,62 +7,435 @@ It requires the boto3 library and proper AWS credentials configured.
 """
 
 import argparse
+import contextlib
+import json
 import sys
 
-from aws_cost_explorer.cost_client import CostExplorerClient
+from aws_cost_explorer.anomalies import DEFAULT_METRIC, DEFAULT_THRESHOLD, AnomalyDetector
+from aws_cost_explorer.cache import ResponseCache, DEFAULT_TTL
+from aws_cost_explorer.compare import COMPARISON_MODES, compare_costs, comparison_ranges
+from aws_cost_explorer.cost_client import CostExplorerClient, parse_group_by
+from aws_cost_explorer.forecast import month_end_forecast
 from aws_cost_explorer.formatters import get_formatter
-from aws_cost_explorer.date_utils import get_date_range
+from aws_cost_explorer import instrumentation, throttling
+from aws_cost_explorer.multi_account import DEFAULT_MAX_WORKERS, MultiAccountClient, read_profiles_file
+from aws_cost_explorer.date_utils import check_hourly_start, get_date_range
+from aws_cost_explorer.results import CostTable
+from aws_cost_explorer.warehouse import GROUP_COLUMNS, CostWarehouse
 
 
 def parse_args(args=None):
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description='Query AWS Cost Explorer for daily costs')
-    parser.add_argument('--start', help='Start date (YYYY-MM-DD)')
-    parser.add_argument('--end', help='End date (YYYY-MM-DD)')
+    parser.add_argument('--start', help='Start date (YYYY-MM-DD, or YYYY-MM-DDThh:mm:ssZ with HOURLY)')
+    parser.add_argument(
+        '--end',
+        help='End date (YYYY-MM-DD, inclusive; or an exclusive YYYY-MM-DDThh:mm:ssZ with HOURLY)'
+    )
     parser.add_argument('--profile', help='AWS profile name')
+    parser.add_argument('--profiles', help='Comma-separated AWS profile names to query in parallel')
+    parser.add_argument('--profiles-file', help='File listing AWS profile names, one per line')
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help='Maximum number of profiles (or --forecast groups, or --compare ranges) queried at once'
+    )
     parser.add_argument('--days', type=int, help='Number of days to look back')
     parser.add_argument('--month', action='store_true', help='View current month to date')
     parser.add_argument('--previous-month', action='store_true', help='View previous month')
     parser.add_argument(
         '--output', 
-        choices=['pretty', 'json'], 
+        choices=['pretty', 'json', 'jsonl', 'csv', 'arrow', 'parquet'], 
         default='pretty',
-        help='Output format (pretty or json)'
+        help='Output format (pretty, json, jsonl with one period per line, or '
+             'csv/arrow/parquet with one row per period, group and metric)'
     )
+    parser.add_argument('--output-file', help='Write output to this file instead of stdout')
     parser.add_argument(
         '--granularity',
-        choices=['DAILY', 'MONTHLY'],
+        choices=['DAILY', 'MONTHLY', 'HOURLY'],
         default='DAILY',
-        help='Cost data granularity (DAILY or MONTHLY)'
+        help='Cost data granularity (DAILY, MONTHLY, or HOURLY for the last 14 days; '
+             'HOURLY requires hourly granularity to be enabled in Cost Explorer)'
     )
+    parser.add_argument(
+        '--group-by',
+        action='append',
+        help='Group costs by a dimension (e.g. SERVICE, LINKED_ACCOUNT) or TAG:<key>; may be given twice'
+    )
+    parser.add_argument('--filter', help='Cost Explorer filter expression as JSON')
+    parser.add_argument(
+        '--validate-filter',
+        action='store_true',
+        help='Check --filter values against the local dimension and tag index before querying, '
+             'expanding wildcards such as "Amazon EC2*"'
+    )
+    parser.add_argument(
+        '--list-values',
+        metavar='NAME[=PREFIX]',
+        help='List the values of a dimension or TAG:<key> from the local index, optionally '
+             'only those starting with PREFIX, and exit'
+    )
+    parser.add_argument('--dimension-index', help='Dimension and tag index file')
+    parser.add_argument(
+        '--refresh-dimensions',
+        action='store_true',
+        help='Fetch the dimension and tag index again even if it is less than a day old'
+    )
+    parser.add_argument(
+        '--max-rps',
+        type=float,
+        default=throttling.DEFAULT_RATE,
+        help='Maximum Cost Explorer requests per second across all profiles'
+    )
+    parser.add_argument('--sync', action='store_true', help='Store daily costs for the range in the local warehouse')
+    parser.add_argument(
+        '--local',
+        action='store_true',
+        help='Answer from the local warehouse, fetching only missing or estimated days'
+    )
+    parser.add_argument('--offline', action='store_true', help='Answer from the local warehouse without any API calls')
+    parser.add_argument('--warehouse', help='Local warehouse database file')
+    parser.add_argument(
+        '--detect-anomalies',
+        action='store_true',
+        help='Report days whose cost deviates from their history instead of the costs'
+    )
+    parser.add_argument('--anomaly-state', help='File keeping anomaly detection state between runs')
+    parser.add_argument(
+        '--anomaly-threshold',
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help='Absolute z-score at which a day is reported as an anomaly'
+    )
+    parser.add_argument(
+        '--forecast',
+        action='store_true',
+        help='Show month-to-date costs and the forecast to the end of the month '
+             '(per value of --group-by, if given)'
+    )
+    parser.add_argument(
+        '--compare',
+        choices=COMPARISON_MODES,
+        help='Compare costs, in total and per --group-by value, between this month to date and last '
+             'month (month), this week and the same week last year (week-yoy), or the range given by '
+             '--start, --end or --days and the range of the same length before it (previous)'
+    )
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Answer queries over HTTP (GET /costs?days=7&group_by=SERVICE&output=json) '
+             'with warm clients and an in-memory cache of recent results'
+    )
+    parser.add_argument(
+        '--cur',
+        action='append',
+        metavar='PATH',
+        help='Answer from local Cost and Usage Report files (CSV, CSV.gz or Parquet) '
+             'or directories of them instead of the API; may be repeated'
+    )
+    parser.add_argument('--cur-workers', type=int, help='Processes parsing --cur files (defaults to the CPU count)')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface --serve listens on')
+    parser.add_argument('--port', type=int, default=8080, help='Port --serve listens on')
+    parser.add_argument('--cache', action='store_true', help='Cache responses on disk')
+    parser.add_argument('--cache-path', help='Cache database file (implies --cache)')
+    parser.add_argument(
+        '--cache-ttl',
+        type=float,
+        default=DEFAULT_TTL,
+        help='Seconds to keep cached estimated data (finalized data never expires)'
+    )
+    parser.add_argument(
+        '--profile-run',
+        metavar='FILE',
+        help='Write a JSON summary of stage timings, API call counts and peak memory '
+             'to FILE ("-" for stderr)'
+    )
+    
+    parsed_args = parser.parse_args(args)
+    if parsed_args.group_by and len(parsed_args.group_by) > 2:
+        parser.error('--group-by may be given at most twice')
+    if parsed_args.filter:
+        try:
+            parsed_args.filter = json.loads(parsed_args.filter)
+        except ValueError as error:
+            parser.error(f'--filter is not valid JSON: {error}')
     
-    return parser.parse_args(args)
+    if parsed_args.validate_filter and not parsed_args.filter:
+        parser.error('--validate-filter requires --filter')
+    if (parsed_args.validate_filter or parsed_args.list_values) and (parsed_args.profiles or parsed_args.profiles_file):
+        parser.error('--validate-filter and --list-values work with a single --profile')
+    
+    if parsed_args.granularity != 'HOURLY':
+        if any('T' in date for date in (parsed_args.start, parsed_args.end) if date):
+            parser.error('--start and --end take timestamps only with --granularity HOURLY')
+    elif not parsed_args.cur:
+        # Local CUR exports keep hourly line items for as long as they exist
+        try:
+            start_date, _ = get_date_range(
+                start_date=parsed_args.start,
+                end_date=parsed_args.end,
+                days=parsed_args.days,
+                month=parsed_args.month,
+                previous_month=parsed_args.previous_month,
+                hourly=True
+            )
+            if start_date:
+                check_hourly_start(start_date)
+        except ValueError as error:
+            parser.error(str(error))
+    
+    if parsed_args.detect_anomalies:
+        if parsed_args.granularity != 'DAILY':
+            parser.error('--detect-anomalies requires DAILY granularity')
+        if parsed_args.output not in ('pretty', 'json', 'jsonl'):
+            parser.error('--detect-anomalies supports pretty, json and jsonl output')
+        if parsed_args.profiles or parsed_args.profiles_file:
+            parser.error('--detect-anomalies works with a single --profile')
+    
+    if parsed_args.forecast:
+        if parsed_args.output not in ('pretty', 'json'):
+            parser.error('--forecast supports pretty and json output')
+        if parsed_args.group_by and len(parsed_args.group_by) > 1:
+            parser.error('--forecast accepts a single --group-by')
+        if parsed_args.profiles or parsed_args.profiles_file:
+            parser.error('--forecast works with a single --profile')
+        if parsed_args.detect_anomalies or parsed_args.sync or parsed_args.local or parsed_args.offline:
+            parser.error('--forecast cannot be combined with --detect-anomalies or the local warehouse')
+    
+    if parsed_args.compare:
+        if parsed_args.output not in ('pretty', 'json'):
+            parser.error('--compare supports pretty and json output')
+        if parsed_args.granularity == 'HOURLY':
+            parser.error('--compare does not support HOURLY granularity')
+        if parsed_args.profiles or parsed_args.profiles_file:
+            parser.error('--compare works with a single --profile')
+        if parsed_args.month or parsed_args.previous_month:
+            parser.error('--compare cannot be combined with --month or --previous-month')
+        if parsed_args.compare != 'previous' and (parsed_args.start or parsed_args.end or parsed_args.days):
+            parser.error('--start, --end and --days only apply to --compare previous')
+        if parsed_args.compare == 'previous' and not (parsed_args.start or parsed_args.days):
+            parser.error('--compare previous requires --start or --days')
+        if parsed_args.forecast or parsed_args.detect_anomalies:
+            parser.error('--compare cannot be combined with --forecast or --detect-anomalies')
+        if parsed_args.sync or parsed_args.local or parsed_args.offline or parsed_args.cur or parsed_args.serve:
+            parser.error('--compare cannot be combined with the local warehouse, --cur or --serve')
+    
+    if parsed_args.cur:
+        if parsed_args.profiles or parsed_args.profiles_file:
+            parser.error('--cur cannot be combined with --profiles')
+        if parsed_args.filter:
+            parser.error('--filter cannot be used with --cur')
+        if parsed_args.forecast or parsed_args.detect_anomalies or parsed_args.serve:
+            parser.error('--cur cannot be combined with --forecast, --detect-anomalies or --serve')
+        if parsed_args.sync or parsed_args.local or parsed_args.offline:
+            parser.error('--cur cannot be combined with the local warehouse')
+    
+    if parsed_args.sync or parsed_args.local or parsed_args.offline:
+        if parsed_args.profiles or parsed_args.profiles_file:
+            parser.error('--sync, --local and --offline work with a single --profile')
+        if parsed_args.granularity == 'HOURLY':
+            parser.error('The local warehouse stores daily data; HOURLY is not supported')
+        if parsed_args.filter:
+            parser.error('--filter cannot be used with the local warehouse')
+        for dimension in parsed_args.group_by or []:
+            if dimension.upper() not in GROUP_COLUMNS:
+                parser.error(f'--group-by with the local warehouse must be one of: {", ".join(GROUP_COLUMNS)}')
+    
+    return parsed_args
+
+
+def get_profiles(parsed_args):
+    """Collect profile names from --profiles and --profiles-file."""
+    profiles = []
+    if parsed_args.profiles:
+        profiles.extend(name.strip() for name in parsed_args.profiles.split(',') if name.strip())
+    if parsed_args.profiles_file:
+        profiles.extend(read_profiles_file(parsed_args.profiles_file))
+    return profiles
+
+
+@contextlib.contextmanager
+def open_output(parsed_args, formatter):
+    """Yield the stream output should be written to."""
+    if not parsed_args.output_file:
+        output_stream = sys.stdout.buffer if formatter.binary else sys.stdout
+        yield instrumentation.counting_stream(output_stream, 'output.bytes')
+        return
+    
+    with open(parsed_args.output_file, 'wb' if formatter.binary else 'w') as output_stream:
+        yield instrumentation.counting_stream(output_stream, 'output.bytes')
+
+
+def query_warehouse(parsed_args, cache, start_date, end_date):
+    """Sync and/or query the local warehouse. Returns None after --sync."""
+    warehouse = CostWarehouse(parsed_args.warehouse)
+    profile = parsed_args.profile or 'default'
+    
+    if not parsed_args.offline:
+        client = CostExplorerClient(profile=parsed_args.profile, cache=cache)
+        days = warehouse.sync(client, start_date, end_date)
+        if parsed_args.sync:
+            sys.stderr.write(f"Synced {days} day(s) into {warehouse.path}\n")
+            return None
+    
+    return warehouse.query(
+        start_date,
+        end_date,
+        granularity=parsed_args.granularity,
+        group_by=parsed_args.group_by,
+        profile=profile
+    )
+
+
+def load_dimension_index(parsed_args, cache):
+    """Load the profile's dimension and tag index, fetching it at most once a day."""
+    from aws_cost_explorer.dimensions import DEFAULT_MAX_AGE, DimensionIndex
+    
+    client = CostExplorerClient(profile=parsed_args.profile, cache=cache)
+    max_age = 0 if parsed_args.refresh_dimensions else DEFAULT_MAX_AGE
+    return DimensionIndex.load_or_fetch(client, path=parsed_args.dimension_index, max_age=max_age)
+
+
+def detect_anomalies(parsed_args, response):
+    """Run the response through the anomaly detector and save its state."""
+    detector = AnomalyDetector.load(parsed_args.anomaly_state, threshold=parsed_args.anomaly_threshold)
+    namespace = json.dumps([parsed_args.profile or 'default', parsed_args.filter], sort_keys=True)
+    anomalies = detector.detect(CostTable.from_response(response), DEFAULT_METRIC, namespace)
+    detector.save(parsed_args.anomaly_state)
+    return {'Anomalies': anomalies}
+
+
+def write_profile(path):
+    """Write the instrumentation summary to a file, or stderr for '-'."""
+    text = json.dumps(instrumentation.summary(), indent=2) + "\n"
+    if path == '-':
+        sys.stderr.write(text)
+        return
+    with open(path, 'w') as profile_file:
+        profile_file.write(text)
 
 
 def main(args=None):
     """Main function to parse arguments and call the cost query function."""
     parsed_args = parse_args(args)
+    if not parsed_args.profile_run:
+        return run(parsed_args)
     
+    instrumentation.enable()
+    try:
+        with instrumentation.timer('run'):
+            return run(parsed_args)
+    finally:
+        write_profile(parsed_args.profile_run)
+
+
+def run(parsed_args):
+    """Run the query described by the parsed arguments."""
     # Calculate date range based on parameters
     start_date, end_date = get_date_range(
         start_date=parsed_args.start,
         end_date=parsed_args.end,
         days=parsed_args.days,
         month=parsed_args.month,
-        previous_month=parsed_args.previous_month
+        previous_month=parsed_args.previous_month,
+        hourly=parsed_args.granularity == 'HOURLY'
     )
     
     # Create cost explorer client and get cost data
-    client = CostExplorerClient(profile=parsed_args.profile)
-    response = client.get_cost_and_usage(
-        start_date=start_date,
-        end_date=end_date,
-        granularity=parsed_args.granularity
-    )
+    throttling.configure(rate=parsed_args.max_rps)
+    cache = None
+    if parsed_args.cache or parsed_args.cache_path:
+        cache = ResponseCache(path=parsed_args.cache_path, ttl=parsed_args.cache_ttl)
+    
+    if parsed_args.list_values or parsed_args.validate_filter:
+        index = load_dimension_index(parsed_args, cache)
+        if parsed_args.list_values:
+            name, _, prefix = parsed_args.list_values.partition('=')
+            for value in index.complete(name, prefix):
+                sys.stdout.write(f"{value}\n")
+            return 0
+        try:
+            parsed_args.filter = index.validate_filter(parsed_args.filter)
+        except ValueError as error:
+            sys.stderr.write(f"{error}\n")
+            return 1
     
-    # Format and output results
+    profiles = get_profiles(parsed_args)
+    query = {
+        'start_date': start_date,
+        'end_date': end_date,
+        'granularity': parsed_args.granularity,
+        'group_by': parsed_args.group_by,
+        'filter_expression': parsed_args.filter
+    }
     formatter = get_formatter(parsed_args.output)
-    formatter.output(response)
+    
+    if parsed_args.serve:
+        from aws_cost_explorer.server import serve
+        
+        serve(parsed_args.host, parsed_args.port, profiles=profiles or [parsed_args.profile], cache=cache)
+        return 0
+    
+    if parsed_args.cur:
+        from aws_cost_explorer.cur import CurReader
+        
+        reader = CurReader(parsed_args.cur, max_workers=parsed_args.cur_workers)
+        response = reader.get_cost_and_usage(
+            start_date, end_date, granularity=parsed_args.granularity, group_by=parsed_args.group_by
+        )
+        with open_output(parsed_args, formatter) as output_stream:
+            formatter.output(response, output_stream)
+        return 0
+    
+    if parsed_args.sync or parsed_args.local or parsed_args.offline:
+        response = query_warehouse(parsed_args, cache, start_date, end_date)
+        if response is not None and parsed_args.detect_anomalies:
+            response = detect_anomalies(parsed_args, response)
+        if response is not None:
+            with open_output(parsed_args, formatter) as output_stream:
+                formatter.output(response, output_stream)
+        return 0
+    
+    with open_output(parsed_args, formatter) as output_stream:
+        if parsed_args.compare:
+            client = CostExplorerClient(profile=parsed_args.profile, cache=cache)
+            current, previous = comparison_ranges(
+                parsed_args.compare, parsed_args.start, parsed_args.end, parsed_args.days
+            )
+            comparison = compare_costs(
+                client,
+                current,
+                previous,
+                group_by=parsed_args.group_by,
+                filter_expression=parsed_args.filter,
+                max_workers=parsed_args.max_workers
+            )
+            formatter.output(comparison, output_stream)
+        elif parsed_args.forecast:
+            client = CostExplorerClient(profile=parsed_args.profile, cache=cache)
+            forecast = month_end_forecast(
+                client,
+                group_by=parsed_args.group_by[0] if parsed_args.group_by else None,
+                filter_expression=parsed_args.filter,
+                max_workers=parsed_args.max_workers
+            )
+            formatter.output(forecast, output_stream)
+        elif parsed_args.detect_anomalies:
+            client = CostExplorerClient(profile=parsed_args.profile, cache=cache)
+            formatter.output(detect_anomalies(parsed_args, client.get_cost_and_usage(**query)), output_stream)
+        elif profiles:
+            client = MultiAccountClient(profiles, max_workers=parsed_args.max_workers, cache=cache)
+            formatter.output(client.get_cost_and_usage(**query), output_stream)
+        else:
+            # Stream periods to the formatter as result pages arrive
+            client = CostExplorerClient(profile=parsed_args.profile, cache=cache)
+            metadata = None
+            if parsed_args.group_by:
+                metadata = {'GroupDefinitions': [parse_group_by(spec) for spec in parsed_args.group_by]}
+            periods = instrumentation.counted(client.iter_cost_and_usage(**query), 'output.periods')
+            formatter.write_periods(periods, output_stream, metadata)
     
     return 0
 
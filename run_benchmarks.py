@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark runner for AWS Cost Explorer package.
+Run with: python run_benchmarks.py
+"""
+
+import argparse
+import json
+import sys
+
+from aws_cost_explorer.benchmarks import (
+    compare_to_baseline, dumps, format_report, run_benchmarks, run_startup_benchmarks
+)
+
+
+def parse_args(args=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Benchmark fetching, parsing and formatting cost data')
+    parser.add_argument('--days', type=int, default=365, help='Days of DAILY data to fetch')
+    parser.add_argument('--groups', type=int, default=100, help='Groups per day')
+    parser.add_argument('--page-size', type=int, default=1000, help='Group rows per API response page')
+    parser.add_argument('--latency', type=float, default=0.0, help='Simulated seconds per API call')
+    parser.add_argument('--throttle-every', type=int, default=0, help='Simulate throttling on every Nth call')
+    parser.add_argument('--formats', default='pretty,json,csv', help='Comma-separated output formats')
+    parser.add_argument('--startup', action='store_true', help='Also benchmark CLI import and --help time')
+    parser.add_argument('--save', help='Write results as JSON to this file')
+    parser.add_argument('--baseline', help='Fail if slower than the results saved in this file')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown versus the baseline')
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    parsed_args = parse_args()
+    results = run_benchmarks(
+        days=parsed_args.days,
+        groups=parsed_args.groups,
+        page_size=parsed_args.page_size,
+        latency=parsed_args.latency,
+        throttle_every=parsed_args.throttle_every,
+        formats=parsed_args.formats.split(',')
+    )
+    if parsed_args.startup:
+        results.extend(run_startup_benchmarks())
+    sys.stdout.write(format_report(results))
+    
+    if parsed_args.save:
+        with open(parsed_args.save, 'w') as results_file:
+            results_file.write(dumps(results))
+    
+    regressions = []
+    if parsed_args.baseline:
+        with open(parsed_args.baseline) as baseline_file:
+            regressions = compare_to_baseline(results, json.load(baseline_file), parsed_args.tolerance)
+        for regression in regressions:
+            sys.stderr.write(f"REGRESSION {regression}\n")
+    
+    # Return non-zero exit code if any stage regressed
+    sys.exit(1 if regressions else 0)